@@ -4,7 +4,7 @@ from alembic import context
 from sqlalchemy import engine_from_config, pool
 
 from app.database import Base
-from app.models import bankroll_entry, game, odds_snapshot, parlay, performance_snapshot, pick, sport  # noqa: F401
+from app.models import bankroll_entry, change_cursor, current_odds, game, ingestion_status, model_prediction, odds_snapshot, parlay, performance_snapshot, pick, sport  # noqa: F401
 
 config = context.config
 
@@ -0,0 +1,57 @@
+"""incremental performance rollups
+
+Revision ID: 0006_rollups
+Revises: 0005_phase6
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006_rollups"
+down_revision = "0005_phase6"
+branch_labels = None
+depends_on = None
+
+
+def _has_column(bind, table: str, col: str) -> bool:
+    inspector = sa.inspect(bind)
+    return col in {c["name"] for c in inspector.get_columns(table)}
+
+
+def _has_index(bind, table: str, name: str) -> bool:
+    inspector = sa.inspect(bind)
+    return name in {i["name"] for i in inspector.get_indexes(table)}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    add_cols = [
+        ("wagered_units", sa.Float()),
+        ("ev_pct_sum", sa.Float()),
+        ("ev_pct_count", sa.Integer()),
+        ("odds_american_sum", sa.Float()),
+        ("market_clv_sum", sa.Float()),
+        ("market_clv_count", sa.Integer()),
+        ("book_clv_sum", sa.Float()),
+        ("book_clv_count", sa.Integer()),
+    ]
+    for name, typ in add_cols:
+        if not _has_column(bind, "performance_snapshots", name):
+            op.add_column("performance_snapshots", sa.Column(name, typ, nullable=False, server_default="0"))
+
+    if not _has_column(bind, "picks", "rolled_up"):
+        op.add_column("picks", sa.Column("rolled_up", sa.Boolean(), nullable=False, server_default=sa.false()))
+    if not _has_index(bind, "picks", "ix_picks_not_rolled_up"):
+        op.create_index(
+            "ix_picks_not_rolled_up",
+            "picks",
+            ["pick_day"],
+            postgresql_where=sa.text("NOT rolled_up"),
+        )
+
+
+def downgrade() -> None:
+    pass
@@ -0,0 +1,42 @@
+"""bankroll ledger running totals
+
+Revision ID: 0007_ledger
+Revises: 0006_rollups
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0007_ledger"
+down_revision = "0006_rollups"
+branch_labels = None
+depends_on = None
+
+
+def _has_column(bind, table: str, col: str) -> bool:
+    inspector = sa.inspect(bind)
+    return col in {c["name"] for c in inspector.get_columns(table)}
+
+
+def _has_index(bind, table: str, name: str) -> bool:
+    inspector = sa.inspect(bind)
+    return name in {i["name"] for i in inspector.get_indexes(table)}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    if not _has_column(bind, "bankroll_entries", "wagered_after"):
+        op.add_column("bankroll_entries", sa.Column("wagered_after", sa.Float(), nullable=False, server_default="0"))
+    if not _has_column(bind, "bankroll_entries", "bets_after"):
+        op.add_column("bankroll_entries", sa.Column("bets_after", sa.Integer(), nullable=False, server_default="0"))
+    if not _has_index(bind, "bankroll_entries", "ix_bankroll_entries_created_at"):
+        op.create_index("ix_bankroll_entries_created_at", "bankroll_entries", ["created_at"])
+    if not _has_index(bind, "bankroll_entries", "ix_bankroll_entries_entry_type"):
+        op.create_index("ix_bankroll_entries_entry_type", "bankroll_entries", ["entry_type"])
+
+
+def downgrade() -> None:
+    pass
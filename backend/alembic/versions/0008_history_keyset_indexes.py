@@ -0,0 +1,33 @@
+"""keyset pagination indexes for history endpoints
+
+Revision ID: 0008_keyset
+Revises: 0007_ledger
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0008_keyset"
+down_revision = "0007_ledger"
+branch_labels = None
+depends_on = None
+
+
+def _has_index(bind, table: str, name: str) -> bool:
+    inspector = sa.inspect(bind)
+    return name in {i["name"] for i in inspector.get_indexes(table)}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    if not _has_index(bind, "picks", "ix_picks_created_at_id"):
+        op.create_index("ix_picks_created_at_id", "picks", ["created_at", "id"])
+    if not _has_index(bind, "parlays", "ix_parlays_created_at_id"):
+        op.create_index("ix_parlays_created_at_id", "parlays", ["created_at", "id"])
+
+
+def downgrade() -> None:
+    pass
@@ -0,0 +1,70 @@
+"""current odds board table
+
+Revision ID: 0009_current_odds
+Revises: 0008_keyset
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0009_current_odds"
+down_revision = "0008_keyset"
+branch_labels = None
+depends_on = None
+
+
+def _has_table(bind, name: str) -> bool:
+    inspector = sa.inspect(bind)
+    return inspector.has_table(name)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    if _has_table(bind, "current_odds"):
+        return
+
+    op.create_table(
+        "current_odds",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("game_id", sa.Integer(), sa.ForeignKey("games.id"), nullable=False),
+        sa.Column("sport_key", sa.String(length=64), nullable=False),
+        sa.Column("home_team", sa.String(length=128), nullable=False),
+        sa.Column("away_team", sa.String(length=128), nullable=False),
+        sa.Column("commence_time", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("bookmaker", sa.String(length=64), nullable=False),
+        sa.Column("market", sa.String(length=32), nullable=False),
+        sa.Column("side", sa.String(length=32), nullable=False),
+        sa.Column("line", sa.Float(), nullable=True),
+        sa.Column("odds", sa.Integer(), nullable=False),
+        sa.Column("implied_prob", sa.Float(), nullable=False),
+        sa.Column("no_vig_prob", sa.Float(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.UniqueConstraint("game_id", "bookmaker", "market", "side", name="uq_current_odds_key"),
+    )
+    op.create_index("ix_current_odds_game_id", "current_odds", ["game_id"])
+    op.create_index("ix_current_odds_sport_key", "current_odds", ["sport_key"])
+    op.create_index("ix_current_odds_commence_time", "current_odds", ["commence_time"])
+
+    # Seed the board from the latest snapshot per key for games that have not started.
+    op.execute(
+        """
+        INSERT INTO current_odds (
+            game_id, sport_key, home_team, away_team, commence_time, bookmaker, market, side,
+            line, odds, implied_prob, no_vig_prob, updated_at
+        )
+        SELECT DISTINCT ON (s.game_id, s.bookmaker, s.market, s.side)
+            s.game_id, s.sport_key, g.home_team, g.away_team, s.commence_time, s.bookmaker, s.market, s.side,
+            s.line, s.odds, s.implied_prob, s.no_vig_prob, s.snapshot_time
+        FROM odds_snapshots s
+        JOIN games g ON g.id = s.game_id
+        WHERE s.commence_time > now()
+        ORDER BY s.game_id, s.bookmaker, s.market, s.side, s.snapshot_time DESC
+        """
+    )
+
+
+def downgrade() -> None:
+    pass
@@ -0,0 +1,47 @@
+"""change sequence for delta sync
+
+Revision ID: 0010_change_cursor
+Revises: 0009_current_odds
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0010_change_cursor"
+down_revision = "0009_current_odds"
+branch_labels = None
+depends_on = None
+
+
+def _has_table(bind, name: str) -> bool:
+    inspector = sa.inspect(bind)
+    return inspector.has_table(name)
+
+
+def _has_column(bind, table: str, col: str) -> bool:
+    inspector = sa.inspect(bind)
+    return col in {c["name"] for c in inspector.get_columns(table)}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    if not _has_table(bind, "change_cursor"):
+        op.create_table(
+            "change_cursor",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("value", sa.Integer(), nullable=False, server_default="0"),
+        )
+        op.execute("INSERT INTO change_cursor (id, value) VALUES (1, 0)")
+
+    # Existing rows start at 0; clients pick them up from a full fetch before syncing with ?since=.
+    for table in ("picks", "current_odds"):
+        if not _has_column(bind, table, "change_seq"):
+            op.add_column(table, sa.Column("change_seq", sa.Integer(), nullable=False, server_default="0"))
+            op.create_index(f"ix_{table}_change_seq", table, ["change_seq"])
+
+
+def downgrade() -> None:
+    pass
@@ -0,0 +1,41 @@
+"""ingestion status record for cheap health checks
+
+Revision ID: 0011_ingestion_status
+Revises: 0010_change_cursor
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0011_ingestion_status"
+down_revision = "0010_change_cursor"
+branch_labels = None
+depends_on = None
+
+
+def _has_table(bind, name: str) -> bool:
+    inspector = sa.inspect(bind)
+    return inspector.has_table(name)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    if _has_table(bind, "ingestion_status"):
+        return
+
+    op.create_table(
+        "ingestion_status",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("last_cycle_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_cycle_status", sa.String(length=16), nullable=False),
+        sa.Column("games_fetched", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("snapshots_inserted", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_snapshot_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    pass
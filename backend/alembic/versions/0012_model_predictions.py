@@ -0,0 +1,44 @@
+"""precomputed model predictions
+
+Revision ID: 0012_model_predictions
+Revises: 0011_ingestion_status
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0012_model_predictions"
+down_revision = "0011_ingestion_status"
+branch_labels = None
+depends_on = None
+
+
+def _has_table(bind, name: str) -> bool:
+    inspector = sa.inspect(bind)
+    return inspector.has_table(name)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    if _has_table(bind, "model_predictions"):
+        return
+
+    op.create_table(
+        "model_predictions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("game_id", sa.Integer(), sa.ForeignKey("games.id"), nullable=False),
+        sa.Column("model_version", sa.String(length=64), nullable=False),
+        sa.Column("feature_hash", sa.String(length=64), nullable=False),
+        sa.Column("home_win_prob", sa.Float(), nullable=False),
+        sa.Column("features", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.UniqueConstraint("game_id", "model_version", "feature_hash", name="uq_model_prediction_key"),
+    )
+    op.create_index("ix_model_predictions_game_version", "model_predictions", ["game_id", "model_version"])
+
+
+def downgrade() -> None:
+    pass
@@ -0,0 +1,28 @@
+"""separate change cursor for the odds board
+
+Revision ID: 0013_odds_change_cursor
+Revises: 0012_model_predictions
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0013_odds_change_cursor"
+down_revision = "0012_model_predictions"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    # The odds feed continues from the shared counter so existing current_odds seqs stay below it.
+    exists = bind.execute(sa.text("SELECT 1 FROM change_cursor WHERE id = 2")).first()
+    if exists is None:
+        op.execute("INSERT INTO change_cursor (id, value) SELECT 2, COALESCE(MAX(value), 0) FROM change_cursor WHERE id = 1")
+
+
+def downgrade() -> None:
+    pass
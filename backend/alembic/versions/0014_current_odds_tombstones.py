@@ -0,0 +1,32 @@
+"""tombstones for quotes removed from the odds board
+
+Revision ID: 0014_current_odds_tombstones
+Revises: 0013_odds_change_cursor
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0014_current_odds_tombstones"
+down_revision = "0013_odds_change_cursor"
+branch_labels = None
+depends_on = None
+
+
+def _has_column(bind, table: str, col: str) -> bool:
+    inspector = sa.inspect(bind)
+    return col in {c["name"] for c in inspector.get_columns(table)}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    if not _has_column(bind, "current_odds", "removed_at"):
+        op.add_column("current_odds", sa.Column("removed_at", sa.DateTime(timezone=True), nullable=True))
+        op.create_index("ix_current_odds_removed_at", "current_odds", ["removed_at"])
+
+
+def downgrade() -> None:
+    pass
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 
-from app.analytics.correlation import estimate_correlation
+from app.analytics.correlation import leg_value, same_game_correlation
 
 CORRELATION_CEILINGS = {
     "conservative": 0.15,
@@ -11,28 +12,17 @@ CORRELATION_CEILINGS = {
 }
 
 
-@dataclass
+@dataclass(frozen=True)
 class CompatibilityResult:
     is_compatible: bool
     reason: str
 
 
-def _get_value(leg, key: str):
-    return leg[key] if isinstance(leg, dict) else getattr(leg, key)
+COMPATIBLE = CompatibilityResult(True, "")
 
 
-def check_compatibility(leg_a, leg_b, risk_level: str) -> CompatibilityResult:
-    game_a = _get_value(leg_a, "game_id")
-    game_b = _get_value(leg_b, "game_id")
-
-    if game_a != game_b:
-        return CompatibilityResult(True, "")
-
-    market_a = _get_value(leg_a, "market")
-    market_b = _get_value(leg_b, "market")
-    side_a = _get_value(leg_a, "side")
-    side_b = _get_value(leg_b, "side")
-
+@lru_cache(maxsize=512)
+def same_game_compatibility(market_a: str, side_a: str, market_b: str, side_b: str, risk_level: str) -> CompatibilityResult:
     # 1) same game + same market
     if market_a == market_b:
         # 3) same game + opposing side same market is also always blocked
@@ -44,8 +34,21 @@ def check_compatibility(leg_a, leg_b, risk_level: str) -> CompatibilityResult:
     if {market_a, market_b} == {"h2h", "spreads"} and side_a == side_b:
         return CompatibilityResult(False, "same_game_same_team_related_markets")
 
-    corr = estimate_correlation(leg_a, leg_b)
+    corr = same_game_correlation(market_a, side_a, market_b, side_b)
     if corr > CORRELATION_CEILINGS[risk_level]:
         return CompatibilityResult(False, f"correlation_above_ceiling:{corr:.2f}")
 
-    return CompatibilityResult(True, "")
+    return COMPATIBLE
+
+
+def check_compatibility(leg_a, leg_b, risk_level: str) -> CompatibilityResult:
+    if leg_value(leg_a, "game_id") != leg_value(leg_b, "game_id"):
+        return COMPATIBLE
+
+    return same_game_compatibility(
+        leg_value(leg_a, "market"),
+        leg_value(leg_a, "side"),
+        leg_value(leg_b, "market"),
+        leg_value(leg_b, "side"),
+        risk_level,
+    )
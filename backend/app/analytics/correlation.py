@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import math
+from functools import lru_cache
 
 CORRELATION_PRIORS: dict[tuple[str, str, str, str], float] = {
     ("h2h", "home", "h2h", "away"): -1.0,
@@ -24,24 +25,12 @@ CROSS_GAME_SAME_SPORT = 0.02
 CROSS_GAME_CROSS_SPORT = 0.00
 
 
-def _get_value(pick, key: str):
-    return pick[key] if isinstance(pick, dict) else getattr(pick, key)
+def leg_value(leg, key: str):
+    return leg[key] if isinstance(leg, dict) else getattr(leg, key)
 
 
-def estimate_correlation(pick_a, pick_b) -> float:
-    game_a = _get_value(pick_a, "game_id")
-    game_b = _get_value(pick_b, "game_id")
-    sport_a = _get_value(pick_a, "sport_key")
-    sport_b = _get_value(pick_b, "sport_key")
-
-    if game_a != game_b:
-        return CROSS_GAME_SAME_SPORT if sport_a == sport_b else CROSS_GAME_CROSS_SPORT
-
-    market_a = _get_value(pick_a, "market")
-    side_a = _get_value(pick_a, "side")
-    market_b = _get_value(pick_b, "market")
-    side_b = _get_value(pick_b, "side")
-
+@lru_cache(maxsize=256)
+def same_game_correlation(market_a: str, side_a: str, market_b: str, side_b: str) -> float:
     key = (market_a, side_a, market_b, side_b)
     rev_key = (market_b, side_b, market_a, side_a)
     if key in CORRELATION_PRIORS:
@@ -51,6 +40,30 @@ def estimate_correlation(pick_a, pick_b) -> float:
     return 0.10
 
 
+def cross_game_correlation(sport_a: str, sport_b: str) -> float:
+    return CROSS_GAME_SAME_SPORT if sport_a == sport_b else CROSS_GAME_CROSS_SPORT
+
+
+def estimate_correlation(pick_a, pick_b) -> float:
+    game_a = leg_value(pick_a, "game_id")
+    game_b = leg_value(pick_b, "game_id")
+
+    if game_a != game_b:
+        return cross_game_correlation(leg_value(pick_a, "sport_key"), leg_value(pick_b, "sport_key"))
+
+    return same_game_correlation(
+        leg_value(pick_a, "market"),
+        leg_value(pick_a, "side"),
+        leg_value(pick_b, "market"),
+        leg_value(pick_b, "side"),
+    )
+
+
 def adjusted_joint_probability(prob_a: float, prob_b: float, correlation: float) -> float:
     value = (prob_a * prob_b) + correlation * math.sqrt(prob_a * (1 - prob_a) * prob_b * (1 - prob_b))
     return max(0.0, min(1.0, value))
+
+
+def bounded_joint_probability(prob_a: float, prob_b: float, correlation: float) -> float:
+    """Joint probability capped at the Frechet upper bound min(prob_a, prob_b)."""
+    return min(adjusted_joint_probability(prob_a, prob_b, correlation), prob_a, prob_b)
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+from functools import lru_cache
+from statistics import NormalDist
+
+import numpy as np
+
+DEFAULT_DRAWS = 32_768
+DEFAULT_SEED = 20_240_601
+_MIN_EIGENVALUE = 1e-6
+
+
+def nearest_correlation(matrix: np.ndarray) -> np.ndarray:
+    """Clip negative eigenvalues so the pairwise priors form a valid correlation matrix."""
+    raw = np.asarray(matrix, dtype=np.float64)
+    sym = (raw + raw.T) / 2.0
+    np.fill_diagonal(sym, 1.0)
+    if sym.size == 0:
+        return sym
+    eigvals, eigvecs = np.linalg.eigh(sym)
+    if eigvals.min() >= _MIN_EIGENVALUE:
+        return sym
+    fixed = (eigvecs * np.clip(eigvals, _MIN_EIGENVALUE, None)) @ eigvecs.T
+    scale = np.sqrt(np.diag(fixed))
+    fixed = fixed / np.outer(scale, scale)
+    np.fill_diagonal(fixed, 1.0)
+    return fixed
+
+
+def _threshold(prob: float) -> float:
+    if prob <= 0.0:
+        return -np.inf
+    if prob >= 1.0:
+        return np.inf
+    return NormalDist().inv_cdf(prob)
+
+
+@lru_cache(maxsize=16)
+def _base_normals(n_legs: int, n_draws: int, seed: int) -> np.ndarray:
+    normals = np.random.default_rng(seed).standard_normal((n_legs, n_draws))
+    normals.setflags(write=False)
+    return normals
+
+
+def leg_set_probability(
+    probs: Sequence[float],
+    correlation: np.ndarray,
+    *,
+    n_draws: int = DEFAULT_DRAWS,
+    seed: int = DEFAULT_SEED,
+) -> float:
+    """Monte Carlo joint hit probability of one leg set via a Gaussian copula.
+
+    Leg i hits in a draw when its latent value falls below the normal quantile of
+    ``probs[i]``; the pairwise outcome priors are used directly as latent correlations.
+    The base draws depend only on the number of legs, so a leg set priced in the same
+    order always gets the same answer regardless of what else is being priced.
+    """
+    n = len(probs)
+    if n == 0:
+        return 0.0
+    chol = np.linalg.cholesky(nearest_correlation(correlation))
+    latent = chol @ _base_normals(n, n_draws, seed)
+    thresholds = np.array([_threshold(float(p)) for p in probs])
+    hits = np.logical_and.reduce(latent < thresholds[:, None], axis=0)
+    return np.count_nonzero(hits) / n_draws
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from itertools import combinations
+
+import numpy as np
+
+from app.analytics.compatibility import check_compatibility, same_game_compatibility
+from app.analytics.correlation import cross_game_correlation, leg_value, same_game_correlation
+from app.analytics.joint_probability import leg_set_probability
+from app.utils.odds_math import american_to_decimal
+
+
+class ParlayLegIndex:
+    """Pairwise compatibility and correlation for a pool of legs, addressed by position.
+
+    Compatibility is stored as one bitset per leg (bit j of ``compatible_bits[i]`` is set
+    when legs i and j can share a parlay) and correlations as a dense float32 matrix.
+    """
+
+    def __init__(self, legs: list, risk_level: str) -> None:
+        self.legs = list(legs)
+        self.risk_level = risk_level
+        n = len(self.legs)
+        fields = [
+            (
+                leg_value(leg, "game_id"),
+                leg_value(leg, "sport_key"),
+                leg_value(leg, "market"),
+                leg_value(leg, "side"),
+            )
+            for leg in self.legs
+        ]
+        self.probs = [float(leg_value(leg, "fair_prob")) for leg in self.legs]
+        self.decimals = [american_to_decimal(leg_value(leg, "odds_american")) for leg in self.legs]
+
+        self.correlation = np.zeros((n, n), dtype=np.float32)
+        bits = [0] * n
+        for i, j in combinations(range(n), 2):
+            game_a, sport_a, market_a, side_a = fields[i]
+            game_b, sport_b, market_b, side_b = fields[j]
+            if game_a != game_b:
+                corr = cross_game_correlation(sport_a, sport_b)
+                ok = True
+            else:
+                corr = same_game_correlation(market_a, side_a, market_b, side_b)
+                ok = same_game_compatibility(market_a, side_a, market_b, side_b, risk_level).is_compatible
+            self.correlation[i, j] = self.correlation[j, i] = corr
+            if ok:
+                bits[i] |= 1 << j
+                bits[j] |= 1 << i
+        self.compatible_bits = bits
+        # Plain-float rows for scalar lookups in hot loops; the priors have at most a few
+        # decimals, so rounding undoes the float32 representation error.
+        self.correlation_rows: list[list[float]] = [[round(v, 6) for v in row] for row in self.correlation.tolist()]
+        self._joint_cache: dict[frozenset[int], float] = {}
+
+    def __len__(self) -> int:
+        return len(self.legs)
+
+    def is_compatible(self, i: int, j: int) -> bool:
+        return bool(self.compatible_bits[i] >> j & 1)
+
+    def compatible_with_mask(self, j: int, mask: int) -> bool:
+        return self.compatible_bits[j] & mask == mask
+
+    def pair_correlation(self, i: int, j: int) -> float:
+        return self.correlation_rows[i][j]
+
+    def incompatible_pair(self, positions: list[int]) -> tuple[int, int] | None:
+        """First incompatible pair in ``combinations(positions, 2)`` order, or None."""
+        mask = 0
+        for j in positions:
+            mask |= 1 << j
+        if all(self.compatible_with_mask(j, mask & ~(1 << j)) for j in positions):
+            return None
+        return next(((i, j) for i, j in combinations(positions, 2) if not self.is_compatible(i, j)), None)
+
+    def compatibility_reason(self, i: int, j: int) -> str:
+        return check_compatibility(self.legs[i], self.legs[j], self.risk_level).reason
+
+    def avg_pairwise_correlation(self, positions: list[int]) -> float:
+        rows = self.correlation_rows
+        pairs = [rows[i][j] for i, j in combinations(positions, 2)]
+        return sum(pairs) / len(pairs) if pairs else 0.0
+
+    def joint_probability(self, positions: list[int]) -> float:
+        """Correlated joint probability of one leg set, independent of the rest of the pool.
+
+        Legs are put in pick-id order first, so the same legs always price the same way.
+        """
+        key = frozenset(positions)
+        cached = self._joint_cache.get(key)
+        if cached is None:
+            order = sorted(key, key=lambda i: leg_value(self.legs[i], "id"))
+            cached = leg_set_probability([self.probs[i] for i in order], self.correlation[np.ix_(order, order)])
+            self._joint_cache[key] = cached
+        return cached
+
+    def joint_probabilities(self, parlays: list[tuple[int, ...]]) -> list[float]:
+        return [self.joint_probability(list(p)) for p in parlays]
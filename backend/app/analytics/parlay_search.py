@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import heapq
+import math
+from dataclasses import dataclass
+
+from app.analytics.correlation import bounded_joint_probability
+from app.analytics.parlay_index import ParlayLegIndex
+from app.utils.odds_math import american_to_decimal, decimal_to_american
+
+
+@dataclass
+class ParlayMatch:
+    ev: float
+    legs: tuple[int, ...]
+    mask: int
+
+
+class TopKParlays:
+    """Bounded min-heap of the best K parlays, identified by the bitmask of their legs."""
+
+    def __init__(self, k: int, min_ev: float = 0.0) -> None:
+        self.k = k
+        self.min_ev = min_ev
+        self._heap: list[tuple[float, int, tuple[int, ...]]] = []
+        self._masks: set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    @property
+    def threshold(self) -> float:
+        """EV a new parlay has to beat to enter the top K."""
+        return self._heap[0][0] if len(self._heap) >= self.k else self.min_ev
+
+    def offer(self, ev: float, mask: int, legs: tuple[int, ...]) -> bool:
+        if self.k <= 0 or ev <= self.threshold or mask in self._masks:
+            return False
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, (ev, mask, legs))
+        else:
+            _, evicted, _ = heapq.heapreplace(self._heap, (ev, mask, legs))
+            self._masks.discard(evicted)
+        self._masks.add(mask)
+        return True
+
+    def ranked(self) -> list[ParlayMatch]:
+        return [ParlayMatch(ev=ev, legs=legs, mask=mask) for ev, mask, legs in sorted(self._heap, reverse=True)]
+
+
+def _optimistic_factor(tops: list[float], slots: int, mandatory: int) -> float:
+    if len(tops) < mandatory:
+        return 0.0
+    factor = 1.0
+    for idx, value in enumerate(tops[:slots]):
+        if idx >= mandatory and value <= 1.0:
+            break
+        factor *= value
+    return factor
+
+
+def _reach_table(upper: list[float], start: int, min_legs: int, max_legs: int) -> list[list[float]]:
+    """reach[size][j]: best (EV + 1) multiplier from adding legs at index >= j to a parlay of ``size`` legs."""
+    n = len(upper)
+    reach = [[0.0] * (n + 1) for _ in range(max_legs + 1)]
+    tops: list[float] = []
+    for j in range(n, start - 1, -1):
+        if j < n and upper[j] > 0.0:
+            tops = sorted(tops + [upper[j]], reverse=True)[: max_legs - 1]
+        for size in range(1, max_legs + 1):
+            reach[size][j] = _optimistic_factor(tops, max_legs - size, max(0, min_legs - size))
+    return reach
+
+
+def search_top_parlays(
+    index: ParlayLegIndex,
+    *,
+    min_legs: int,
+    max_legs: int,
+    min_odds_american: int,
+    max_odds_american: int,
+    max_correlation: float,
+    top_k: int,
+) -> list[ParlayMatch]:
+    """Branch-and-bound search for the top-K parlays by EV.
+
+    Ranking uses the pairwise chained approximation (each leg correlated with the root leg
+    and clipped to the Frechet bound), so the joint probability never increases as legs are
+    added. A subtree is pruned when its combined odds leave the allowed window or when its
+    EV upper bound cannot beat the current K-th best parlay.
+    """
+    n = len(index)
+    probs, decimals = index.probs, index.decimals
+    compatible_bits, correlation = index.compatible_bits, index.correlation_rows
+    # decimal_to_american rounds, so allow half a cent of slack on the ceiling.
+    max_decimal = american_to_decimal(max_odds_american) + 0.005
+
+    best = TopKParlays(top_k)
+
+    for root in range(n):
+        if decimals[root] >= max_decimal or not 0.0 < probs[root] < 1.0:
+            continue
+
+        # A parlay that beats the current threshold inside the odds window has joint prob of at
+        # least floor_prob, and so does every prefix of it since the chained joint never grows.
+        floor_prob = min(1.0, (1.0 + best.threshold) / max_decimal)
+        boost = math.sqrt((1.0 - floor_prob) / floor_prob)
+
+        # Best-case (EV + 1) multiplier each leg can contribute when chained onto this root.
+        upper = [0.0] * n
+        root_row = correlation[root]
+        for j in range(root + 1, n):
+            if not compatible_bits[root] >> j & 1 or not 0.0 < probs[j] < 1.0:
+                continue
+            corr = max(0.0, root_row[j])
+            lift = corr * math.sqrt(probs[j] * (1.0 - probs[j])) * boost
+            upper[j] = decimals[j] * min(1.0, probs[j] + lift)
+        reach = _reach_table(upper, root + 1, min_legs, max_legs)
+
+        def extend(chosen: list[int], mask: int, joint: float, dec: float, corr_sum: float) -> None:
+            size = len(chosen)
+            if size >= min_legs:
+                ev = joint * dec - 1.0
+                if (
+                    ev > best.threshold
+                    and min_odds_american <= decimal_to_american(dec) <= max_odds_american
+                    and corr_sum / (size * (size - 1) / 2) <= max_correlation
+                ):
+                    best.offer(ev, mask, tuple(chosen))
+            if size == max_legs:
+                return
+
+            for j in range(chosen[-1] + 1, n):
+                # reach[size][j] only shrinks as j grows, so the first failing bound ends the loop.
+                if joint * min(max_decimal, dec * reach[size][j]) - 1.0 <= best.threshold:
+                    break
+                if upper[j] == 0.0:
+                    continue
+                next_dec = dec * decimals[j]
+                if next_dec >= max_decimal:
+                    continue
+                if compatible_bits[j] & mask != mask:
+                    continue
+
+                next_joint = bounded_joint_probability(joint, probs[j], root_row[j])
+                if next_joint * min(max_decimal, next_dec * reach[size + 1][j + 1]) - 1.0 <= best.threshold:
+                    continue
+
+                extend(
+                    chosen + [j],
+                    mask | 1 << j,
+                    next_joint,
+                    next_dec,
+                    corr_sum + sum(correlation[k][j] for k in chosen),
+                )
+
+        extend([root], 1 << root, probs[root], decimals[root], 0.0)
+
+    return best.ranked()
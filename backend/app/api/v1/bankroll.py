@@ -3,13 +3,14 @@ from __future__ import annotations
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.v1.conditional import data_version_etag
 from app.database import get_session
 from app.services.bankroll_service import get_bankroll_history, get_current_bankroll, get_kelly_suggestions
 
 router = APIRouter(prefix="/bankroll", tags=["bankroll"])
 
 
-@router.get("/current")
+@router.get("/current", dependencies=[Depends(data_version_etag)])
 async def current_bankroll(session: AsyncSession = Depends(get_session)) -> dict:
     return await get_current_bankroll(session)
 
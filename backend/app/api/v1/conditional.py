@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import hashlib
+from datetime import UTC, datetime
+
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_session
+from app.services.change_feed import current_change_seq
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so a W/ prefix added by a proxy still matches.
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+async def data_version_etag(
+    request: Request, response: Response, session: AsyncSession = Depends(get_session)
+) -> None:
+    """Answer If-None-Match with 304 before the endpoint runs.
+
+    The tag covers the URL, the UTC day (for "today" views) and the picks feed cursor,
+    which every pick, parlay, settlement and ledger write bumps; odds polls do not.
+    """
+    version = await current_change_seq(session)
+    key = f"{request.url.path}?{request.url.query}|{datetime.now(UTC).date()}|{version}"
+    etag = f'"{hashlib.blake2b(key.encode(), digest_size=12).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _matches(if_none_match, etag):
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
@@ -1,30 +1,27 @@
 from __future__ import annotations
 
 import asyncio
-import logging
+from collections import defaultdict
 from datetime import UTC, datetime, timedelta
 
-from fastapi import APIRouter, Depends
-from sqlalchemy import and_, select
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.analytics.consensus import calculate_consensus
-from app.data_providers.nba_stats import NBAStatsClient
+from app.data_providers.nba_stats import get_nba_client
 from app.database import get_session
-from app.ml.features import build_game_features, features_to_array, features_to_dict
 from app.ml.model import predictor
-from app.models.game import Game
-from app.models.odds_snapshot import OddsSnapshot
-from app.models.sport import Sport
+from app.models.current_odds import CurrentOdds
+from app.services.prediction_service import latest_predictions, upcoming_nba_games
 from app.tasks.train_model import run_model_training_background
 
-logger = logging.getLogger(__name__)
-
 router = APIRouter(prefix="/model", tags=["model"])
 
 
 @router.get("/status")
 async def model_status() -> dict:
+    predictor.reload_if_changed()
     return {
         "is_trained": predictor.is_trained,
         "training_accuracy": predictor.training_accuracy,
@@ -32,74 +29,64 @@ async def model_status() -> dict:
         "n_training_samples": predictor.n_training_samples,
         "last_trained": predictor.last_trained.isoformat() if predictor.last_trained else None,
         "top_features": predictor.top_features,
+        "data_cache": get_nba_client().cache_stats(),
     }
 
 
 @router.post("/train")
 async def train_model() -> dict:
-    client = NBAStatsClient()
-    asyncio.create_task(run_model_training_background(client))
+    asyncio.create_task(run_model_training_background(get_nba_client()))
     return {"status": "training_started"}
 
 
+@router.post("/cache/refresh")
+async def refresh_data_cache(season: int | None = Query(default=None)) -> dict:
+    """Clear this API process's in-memory season data and the shared on-disk responses.
+
+    The worker keeps its own in-memory copy; it sees the change once its in-progress
+    season expires (``nba_current_season_ttl_seconds``) and reloads from the emptied disk cache.
+    """
+    client = get_nba_client()
+    client.refresh(season)
+    return client.cache_stats()
+
+
 @router.get("/predictions/today")
 async def today_predictions(session: AsyncSession = Depends(get_session)) -> list[dict]:
-    if not predictor.is_trained:
-        return []
-
-    nba_sport = await session.scalar(select(Sport).where(Sport.key == "basketball_nba"))
-    if nba_sport is None:
+    now = datetime.now(UTC)
+    games = await upcoming_nba_games(session, now, now + timedelta(days=1))
+    stored = await latest_predictions(session, [g.id for g in games])
+    if not stored:
         return []
 
-    now = datetime.now(UTC)
-    end = now + timedelta(days=1)
-    games = (
-        await session.scalars(
-            select(Game).where(and_(Game.sport_id == nba_sport.id, Game.commence_time >= now, Game.commence_time <= end)).order_by(Game.commence_time)
+    quotes_by_game: dict[int, list[CurrentOdds]] = defaultdict(list)
+    quotes = await session.scalars(
+        select(CurrentOdds).where(
+            CurrentOdds.game_id.in_(list(stored)), CurrentOdds.market == "h2h", CurrentOdds.removed_at.is_(None)
         )
-    ).all()
-
-    client = NBAStatsClient()
-    seasons = {
-        g.commence_time.year - 1 if g.commence_time.month < 10 else g.commence_time.year
-        for g in games
-    }
-    for season in seasons:
-        if not await client.get_team_stats(season, use_cache=True):
-            logger.info("Skipping /model/predictions/today: missing cached team stats for season %s", season)
-            return []
+    )
+    for quote in quotes:
+        quotes_by_game[quote.game_id].append(quote)
 
     predictions: list[dict] = []
-
     for game in games:
-        snapshots = (
-            await session.scalars(
-                select(OddsSnapshot).where(OddsSnapshot.game_id == game.id).order_by(OddsSnapshot.snapshot_time.asc())
-            )
-        ).all()
-        if not snapshots:
+        prediction = stored.get(game.id)
+        if prediction is None:
             continue
-        market = calculate_consensus(snapshots, "h2h")
+        market = calculate_consensus(quotes_by_game[game.id], "h2h")
         home_market = market.get(game.home_team.lower(), {}).get("fair_prob")
         if home_market is None:
             continue
 
-        try:
-            features = await build_game_features(game.home_team, game.away_team, game.commence_time.date(), client)
-            model_prob = predictor.predict_home_win_prob(features_to_array(features))
-        except Exception as exc:
-            logger.warning("Skipping prediction for %s vs %s: %s", game.home_team, game.away_team, exc)
-            continue
-
         predictions.append(
             {
                 "game_id": game.id,
                 "home_team": game.home_team,
                 "away_team": game.away_team,
-                "model_home_win_prob": model_prob,
+                "model_home_win_prob": prediction.home_win_prob,
                 "market_home_win_prob": home_market,
-                "disagreement_pct": abs(model_prob - home_market),
-                "features": features_to_dict(features),
+                "disagreement_pct": abs(prediction.home_win_prob - home_market),
+                "features": prediction.features,
             }
         )
 
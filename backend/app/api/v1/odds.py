@@ -1,10 +1,14 @@
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
 
 from app.database import get_session
 from app.models.game import Game
 from app.models.odds_snapshot import OddsSnapshot
+from app.services.change_feed import ODDS_FEED, current_change_seq
+from app.services.event_hub import ODDS_CHANNEL, sse_events
+from app.services.odds_board import get_odds_board
 from app.services.odds_normalizer import normalize_team_name, resolve_side
 
 router = APIRouter(prefix="/odds", tags=["odds"])
@@ -48,3 +52,25 @@ async def live_odds(session: AsyncSession = Depends(get_session)) -> list[dict]:
         )
 
     return payload
+
+
+@router.get("/board")
+async def odds_board(
+    response: Response,
+    sport: str | None = Query(default=None),
+    since: int | None = Query(default=None, ge=0),
+    session: AsyncSession = Depends(get_session),
+) -> list[dict]:
+    # Read the cursor first: rows committed in between are resent next time, never skipped.
+    response.headers["X-Change-Cursor"] = str(await current_change_seq(session, ODDS_FEED))
+    return await get_odds_board(session, sport_key=sport, since=since)
+
+
+@router.get("/stream")
+async def stream_odds_changes(request: Request, sport: str | None = Query(default=None)) -> StreamingResponse:
+    keep = (lambda quote: quote["sport_key"] == sport) if sport else None
+    return StreamingResponse(
+        sse_events(ODDS_CHANNEL, "odds", request.is_disconnected, keep),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
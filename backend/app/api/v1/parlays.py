@@ -1,96 +1,78 @@
 from __future__ import annotations
 
-from datetime import date, datetime, timedelta
+from collections import defaultdict
+from datetime import date, datetime
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.v1.conditional import data_version_etag
 from app.database import get_session
 from app.models.game import Game
 from app.models.parlay import Parlay, ParlayLeg
 from app.models.pick import Pick
-from app.schemas.parlays import ParlayBuildRequest, ParlayBuildResponse, ParlayLegResponse, ParlayResponse
-from app.schemas.picks import PickResponse
-from app.services.parlay_service import build_custom_parlay, generate_daily_parlays
+from app.schemas.parlays import (
+    ParlayBuildRequest,
+    ParlayBuildResponse,
+    ParlayPriceRequest,
+    ParlayPriceResponse,
+    ParlayResponse,
+)
+from app.schemas.picks import pick_row
+from app.services.export_service import EXPORT_FORMATS, PARLAY_EXPORT_FIELDS, encode_rows, stream_parlays
+from app.services.parlay_service import build_custom_parlay, generate_daily_parlays, price_parlays
 from app.tasks.generate_parlays import run_generate_parlays
+from app.utils.pagination import encode_cursor, keyset_page
+from app.utils.responses import FastJSONResponse, fast_json
 
 router = APIRouter(prefix="/parlays", tags=["parlays"])
 
 
-async def _pick_response(session: AsyncSession, pick: Pick) -> PickResponse:
-    game = await session.scalar(select(Game).where(Game.id == pick.game_id))
-    return PickResponse(
-        id=pick.id,
-        game_id=pick.game_id,
-        sport_key=pick.sport_key,
-        home_team=game.home_team if game else "",
-        away_team=game.away_team if game else "",
-        commence_time=game.commence_time if game else pick.created_at,
-        market=pick.market,
-        side=pick.side,
-        line=pick.line,
-        odds_american=pick.odds_american,
-        best_book=pick.best_book,
-        fair_prob=pick.fair_prob,
-        prob_source=pick.prob_source,
-        implied_prob=pick.implied_prob,
-        ev_pct=pick.ev_pct,
-        composite_score=pick.composite_score,
-        confidence_tier=pick.confidence_tier,
-        signals=pick.signals,
-        data_quality=pick.data_quality,
-        suggested_kelly_fraction=pick.suggested_kelly_fraction,
-        outcome=pick.outcome,
-        market_clv=pick.market_clv,
-        book_clv=pick.book_clv,
-        created_at=pick.created_at,
-    )
+_PARLAY_FIELDS = tuple(name for name in ParlayResponse.model_fields if name != "legs")
 
 
-async def _serialize_parlay(session: AsyncSession, parlay: Parlay) -> ParlayResponse:
-    leg_rows = (
-        await session.scalars(select(ParlayLeg).where(ParlayLeg.parlay_id == parlay.id).order_by(ParlayLeg.leg_order))
-    ).all()
-    legs: list[ParlayLegResponse] = []
-    for leg in leg_rows:
-        pick = await session.scalar(select(Pick).where(Pick.id == leg.pick_id))
-        if pick is None:
-            continue
-        legs.append(
-            ParlayLegResponse(
-                id=leg.id,
-                pick_id=leg.pick_id,
-                leg_order=leg.leg_order,
-                result=leg.result,
-                pick=await _pick_response(session, pick),
-            )
+async def _parlay_rows(session: AsyncSession, parlays: list[Parlay]) -> list[dict]:
+    """Load the legs, picks and games for a page of parlays in one query and assemble in memory."""
+    legs_by_parlay: dict[int, list[dict]] = defaultdict(list)
+    if parlays:
+        rows = await session.execute(
+            select(ParlayLeg, Pick, Game.home_team, Game.away_team, Game.commence_time)
+            .join(Pick, Pick.id == ParlayLeg.pick_id)
+            .outerjoin(Game, Game.id == Pick.game_id)
+            .where(ParlayLeg.parlay_id.in_([p.id for p in parlays]))
+            .order_by(ParlayLeg.parlay_id, ParlayLeg.leg_order)
         )
+        for leg, pick, home_team, away_team, commence_time in rows:
+            legs_by_parlay[leg.parlay_id].append(
+                {
+                    "id": leg.id,
+                    "pick_id": leg.pick_id,
+                    "leg_order": leg.leg_order,
+                    "result": leg.result,
+                    "pick": pick_row(pick, home_team, away_team, commence_time),
+                }
+            )
 
-    return ParlayResponse(
-        id=parlay.id,
-        risk_level=parlay.risk_level,
-        num_legs=parlay.num_legs,
-        combined_odds_american=parlay.combined_odds_american,
-        combined_odds_decimal=parlay.combined_odds_decimal,
-        combined_ev_pct=parlay.combined_ev_pct,
-        combined_fair_prob=parlay.combined_fair_prob,
-        correlation_score=parlay.correlation_score,
-        suggested_kelly_fraction=parlay.suggested_kelly_fraction,
-        outcome=parlay.outcome,
-        profit_loss=parlay.profit_loss,
-        created_at=parlay.created_at,
-        legs=legs,
-    )
+    return [
+        {**{name: getattr(parlay, name) for name in _PARLAY_FIELDS}, "legs": legs_by_parlay[parlay.id]}
+        for parlay in parlays
+    ]
 
 
-@router.get("/today", response_model=list[ParlayResponse])
-async def get_today_parlays(session: AsyncSession = Depends(get_session)) -> list[ParlayResponse]:
+@router.get(
+    "/today",
+    response_model=list[ParlayResponse],
+    response_class=FastJSONResponse,
+    dependencies=[Depends(data_version_etag)],
+)
+async def get_today_parlays(response: Response, session: AsyncSession = Depends(get_session)) -> FastJSONResponse:
     today = datetime.utcnow().date()
     rows = (
         await session.scalars(select(Parlay).where(Parlay.pick_date == today).order_by(Parlay.risk_level, Parlay.combined_ev_pct.desc()))
     ).all()
-    return [await _serialize_parlay(session, p) for p in rows]
+    return fast_json(await _parlay_rows(session, list(rows)), response)
 
 
 @router.post("/generate")
@@ -110,21 +92,57 @@ async def build_parlay(request: ParlayBuildRequest, session: AsyncSession = Depe
     return ParlayBuildResponse(**result)
 
 
-@router.get("/history", response_model=list[ParlayResponse])
+@router.post("/price", response_model=ParlayPriceResponse)
+async def price_parlay_variations(
+    request: ParlayPriceRequest, session: AsyncSession = Depends(get_session)
+) -> ParlayPriceResponse:
+    results = await price_parlays(session, request.leg_sets)
+    return ParlayPriceResponse(results=[ParlayBuildResponse(**r) for r in results])
+
+
+def _history_filters(risk_level: str | None, start_date: date | None, end_date: date | None) -> list:
+    filters = []
+    if risk_level:
+        filters.append(Parlay.risk_level == risk_level)
+    if start_date:
+        filters.append(Parlay.pick_date >= start_date)
+    if end_date:
+        filters.append(Parlay.pick_date <= end_date)
+    return filters
+
+
+@router.get("/history", response_model=list[ParlayResponse], response_class=FastJSONResponse)
 async def parlay_history(
+    response: Response,
     risk_level: str | None = Query(default=None),
     start_date: date | None = Query(default=None),
     end_date: date | None = Query(default=None),
-    limit: int = Query(default=50, le=200),
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = Query(default=None),
     session: AsyncSession = Depends(get_session),
-) -> list[ParlayResponse]:
-    stmt = select(Parlay)
-    if risk_level:
-        stmt = stmt.where(Parlay.risk_level == risk_level)
-    if start_date:
-        stmt = stmt.where(Parlay.pick_date >= start_date)
-    if end_date:
-        stmt = stmt.where(Parlay.pick_date <= end_date)
-
-    rows = (await session.scalars(stmt.order_by(Parlay.created_at.desc()).limit(limit))).all()
-    return [await _serialize_parlay(session, p) for p in rows]
+) -> FastJSONResponse:
+    stmt = select(Parlay).where(*_history_filters(risk_level, start_date, end_date))
+    try:
+        stmt = keyset_page(stmt, Parlay.created_at, Parlay.id, cursor, limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    rows = list((await session.scalars(stmt)).all())
+    if rows and len(rows) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(rows[-1].created_at, rows[-1].id)
+    return fast_json(await _parlay_rows(session, rows), response)
+
+
+@router.get("/export")
+async def export_parlays(
+    format: str = Query(default="ndjson", pattern="^(ndjson|csv)$"),
+    risk_level: str | None = Query(default=None),
+    start_date: date | None = Query(default=None),
+    end_date: date | None = Query(default=None),
+) -> StreamingResponse:
+    stmt = select(Parlay).where(*_history_filters(risk_level, start_date, end_date)).order_by(Parlay.created_at, Parlay.id)
+    return StreamingResponse(
+        encode_rows(stream_parlays(stmt), format, PARLAY_EXPORT_FIELDS),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="parlays.{format}"'},
+    )
@@ -5,13 +5,14 @@ from datetime import date
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.v1.conditional import data_version_etag
 from app.database import get_session
 from app.services.performance_service import get_daily_performance, get_performance_summary, get_roi_over_time, summary_to_dict
 
 router = APIRouter(prefix="/performance", tags=["performance"])
 
 
-@router.get("/summary")
+@router.get("/summary", dependencies=[Depends(data_version_etag)])
 async def performance_summary(
     start_date: date | None = Query(default=None),
     end_date: date | None = Query(default=None),
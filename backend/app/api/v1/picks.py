@@ -2,65 +2,63 @@ from __future__ import annotations
 
 from datetime import UTC, datetime, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 
-from app.database import get_session
+from app.api.v1.conditional import data_version_etag
+from app.database import AsyncSessionLocal, get_session
 from app.models.game import Game
 from app.models.pick import Pick
-from app.schemas.picks import PickResponse
+from app.schemas.picks import LEAN_PICK_FIELDS, PickResponse, PickSummaryResponse, pick_row
+from app.services.change_feed import current_change_seq
+from app.services.event_hub import PICKS_CHANNEL, sse_events
+from app.services.export_service import EXPORT_FORMATS, PICK_EXPORT_FIELDS, encode_rows, pick_export_statement, stream_picks
 from app.tasks.generate_picks import run_generate_picks
 from app.tasks.generate_parlays import run_generate_parlays
+from app.utils.pagination import encode_cursor, keyset_page
+from app.utils.responses import FastJSONResponse, fast_json
 
 router = APIRouter(prefix="/picks", tags=["picks"])
 
 
-async def _serialize_pick(session: AsyncSession, pick: Pick) -> PickResponse:
-    game = await session.scalar(select(Game).where(Game.id == pick.game_id))
-    return PickResponse(
-        id=pick.id,
-        game_id=pick.game_id,
-        sport_key=pick.sport_key,
-        home_team=game.home_team if game else "",
-        away_team=game.away_team if game else "",
-        commence_time=game.commence_time if game else pick.created_at,
-        pick_day=pick.pick_day,
-        market=pick.market,
-        side=pick.side,
-        line=pick.line,
-        odds_american=pick.odds_american,
-        best_book=pick.best_book,
-        issued_at=pick.issued_at,
-        snapshot_time_open=pick.snapshot_time_open,
-        model_prob=pick.model_prob,
-        implied_prob_open=pick.implied_prob_open,
-        edge=pick.edge,
-        consensus_prob=pick.consensus_prob,
-        book_count=pick.book_count,
-        closing_odds_american=pick.closing_odds_american,
-        closing_line=pick.closing_line,
-        closing_snapshot_time=pick.closing_snapshot_time,
-        clv_prob=pick.clv_prob,
-        clv_price=pick.clv_price,
-        status=pick.status,
-        result=pick.result,
-        settled_at=pick.settled_at,
-        pnl_units=pick.pnl_units,
-        fair_prob=pick.fair_prob,
-        prob_source=pick.prob_source,
-        implied_prob=pick.implied_prob,
-        ev_pct=pick.ev_pct,
-        composite_score=pick.composite_score,
-        confidence_tier=pick.confidence_tier,
-        signals=pick.signals,
-        data_quality=pick.data_quality,
-        suggested_kelly_fraction=pick.suggested_kelly_fraction,
-        outcome=pick.outcome,
-        market_clv=pick.market_clv,
-        book_clv=pick.book_clv,
-        created_at=pick.created_at,
-    )
+_LEAN_COLUMNS = [getattr(Pick, name) for name in LEAN_PICK_FIELDS]
+
+
+async def _pick_rows(session: AsyncSession, stmt, lean: bool = False) -> list[dict]:
+    """Run a select(Pick) with its games joined in and build the response rows in one pass.
+
+    Lean mode loads and returns only the non-legacy pick columns.
+    """
+    stmt = stmt.add_columns(Game.home_team, Game.away_team, Game.commence_time).outerjoin(Game, Game.id == Pick.game_id)
+    if lean:
+        stmt = stmt.options(load_only(*_LEAN_COLUMNS))
+    rows = (await session.execute(stmt)).all()
+    return [pick_row(pick, home, away, commence, lean) for pick, home, away, commence in rows]
+
+
+async def _serialize_picks(session: AsyncSession, stmt, lean: bool = False) -> list[PickResponse | PickSummaryResponse]:
+    model = PickSummaryResponse if lean else PickResponse
+    return [model(**row) for row in await _pick_rows(session, stmt, lean)]
+
+
+async def load_changed_picks(pick_ids: list[int]) -> list[dict]:
+    """Lean payloads for picks named in a change notification."""
+    async with AsyncSessionLocal() as session:
+        picks = await _serialize_picks(session, select(Pick).where(Pick.id.in_(pick_ids)), lean=True)
+    return [pick.model_dump(mode="json") for pick in picks]
+
+
+async def _serialize_changed_picks(
+    session: AsyncSession, response: Response, stmt, since: int | None, lean: bool
+) -> list[PickResponse | PickSummaryResponse]:
+    """Picks from ``stmt`` changed after ``since`` (all of them without it), plus the next cursor."""
+    response.headers["X-Change-Cursor"] = str(await current_change_seq(session))
+    if since is not None:
+        stmt = stmt.where(Pick.change_seq > since)
+    return await _serialize_picks(session, stmt, lean)
 
 
 @router.post("/generate")
@@ -71,60 +69,113 @@ async def trigger_generate_picks() -> dict[str, int | str]:
     return summary
 
 
-@router.get("/live", response_model=list[PickResponse])
-async def get_live_picks(session: AsyncSession = Depends(get_session)) -> list[PickResponse]:
+@router.get("/live", response_model=list[PickResponse] | list[PickSummaryResponse])
+async def get_live_picks(
+    response: Response,
+    since: int | None = Query(default=None, ge=0),
+    lean: bool = Query(default=False),
+    session: AsyncSession = Depends(get_session),
+) -> list[PickResponse | PickSummaryResponse]:
     now = datetime.now(UTC)
     start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    picks = (
-        await session.scalars(
-            select(Pick).where(Pick.pick_date >= start).order_by(Pick.ev_pct.desc())
-        )
-    ).all()
-    return [await _serialize_pick(session, p) for p in picks]
-
-
-@router.get("/today", response_model=list[PickResponse])
-async def get_today_picks(session: AsyncSession = Depends(get_session)) -> list[PickResponse]:
+    stmt = select(Pick).where(Pick.pick_date >= start).order_by(Pick.ev_pct.desc())
+    return await _serialize_changed_picks(session, response, stmt, since, lean)
+
+
+@router.get(
+    "/today",
+    response_model=list[PickResponse] | list[PickSummaryResponse],
+    dependencies=[Depends(data_version_etag)],
+)
+async def get_today_picks(
+    response: Response,
+    since: int | None = Query(default=None, ge=0),
+    lean: bool = Query(default=False),
+    session: AsyncSession = Depends(get_session),
+) -> list[PickResponse | PickSummaryResponse]:
     now = datetime.now(UTC)
     start = now.replace(hour=0, minute=0, second=0, microsecond=0)
     end = start + timedelta(days=1)
-    picks = (
-        await session.scalars(
-            select(Pick).where(and_(Pick.pick_date >= start, Pick.pick_date < end)).order_by(Pick.ev_pct.desc())
-        )
-    ).all()
-    return [await _serialize_pick(session, p) for p in picks]
+    stmt = select(Pick).where(and_(Pick.pick_date >= start, Pick.pick_date < end)).order_by(Pick.ev_pct.desc())
+    return await _serialize_changed_picks(session, response, stmt, since, lean)
+
+
+def _history_filters(
+    sport: str | None,
+    market: str | None,
+    confidence: str | None,
+    start_date: datetime | None,
+    end_date: datetime | None,
+) -> list:
+    filters = []
+    if sport:
+        filters.append(Pick.sport_key == sport)
+    if market:
+        filters.append(Pick.market == market)
+    if confidence:
+        filters.append(Pick.confidence_tier == confidence)
+    if start_date:
+        filters.append(Pick.created_at >= start_date)
+    if end_date:
+        filters.append(Pick.created_at <= end_date)
+    return filters
 
 
-@router.get("/history", response_model=list[PickResponse])
+@router.get("/history", response_model=list[PickResponse] | list[PickSummaryResponse], response_class=FastJSONResponse)
 async def get_pick_history(
+    response: Response,
     sport: str | None = Query(default=None),
     market: str | None = Query(default=None),
     confidence: str | None = Query(default=None),
     start_date: datetime | None = Query(default=None),
     end_date: datetime | None = Query(default=None),
-    limit: int = Query(default=50, le=200),
+    limit: int = Query(default=50, ge=1, le=200),
+    cursor: str | None = Query(default=None),
+    lean: bool = Query(default=False),
     session: AsyncSession = Depends(get_session),
-) -> list[PickResponse]:
-    stmt = select(Pick)
-    if sport:
-        stmt = stmt.where(Pick.sport_key == sport)
-    if market:
-        stmt = stmt.where(Pick.market == market)
-    if confidence:
-        stmt = stmt.where(Pick.confidence_tier == confidence)
-    if start_date:
-        stmt = stmt.where(Pick.created_at >= start_date)
-    if end_date:
-        stmt = stmt.where(Pick.created_at <= end_date)
+) -> FastJSONResponse:
+    stmt = select(Pick).where(*_history_filters(sport, market, confidence, start_date, end_date))
+    try:
+        stmt = keyset_page(stmt, Pick.created_at, Pick.id, cursor, limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    picks = await _pick_rows(session, stmt, lean)
+    if picks and len(picks) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(picks[-1]["created_at"], picks[-1]["id"])
+    return fast_json(picks, response)
+
+
+@router.get("/export")
+async def export_picks(
+    format: str = Query(default="ndjson", pattern="^(ndjson|csv)$"),
+    sport: str | None = Query(default=None),
+    market: str | None = Query(default=None),
+    confidence: str | None = Query(default=None),
+    start_date: datetime | None = Query(default=None),
+    end_date: datetime | None = Query(default=None),
+) -> StreamingResponse:
+    stmt = pick_export_statement().where(*_history_filters(sport, market, confidence, start_date, end_date))
+    return StreamingResponse(
+        encode_rows(stream_picks(stmt), format, PICK_EXPORT_FIELDS),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="picks.{format}"'},
+    )
 
-    picks = (await session.scalars(stmt.order_by(Pick.created_at.desc()).limit(limit))).all()
-    return [await _serialize_pick(session, p) for p in picks]
+
+@router.get("/stream")
+async def stream_picks_changes(request: Request, sport: str | None = Query(default=None)) -> StreamingResponse:
+    keep = (lambda pick: pick["sport_key"] == sport) if sport else None
+    return StreamingResponse(
+        sse_events(PICKS_CHANNEL, "picks", request.is_disconnected, keep),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/{pick_id}", response_model=PickResponse)
 async def get_pick_detail(pick_id: int, session: AsyncSession = Depends(get_session)) -> PickResponse:
-    pick = await session.scalar(select(Pick).where(Pick.id == pick_id))
-    if pick is None:
+    picks = await _serialize_picks(session, select(Pick).where(Pick.id == pick_id))
+    if not picks:
         raise HTTPException(status_code=404, detail="Pick not found")
-    return await _serialize_pick(session, pick)
+    return picks[0]
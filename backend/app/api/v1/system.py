@@ -4,18 +4,40 @@ from fastapi import APIRouter, Depends
 
 from app.database import get_session
 from app.models.odds_snapshot import OddsSnapshot
+from app.services.ingestion_status import approximate_row_count, get_ingestion_status
 from app.services.polling_scheduler import scheduler
 
 router = APIRouter(prefix="/system", tags=["system"])
 
 
+def _isoformat(value) -> str | None:
+    return value.isoformat() if value else None
+
+
 @router.get("/polling-status")
 async def polling_status() -> dict:
     return scheduler.get_status()
 
 
 @router.get("/health")
-async def health(session: AsyncSession = Depends(get_session)) -> dict[str, str | int | None]:
+async def health(session: AsyncSession = Depends(get_session)) -> dict:
+    """Probe-friendly: reads the worker's status row and the planner's row estimate only."""
+    status = await get_ingestion_status(session)
+    return {
+        "status": "ok",
+        "snapshot_count": await approximate_row_count(session, "odds_snapshots"),
+        "snapshot_count_estimated": True,
+        "last_snapshot_time": _isoformat(status.last_snapshot_at) if status else None,
+        "last_cycle_at": _isoformat(status.last_cycle_at) if status else None,
+        "last_cycle_status": status.last_cycle_status if status else None,
+        "last_cycle_games_fetched": status.games_fetched if status else None,
+        "last_cycle_snapshots_inserted": status.snapshots_inserted if status else None,
+    }
+
+
+@router.get("/health/deep")
+async def deep_health(session: AsyncSession = Depends(get_session)) -> dict[str, str | int | None]:
+    """Exact snapshot numbers; scans odds_snapshots, so keep it off liveness probes."""
     snapshot_count_stmt = select(func.count(OddsSnapshot.id))
     last_snapshot_stmt = select(func.max(OddsSnapshot.snapshot_time))
 
@@ -25,5 +47,5 @@ async def health(session: AsyncSession = Depends(get_session)) -> dict[str, str
     return {
         "status": "ok",
         "snapshot_count": snapshot_count,
-        "last_snapshot_time": last_snapshot_time.isoformat() if last_snapshot_time else None,
+        "last_snapshot_time": _isoformat(last_snapshot_time),
     }
@@ -10,6 +10,9 @@ class Settings(BaseSettings):
     odds_api_regions: str = "us"
     odds_api_markets: str = "h2h,spreads,totals"
     odds_poll_interval_seconds: int = 600
+    parlay_search_workers: int = 0
+    nba_cache_max_seasons: int = 3
+    nba_current_season_ttl_seconds: int = 21600
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from datetime import UTC, date, datetime
+from typing import Any
+
+import pandas as pd
+from nba_api.stats.endpoints._base import Endpoint
+
+NBA_API_CACHE_DIR = os.environ.get("NBA_API_CACHE_DIR", "/app/models/nba_api_cache")
+logger = logging.getLogger(__name__)
+
+
+def season_for_date(day: date | None = None) -> int:
+    """NBA season (by starting year) that ``day`` belongs to; seasons roll over on July 1."""
+    day = day or datetime.now(UTC).date()
+    return day.year if day.month >= 7 else day.year - 1
+
+
+def season_is_complete(season: int, today: date | None = None) -> bool:
+    return season < season_for_date(today)
+
+
+class NBAResponseCache:
+    """On-disk cache of nba_api result sets, one gzipped JSON file per (endpoint, season, params).
+
+    Completed seasons never expire; the in-progress season is refetched once its
+    file is older than ``current_season_ttl_s``.
+    """
+
+    def __init__(self, root: str = NBA_API_CACHE_DIR, current_season_ttl_s: float = 6 * 3600) -> None:
+        self.root = root
+        self.current_season_ttl_s = current_season_ttl_s
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, endpoint: str, season: int, params: dict[str, Any]) -> str:
+        payload = json.dumps({"endpoint": endpoint, "season": season, "params": params}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def path(self, endpoint: str, season: int, params: dict[str, Any]) -> str:
+        return os.path.join(self.root, endpoint, str(season), f"{self.key(endpoint, season, params)}.json.gz")
+
+    def _is_fresh(self, path: str, season: int) -> bool:
+        if season_is_complete(season):
+            return True
+        return time.time() - os.path.getmtime(path) < self.current_season_ttl_s
+
+    def get(self, endpoint: str, season: int, params: dict[str, Any]) -> list[pd.DataFrame] | None:
+        path = self.path(endpoint, season, params)
+        try:
+            if not self._is_fresh(path, season):
+                self.misses += 1
+                return None
+            with gzip.open(path, "rt", encoding="utf-8") as file:
+                data_sets = json.load(file)["data_sets"]
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception:
+            logger.exception("Ignoring unreadable nba_api cache file %s", path)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return [Endpoint.DataSet(data).get_data_frame() for data in data_sets]
+
+    def put(self, endpoint: str, season: int, params: dict[str, Any], data_sets: list[dict[str, Any]]) -> None:
+        path = self.path(endpoint, season, params)
+        directory = os.path.dirname(path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8") as file:
+                    json.dump(
+                        {
+                            "endpoint": endpoint,
+                            "season": season,
+                            "params": params,
+                            "fetched_at": datetime.now(UTC).isoformat(),
+                            "data_sets": data_sets,
+                        },
+                        file,
+                        separators=(",", ":"),
+                    )
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            logger.exception("Failed writing nba_api cache file %s", path)
+
+    def invalidate(self, season: int) -> int:
+        removed = 0
+        if not os.path.isdir(self.root):
+            return removed
+        for endpoint in os.listdir(self.root):
+            directory = os.path.join(self.root, endpoint, str(season))
+            if not os.path.isdir(directory):
+                continue
+            for name in os.listdir(directory):
+                os.unlink(os.path.join(directory, name))
+                removed += 1
+        return removed
+
+    def stats(self) -> dict[str, Any]:
+        files = 0
+        size = 0
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if name.endswith(".json.gz"):
+                    files += 1
+                    size += os.path.getsize(os.path.join(dirpath, name))
+        return {"dir": self.root, "files": files, "bytes": size, "hits": self.hits, "misses": self.misses}
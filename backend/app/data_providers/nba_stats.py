@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
-import os
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
 from datetime import UTC, date, datetime
+from functools import cache
 from typing import Any
 
 import pandas as pd
@@ -12,7 +14,10 @@ from nba_api.stats.endpoints import leaguegamefinder, leaguestandings, teamestim
 from nba_api.stats.library.parameters import SeasonTypeAllStar
 from nba_api.stats.static import teams
 
-TEAM_STATS_CACHE_PATH = os.environ.get("TEAM_STATS_CACHE_PATH", "/app/models/team_stats_cache.json")
+from app.config import settings
+from app.data_providers.nba_response_cache import NBAResponseCache, season_for_date, season_is_complete
+from app.data_providers.team_stats_store import load_team_stats, write_team_stats
+
 TEAM_NAME_ALIASES = {
     "la clippers": "Los Angeles Clippers",
     "los angeles clippers": "Los Angeles Clippers",
@@ -35,22 +40,135 @@ def team_last_word(team_name: str) -> str:
     return parts[-1].lower() if parts else ""
 
 
+class SeasonCache:
+    """Season-keyed cache that evicts the least recently used season beyond ``max_seasons``.
+
+    With ``current_season_ttl_s`` an in-progress season is also dropped once it is older
+    than that, so long-lived processes pick up new games.
+    """
+
+    def __init__(self, max_seasons: int, current_season_ttl_s: float | None = None) -> None:
+        self.max_seasons = max_seasons
+        self.current_season_ttl_s = current_season_ttl_s
+        self._data: OrderedDict[int, Any] = OrderedDict()
+        self._stored_at: dict[int, float] = {}
+
+    def _expired(self, season: int) -> bool:
+        if self.current_season_ttl_s is None or season_is_complete(season):
+            return False
+        return time.monotonic() - self._stored_at.get(season, 0.0) >= self.current_season_ttl_s
+
+    def __contains__(self, season: object) -> bool:
+        if season not in self._data:
+            return False
+        if self._expired(season):
+            self.pop(season)
+            return False
+        return True
+
+    def __getitem__(self, season: int) -> Any:
+        self._data.move_to_end(season)
+        return self._data[season]
+
+    def __setitem__(self, season: int, value: Any) -> None:
+        self._data[season] = value
+        self._stored_at[season] = time.monotonic()
+        self._data.move_to_end(season)
+        while len(self._data) > self.max_seasons:
+            evicted, _ = self._data.popitem(last=False)
+            self._stored_at.pop(evicted, None)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(list(self._data))
+
+    def keys(self) -> list[int]:
+        return list(self._data)
+
+    def values(self) -> list[Any]:
+        return list(self._data.values())
+
+    def pop(self, season: int, default: Any = None) -> Any:
+        self._stored_at.pop(season, None)
+        return self._data.pop(season, default)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._stored_at.clear()
+
+
 class NBAStatsClient:
     """Fetch team-level NBA stats for model features via nba_api."""
 
     REQUEST_DELAY_S = 0.6
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        max_seasons: int = 3,
+        response_cache: NBAResponseCache | None = None,
+        current_season_ttl_s: float | None = None,
+    ) -> None:
         self._logger = logging.getLogger(__name__)
+        self._response_cache = response_cache
+        if current_season_ttl_s is None and response_cache is not None:
+            # Keep the in-memory copy no longer than the stored responses it came from.
+            current_season_ttl_s = response_cache.current_season_ttl_s
         self._team_cache: dict[int, dict[str, Any]] = {}
         self._team_name_cache: dict[str, dict[str, Any]] = {}
-        self._season_stats_cache: dict[int, list[dict[str, Any]]] = {}
-        self._season_games_cache: dict[int, pd.DataFrame] = {}
-        self._current_metrics_cache: dict[int, dict[str, Any]] = {}
+        self._season_stats_cache: SeasonCache = SeasonCache(max_seasons, current_season_ttl_s)
+        self._season_games_cache: SeasonCache = SeasonCache(max_seasons, current_season_ttl_s)
+        self._current_metrics_cache: SeasonCache = SeasonCache(max_seasons, current_season_ttl_s)
+
+    def refresh(self, season: int | None = None) -> None:
+        """Drop cached season data (one season, or all of it) so the next call reloads it.
+
+        Stored nba_api responses are only dropped for seasons still in progress;
+        completed seasons cannot change.
+        """
+        caches = (self._season_stats_cache, self._season_games_cache, self._current_metrics_cache)
+        for season_cache in caches:
+            if season is None:
+                season_cache.clear()
+            else:
+                season_cache.pop(season)
+        if self._response_cache is not None:
+            in_progress = season_for_date() if season is None else season
+            if not season_is_complete(in_progress):
+                self._response_cache.invalidate(in_progress)
+
+    def cache_stats(self) -> dict[str, Any]:
+        games_bytes = sum(int(df.memory_usage(deep=True).sum()) for df in self._season_games_cache.values())
+        return {
+            "max_seasons": self._season_games_cache.max_seasons,
+            "season_games": {"seasons": sorted(self._season_games_cache.keys()), "bytes": games_bytes},
+            "team_stats": {
+                "seasons": sorted(self._season_stats_cache.keys()),
+                "teams": sum(len(stats) for stats in self._season_stats_cache.values()),
+            },
+            "team_metrics": {"seasons": sorted(self._current_metrics_cache.keys())},
+            "responses": self._response_cache.stats() if self._response_cache is not None else None,
+        }
 
     async def _pace(self) -> None:
         await asyncio.sleep(self.REQUEST_DELAY_S)
 
+    async def _fetch(self, endpoint_cls: type, season: int, **params: Any) -> list[pd.DataFrame]:
+        """Result-set frames for an nba_api endpoint, served from the on-disk cache when fresh."""
+        name = endpoint_cls.endpoint
+        if self._response_cache is not None:
+            cached = await asyncio.to_thread(self._response_cache.get, name, season, params)
+            if cached is not None:
+                return cached
+
+        endpoint = await asyncio.to_thread(endpoint_cls, **params)
+        await self._pace()
+        if self._response_cache is not None:
+            data_sets = [data_set.get_dict() for data_set in endpoint.data_sets]
+            await asyncio.to_thread(self._response_cache.put, name, season, params, data_sets)
+        return endpoint.get_data_frames()
+
     async def _load_teams(self) -> dict[int, dict[str, Any]]:
         if self._team_cache:
             return self._team_cache
@@ -81,7 +199,7 @@ class NBAStatsClient:
         return f"{season}-{str(season + 1)[-2:]}"
 
     async def _get_team_games_df(self, team_id: int, season: int | None = None) -> pd.DataFrame:
-        use_season = season if season is not None else datetime.now(UTC).year
+        use_season = season if season is not None else season_for_date()
         season_games = await self.get_season_games_df(use_season)
         if season_games.empty:
             return pd.DataFrame()
@@ -93,14 +211,13 @@ class NBAStatsClient:
 
         season_str = await self._season_str(season)
         self._logger.info("Fetching season %s games from LeagueGameFinder...", season_str)
-        endpoint = await asyncio.to_thread(
+        frames = await self._fetch(
             leaguegamefinder.LeagueGameFinder,
+            season,
             league_id_nullable="00",
             season_nullable=season_str,
             season_type_nullable=SeasonTypeAllStar.regular,
         )
-        await self._pace()
-        frames = endpoint.get_data_frames()
         if not frames:
             self._season_games_cache[season] = pd.DataFrame()
             return self._season_games_cache[season]
@@ -120,59 +237,61 @@ class NBAStatsClient:
         return df.to_dict(orient="records")
 
     def _load_team_stats_cache(self, season: int) -> list[dict[str, Any]]:
-        if not os.path.exists(TEAM_STATS_CACHE_PATH):
-            self._logger.info("Team stats cache not found")
-            return []
-        try:
-            with open(TEAM_STATS_CACHE_PATH, "r", encoding="utf-8") as file:
-                payload = json.load(file)
-        except Exception:
-            self._logger.exception("Failed reading team stats cache at %s", TEAM_STATS_CACHE_PATH)
+        stored = load_team_stats(season)
+        if stored is None:
+            self._logger.info("Team stats cache not found for season %s", season)
             return []
-
-        if not isinstance(payload, dict):
-            self._logger.info("Team stats cache not found")
-            return []
-
-        cached_stats = [team_stats for team_stats in payload.values() if isinstance(team_stats, dict)]
-        if cached_stats:
-            self._logger.info("Loaded team stats cache with %s teams", len(cached_stats))
-            return cached_stats
-
-        self._logger.info("Team stats cache not found")
-        return []
+        self._logger.info("Loaded season %s team stats cache with %s teams (version %s)", season, len(stored.stats), stored.version)
+        return stored.stats
 
     async def get_team_stats(self, season: int, use_cache: bool = True) -> list[dict]:
+        """Team stats for ``season``; ``use_cache=False`` rebuilds them instead of reusing any copy.
+
+        With the cache, a missing in-progress season is fetched and stored rather than
+        waiting for the next training run to write it.
+        """
+        if not use_cache:
+            return await self._fetch_team_stats(season)
         if season in self._season_stats_cache:
             return self._season_stats_cache[season]
 
-        if use_cache:
-            cached_stats = self._load_team_stats_cache(season)
-            if cached_stats:
-                self._season_stats_cache[season] = cached_stats
-                return cached_stats
+        cached_stats = self._load_team_stats_cache(season)
+        if cached_stats:
+            self._season_stats_cache[season] = cached_stats
+            return cached_stats
+        if season_is_complete(season):
+            return []
+        try:
+            stats = await self._fetch_team_stats(season)
+        except Exception:
+            self._logger.exception("Failed fetching team stats for in-progress season %s", season)
             return []
+        write_team_stats(season, stats)
+        return stats
 
+    async def _fetch_team_stats(self, season: int) -> list[dict]:
         await self._load_teams()
         season_str = await self._season_str(season)
 
-        standings_ep = await asyncio.to_thread(
-            leaguestandings.LeagueStandings,
-            season=season_str,
-            season_type=SeasonTypeAllStar.regular,
-        )
-        await self._pace()
-        standings_df = standings_ep.get_data_frames()[0]
-
-        if season not in self._current_metrics_cache:
-            self._logger.info("Fetching TeamEstimatedMetrics for season %s...", season_str)
-            metrics_ep = await asyncio.to_thread(
-                teamestimatedmetrics.TeamEstimatedMetrics,
+        standings_df = (
+            await self._fetch(
+                leaguestandings.LeagueStandings,
+                season,
                 season=season_str,
                 season_type=SeasonTypeAllStar.regular,
             )
-            await self._pace()
-            metrics_df = metrics_ep.get_data_frames()[0]
+        )[0]
+
+        if season not in self._current_metrics_cache:
+            self._logger.info("Fetching TeamEstimatedMetrics for season %s...", season_str)
+            metrics_df = (
+                await self._fetch(
+                    teamestimatedmetrics.TeamEstimatedMetrics,
+                    season,
+                    season=season_str,
+                    season_type=SeasonTypeAllStar.regular,
+                )
+            )[0]
             self._current_metrics_cache[season] = {
                 int(row["TEAM_ID"]): row
                 for _, row in metrics_df.iterrows()
@@ -213,13 +332,15 @@ class NBAStatsClient:
         self._season_stats_cache[season] = stats
         return stats
 
-    async def get_recent_games(self, team_id: int, n_games: int = 10) -> list[dict]:
+    async def get_recent_games(self, team_id: int, n_games: int = 10, before: date | None = None) -> list[dict]:
+        """Last ``n_games`` of the season ``before`` falls in, played before that date (default today)."""
         await self._load_teams()
-        season = max(self._season_stats_cache.keys(), default=datetime.now(UTC).year)
-        df = await self._get_team_games_df(team_id, season=season)
+        before = before or datetime.now(UTC).date()
+        df = await self._get_team_games_df(team_id, season=season_for_date(before))
         if df.empty:
             return []
 
+        df = df[df["GAME_DATE"] < datetime.combine(before, datetime.min.time(), tzinfo=UTC)]
         df = df.sort_values("GAME_DATE", ascending=False).head(n_games)
         recent: list[dict[str, Any]] = []
         for _, row in df.iterrows():
@@ -247,8 +368,7 @@ class NBAStatsClient:
         return recent
 
     async def get_schedule_context(self, team_id: int, game_date: date) -> dict:
-        season = game_date.year if game_date.month >= 7 else game_date.year - 1
-        df = await self._get_team_games_df(team_id, season=season)
+        df = await self._get_team_games_df(team_id, season=season_for_date(game_date))
         if df.empty:
             return {
                 "rest_days": 3,
@@ -281,3 +401,12 @@ class NBAStatsClient:
             "is_home": is_home,
             "travel_distance_est": 0 if is_home else 250,
         }
+
+
+@cache
+def get_nba_client() -> NBAStatsClient:
+    """The process-wide client, so warmed season data is shared by every caller."""
+    return NBAStatsClient(
+        max_seasons=settings.nba_cache_max_seasons,
+        response_cache=NBAResponseCache(current_season_ttl_s=settings.nba_current_season_ttl_seconds),
+    )
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+TEAM_STATS_CACHE_DIR = os.environ.get("TEAM_STATS_CACHE_DIR", "/app/models/team_stats")
+# Single unstamped file that training wrote before stats were stored per season.
+LEGACY_TEAM_STATS_PATH = os.environ.get("TEAM_STATS_CACHE_PATH", "/app/models/team_stats_cache.json")
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SeasonTeamStats:
+    season: int
+    version: str
+    written_at: str
+    stats: list[dict[str, Any]]
+
+
+def season_path(season: int, root: str | None = None) -> str:
+    return os.path.join(root or TEAM_STATS_CACHE_DIR, f"season_{season}.json")
+
+
+def stats_version(stats_by_team: dict[str, dict[str, Any]]) -> str:
+    """Content hash of a season's stats; unchanged stats keep their version across rewrites."""
+    payload = json.dumps(stats_by_team, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def write_team_stats(season: int, stats: list[dict[str, Any]], root: str | None = None) -> str | None:
+    """Atomically replace one season's stats file and return its version stamp."""
+    stats_by_team: dict[str, dict[str, Any]] = {}
+    for team_stats in stats:
+        team_name = str(team_stats.get("team_name", "")).strip()
+        if team_name:
+            stats_by_team[team_name] = team_stats
+    if not stats_by_team:
+        return None
+
+    path = season_path(season, root)
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    version = stats_version(stats_by_team)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            json.dump(
+                {"season": season, "version": version, "written_at": datetime.now(UTC).isoformat(), "teams": stats_by_team},
+                file,
+                separators=(",", ":"),
+            )
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    logger.info("Saved season %s team stats (%s teams, version %s)", season, len(stats_by_team), version)
+    return version
+
+
+def load_team_stats(season: int, root: str | None = None) -> SeasonTeamStats | None:
+    path = season_path(season, root)
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            payload = json.load(file)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        logger.exception("Failed reading team stats for season %s at %s", season, path)
+        return None
+
+    if not isinstance(payload, dict) or payload.get("season") != season or not isinstance(payload.get("teams"), dict):
+        logger.warning("Ignoring malformed team stats file %s", path)
+        return None
+    stats = [team_stats for team_stats in payload["teams"].values() if isinstance(team_stats, dict)]
+    if not stats:
+        return None
+    return SeasonTeamStats(season=season, version=str(payload.get("version", "")), written_at=str(payload.get("written_at", "")), stats=stats)
+
+
+def team_stats_versions(seasons: list[int], root: str | None = None) -> dict[int, str | None]:
+    versions: dict[int, str | None] = {}
+    for season in seasons:
+        stored = load_team_stats(season, root)
+        versions[season] = stored.version if stored is not None else None
+    return versions
+
+
+def migrate_legacy_team_stats(season: int, root: str | None = None, legacy_path: str | None = None) -> str | None:
+    """Store the legacy team_stats_cache.json as ``season``'s stats, once.
+
+    It only fills a missing season file, tiding the model over until the next training run
+    writes real per-season stats. The legacy file is renamed afterwards so it is never read again.
+    """
+    legacy_path = legacy_path or LEGACY_TEAM_STATS_PATH
+    if not os.path.exists(legacy_path):
+        return None
+    version = None
+    if not os.path.exists(season_path(season, root)):
+        try:
+            with open(legacy_path, "r", encoding="utf-8") as file:
+                payload = json.load(file)
+        except Exception:
+            logger.exception("Failed reading legacy team stats at %s", legacy_path)
+            return None
+        stats = [team_stats for team_stats in payload.values() if isinstance(team_stats, dict)] if isinstance(payload, dict) else []
+        version = write_team_stats(season, stats, root)
+        logger.info("Migrated legacy team stats at %s to season %s", legacy_path, season)
+    try:
+        os.replace(legacy_path, f"{legacy_path}.migrated")
+    except OSError:
+        logger.exception("Failed retiring legacy team stats at %s", legacy_path)
+    return version
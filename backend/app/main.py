@@ -1,14 +1,29 @@
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
 
+from app.api.v1.picks import load_changed_picks
 from app.api.v1.router import api_router
+from app.database import engine
+from app.services.event_hub import ODDS_CHANNEL, PICKS_CHANNEL, ChangeListener, hub
+from app.services.parlay_service import shutdown_process_pool
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # The worker commits in another process; its NOTIFYs are the only way changes reach us.
+    listener = None
+    if engine.dialect.name == "postgresql":
+        listener = ChangeListener(engine, hub, {ODDS_CHANNEL: None, PICKS_CHANNEL: load_changed_picks})
+        listener.start()
     yield
+    if listener is not None:
+        await listener.stop()
+    shutdown_process_pool()
 
 
 app = FastAPI(title="SharpPicks", lifespan=lifespan)
+# Event streams are excluded by the middleware itself, so SSE is never buffered.
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 app.include_router(api_router, prefix="/api/v1")
@@ -4,6 +4,7 @@ import logging
 from dataclasses import asdict, dataclass
 from datetime import date
 
+from app.data_providers.nba_response_cache import season_for_date
 from app.data_providers.nba_stats import NBAStatsClient, normalize_team_name, team_last_word
 
 logger = logging.getLogger(__name__)
@@ -46,7 +47,7 @@ def _resolve_team_stats(team_name: str, by_name: dict[str, dict], by_last_word:
 
 
 async def build_game_features(home_team: str, away_team: str, game_date: date, nba_client: NBAStatsClient) -> GameFeatures:
-    season = game_date.year
+    season = season_for_date(game_date)
     season_stats = await nba_client.get_team_stats(season)
     if not season_stats:
         raise ValueError("No team stats available")
@@ -65,8 +66,8 @@ async def build_game_features(home_team: str, away_team: str, game_date: date, n
     if home is None or away is None:
         raise ValueError(f"Missing team stats for {home_team} vs {away_team}")
 
-    home_recent = await nba_client.get_recent_games(home["team_id"], n_games=10)
-    away_recent = await nba_client.get_recent_games(away["team_id"], n_games=10)
+    home_recent = await nba_client.get_recent_games(home["team_id"], n_games=10, before=game_date)
+    away_recent = await nba_client.get_recent_games(away["team_id"], n_games=10, before=game_date)
 
     home_ctx = await nba_client.get_schedule_context(home["team_id"], game_date)
     away_ctx = await nba_client.get_schedule_context(away["team_id"], game_date)
@@ -26,6 +26,7 @@ class NBAPredictor:
         self.n_training_samples = 0
         self.last_trained: datetime | None = None
         self.top_features: list[tuple[str, float]] = []
+        self.artifact_mtime: float | None = None
 
     def train(self, X: np.ndarray, y: np.ndarray) -> dict:
         if len(y) < 20:
@@ -59,6 +60,13 @@ class NBAPredictor:
             "last_trained": self.last_trained.isoformat(),
         }
 
+    @property
+    def version(self) -> str | None:
+        """Identifies the trained artifacts; stored predictions from another version are stale."""
+        if not self.is_trained:
+            return None
+        return self.last_trained.isoformat() if self.last_trained else "untracked"
+
     def predict_home_win_prob(self, features: list[float]) -> float:
         if not self.is_trained or self.model is None or self.scaler is None:
             raise ValueError("Model not trained yet")
@@ -83,6 +91,7 @@ class NBAPredictor:
                 },
                 file,
             )
+        self.artifact_mtime = _artifact_mtime()
 
     def load(self) -> bool:
         try:
@@ -99,10 +108,25 @@ class NBAPredictor:
                     self.last_trained = meta.get("last_trained")
                     self.top_features = meta.get("top_features", [])
             self.is_trained = True
+            self.artifact_mtime = _artifact_mtime()
             return True
         except FileNotFoundError:
             return False
 
+    def reload_if_changed(self) -> bool:
+        """Pick up artifacts another process trained and saved since this one loaded them."""
+        mtime = _artifact_mtime()
+        if mtime is None or mtime == self.artifact_mtime:
+            return False
+        return self.load()
+
+
+def _artifact_mtime() -> float | None:
+    try:
+        return os.path.getmtime(META_PATH)
+    except OSError:
+        return None
+
 
 predictor = NBAPredictor()
 predictor.load()
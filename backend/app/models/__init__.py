@@ -1,9 +1,13 @@
 from app.models.bankroll_entry import BankrollEntry
+from app.models.change_cursor import ChangeCursor
+from app.models.current_odds import CurrentOdds
 from app.models.game import Game
+from app.models.ingestion_status import IngestionStatus
+from app.models.model_prediction import ModelPrediction
 from app.models.odds_snapshot import OddsSnapshot
 from app.models.parlay import Parlay, ParlayLeg
 from app.models.performance_snapshot import PerformanceSnapshot
 from app.models.pick import Pick
 from app.models.sport import Sport
 
-__all__ = ["Sport", "Game", "OddsSnapshot", "Pick", "Parlay", "ParlayLeg", "BankrollEntry", "PerformanceSnapshot"]
+__all__ = ["Sport", "Game", "OddsSnapshot", "CurrentOdds", "Pick", "Parlay", "ParlayLeg", "BankrollEntry", "PerformanceSnapshot", "ChangeCursor", "IngestionStatus", "ModelPrediction"]
@@ -0,0 +1,29 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, ForeignKey, Integer, String, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class CurrentOdds(Base):
+    __tablename__ = "current_odds"
+    __table_args__ = (UniqueConstraint("game_id", "bookmaker", "market", "side", name="uq_current_odds_key"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    game_id: Mapped[int] = mapped_column(ForeignKey("games.id"), index=True)
+    sport_key: Mapped[str] = mapped_column(String(64), index=True)
+    home_team: Mapped[str] = mapped_column(String(128))
+    away_team: Mapped[str] = mapped_column(String(128))
+    commence_time: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
+    bookmaker: Mapped[str] = mapped_column(String(64))
+    market: Mapped[str] = mapped_column(String(32))
+    side: Mapped[str] = mapped_column(String(32))
+    line: Mapped[float | None] = mapped_column(Float)
+    odds: Mapped[int] = mapped_column(Integer)
+    implied_prob: Mapped[float] = mapped_column(Float)
+    no_vig_prob: Mapped[float] = mapped_column(Float)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    change_seq: Mapped[int] = mapped_column(Integer, default=0, server_default="0", index=True)
+    # Set when the quote is pulled; the row stays behind as a tombstone for delta clients.
+    removed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), index=True)
@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class IngestionStatus(Base):
+    __tablename__ = "ingestion_status"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    last_cycle_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    last_cycle_status: Mapped[str] = mapped_column(String(16))
+    games_fetched: Mapped[int] = mapped_column(Integer, default=0)
+    snapshots_inserted: Mapped[int] = mapped_column(Integer, default=0)
+    last_snapshot_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from sqlalchemy import JSON, DateTime, Float, ForeignKey, Index, String, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class ModelPrediction(Base):
+    __tablename__ = "model_predictions"
+    __table_args__ = (
+        UniqueConstraint("game_id", "model_version", "feature_hash", name="uq_model_prediction_key"),
+        Index("ix_model_predictions_game_version", "game_id", "model_version"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    game_id: Mapped[int] = mapped_column(ForeignKey("games.id"))
+    model_version: Mapped[str] = mapped_column(String(64))
+    feature_hash: Mapped[str] = mapped_column(String(64))
+    home_win_prob: Mapped[float] = mapped_column(Float)
+    features: Mapped[dict] = mapped_column(JSON)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
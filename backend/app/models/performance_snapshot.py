@@ -22,6 +22,15 @@ class PerformanceSnapshot(Base):
     avg_ev_pct: Mapped[float] = mapped_column(Float, default=0.0)
     avg_market_clv: Mapped[float] = mapped_column(Float, default=0.0)
     avg_book_clv: Mapped[float] = mapped_column(Float, default=0.0)
+    # additive totals so rollups can be merged across days
+    wagered_units: Mapped[float] = mapped_column(Float, default=0.0)
+    ev_pct_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    ev_pct_count: Mapped[int] = mapped_column(Integer, default=0)
+    odds_american_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    market_clv_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    market_clv_count: Mapped[int] = mapped_column(Integer, default=0)
+    book_clv_sum: Mapped[float] = mapped_column(Float, default=0.0)
+    book_clv_count: Mapped[int] = mapped_column(Integer, default=0)
     by_sport: Mapped[dict] = mapped_column(JSON, default=dict)
     by_market: Mapped[dict] = mapped_column(JSON, default=dict)
     by_tier: Mapped[dict] = mapped_column(JSON, default=dict)
@@ -1,6 +1,6 @@
 from datetime import date, datetime
 
-from sqlalchemy import JSON, Date, DateTime, Float, ForeignKey, Integer, String, UniqueConstraint, func
+from sqlalchemy import JSON, Boolean, Date, DateTime, Float, ForeignKey, Index, Integer, String, UniqueConstraint, false, func, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database import Base
@@ -11,6 +11,8 @@ class Pick(Base):
     __table_args__ = (
         UniqueConstraint("game_id", "market", "side", "pick_date", name="uq_pick_daily_side"),
         UniqueConstraint("game_id", "market", "side", "pick_day", name="uq_pick_game_market_side_day"),
+        Index("ix_picks_created_at_id", "created_at", "id"),
+        Index("ix_picks_not_rolled_up", "pick_day", postgresql_where=text("NOT rolled_up")),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -43,6 +45,7 @@ class Pick(Base):
     result: Mapped[str | None] = mapped_column(String(8), nullable=True)
     settled_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     pnl_units: Mapped[float | None] = mapped_column(Float, nullable=True)
+    rolled_up: Mapped[bool] = mapped_column(Boolean, default=False, server_default=false())
 
     # legacy/compat fields still used elsewhere
     fair_prob: Mapped[float | None] = mapped_column(Float, nullable=True)
@@ -58,3 +61,4 @@ class Pick(Base):
     market_clv: Mapped[float | None] = mapped_column(Float, nullable=True)
     book_clv: Mapped[float | None] = mapped_column(Float, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    change_seq: Mapped[int] = mapped_column(Integer, default=0, server_default="0", index=True)
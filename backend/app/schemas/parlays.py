@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import Annotated
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.schemas.picks import PickResponse
 
@@ -31,8 +32,11 @@ class ParlayResponse(BaseModel):
     legs: list[ParlayLegResponse]
 
 
+MAX_PARLAY_LEGS = 12
+
+
 class ParlayBuildRequest(BaseModel):
-    pick_ids: list[int]
+    pick_ids: list[int] = Field(max_length=MAX_PARLAY_LEGS)
 
 
 class ParlayBuildResponse(BaseModel):
@@ -45,3 +49,11 @@ class ParlayBuildResponse(BaseModel):
     correlation_score: float | None = None
     compatibility_warnings: list[str] = []
     suggested_kelly_fraction: float | None = None
+
+
+class ParlayPriceRequest(BaseModel):
+    leg_sets: list[Annotated[list[int], Field(max_length=MAX_PARLAY_LEGS)]] = Field(max_length=500)
+
+
+class ParlayPriceResponse(BaseModel):
+    results: list[ParlayBuildResponse]
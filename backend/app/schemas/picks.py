@@ -3,7 +3,7 @@ from datetime import date, datetime
 from pydantic import BaseModel
 
 
-class PickResponse(BaseModel):
+class PickSummaryResponse(BaseModel):
     id: int
     game_id: int
     sport_key: str
@@ -37,13 +37,7 @@ class PickResponse(BaseModel):
     settled_at: datetime | None = None
     pnl_units: float | None = None
 
-    fair_prob: float | None = None
-    prob_source: str | None = None
-    implied_prob: float | None = None
-    composite_score: float | None = None
     confidence_tier: str | None = None
-    signals: dict | None = None
-    data_quality: dict | None = None
     suggested_kelly_fraction: float | None = None
     outcome: str | None
     market_clv: float | None
@@ -51,6 +45,15 @@ class PickResponse(BaseModel):
     created_at: datetime
 
 
+class PickResponse(PickSummaryResponse):
+    fair_prob: float | None = None
+    prob_source: str | None = None
+    implied_prob: float | None = None
+    composite_score: float | None = None
+    signals: dict | None = None
+    data_quality: dict | None = None
+
+
 class PicksHistoryParams(BaseModel):
     sport: str | None = None
     market: str | None = None
@@ -58,3 +61,20 @@ class PicksHistoryParams(BaseModel):
     start_date: datetime | None = None
     end_date: datetime | None = None
     limit: int = 50
+
+
+_GAME_FIELDS = ("home_team", "away_team", "commence_time")
+LEAN_PICK_FIELDS = tuple(name for name in PickSummaryResponse.model_fields if name not in _GAME_FIELDS)
+_RESPONSE_FIELDS = {False: tuple(PickResponse.model_fields), True: tuple(PickSummaryResponse.model_fields)}
+
+
+def pick_row(
+    pick,
+    home_team: str | None,
+    away_team: str | None,
+    commence_time: datetime | None,
+    lean: bool = False,
+) -> dict:
+    """Response fields for a trusted ORM pick, in schema order and without validation."""
+    game = {"home_team": home_team or "", "away_team": away_team or "", "commence_time": commence_time or pick.created_at}
+    return {name: game[name] if name in game else getattr(pick, name) for name in _RESPONSE_FIELDS[lean]}
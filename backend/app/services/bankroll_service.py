@@ -1,23 +1,81 @@
 from __future__ import annotations
 
+from collections.abc import Sequence
 from datetime import UTC, datetime, timedelta
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import and_, func, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.bankroll_entry import BankrollEntry
 from app.models.game import Game
 from app.models.pick import Pick
+from app.services.change_feed import next_change_seq
 
 DEFAULT_STARTING_BANKROLL = 1000.0
+SETTLEMENT_ENTRY = "settlement"
 
 
-async def get_current_bankroll(session: AsyncSession) -> dict:
-    settled = (
-        await session.scalars(select(Pick).where(Pick.outcome.in_(["win", "loss", "push"])))
+def _latest_entry_statement():
+    return select(BankrollEntry).order_by(BankrollEntry.id.desc()).limit(1)
+
+
+async def record_settlements(session: AsyncSession, picks: Sequence[Pick], *, backdate: bool = False) -> int:
+    """Append one ledger entry per settled pick, carrying the running totals forward.
+
+    Does not commit, so entries land in the same transaction as the settlement itself.
+    With ``backdate`` each entry is stamped with the pick's settlement time (or pick date)
+    instead of now.
+    """
+    if not picks:
+        return 0
+    latest = await session.scalar(_latest_entry_statement())
+    balance = latest.balance_after if latest else DEFAULT_STARTING_BANKROLL
+    wagered = latest.wagered_after if latest else 0.0
+    bets = latest.bets_after if latest else 0
+
+    entries = []
+    for pick in picks:
+        amount = pick.profit_loss or 0.0
+        balance += amount
+        wagered += pick.suggested_kelly_fraction or 0.0
+        bets += 1
+        entry = {
+            "pick_id": pick.id,
+            "entry_type": SETTLEMENT_ENTRY,
+            "amount": amount,
+            "balance_after": balance,
+            "wagered_after": wagered,
+            "bets_after": bets,
+        }
+        if backdate:
+            entry["created_at"] = pick.settled_at or pick.pick_date
+        entries.append(entry)
+    await session.execute(insert(BankrollEntry), entries)
+    return len(entries)
+
+
+async def backfill_bankroll_ledger(session: AsyncSession) -> int:
+    """Record settled picks that predate the ledger, oldest first."""
+    picks = (
+        await session.scalars(
+            select(Pick)
+            .outerjoin(BankrollEntry, BankrollEntry.pick_id == Pick.id)
+            .where(Pick.outcome.in_(["win", "loss", "push"]), BankrollEntry.id.is_(None))
+            .order_by(func.coalesce(Pick.settled_at, Pick.pick_date), Pick.id)
+        )
     ).all()
-    total_profit = sum(p.profit_loss or 0.0 for p in settled)
-    total_wagered = sum(p.suggested_kelly_fraction or 0.0 for p in settled)
-    current = DEFAULT_STARTING_BANKROLL + total_profit
+    recorded = await record_settlements(session, picks, backdate=True)
+    if recorded:
+        await next_change_seq(session)
+    await session.commit()
+    return recorded
+
+
+async def get_current_bankroll(session: AsyncSession) -> dict:
+    latest = await session.scalar(_latest_entry_statement())
+    current = latest.balance_after if latest else DEFAULT_STARTING_BANKROLL
+    total_wagered = latest.wagered_after if latest else 0.0
+    total_profit = current - DEFAULT_STARTING_BANKROLL
 
     return {
         "starting_balance": DEFAULT_STARTING_BANKROLL,
@@ -25,27 +83,30 @@ async def get_current_bankroll(session: AsyncSession) -> dict:
         "total_wagered": total_wagered,
         "total_profit": total_profit,
         "roi_pct": (total_profit / total_wagered * 100.0) if total_wagered > 0 else 0.0,
-        "num_bets": len(settled),
+        "num_bets": latest.bets_after if latest else 0,
     }
 
 
 async def get_kelly_suggestions(session: AsyncSession) -> list[dict]:
-    bankroll = await get_current_bankroll(session)
     now = datetime.now(UTC)
     start = now.replace(hour=0, minute=0, second=0, microsecond=0)
     end = start + timedelta(days=1)
-    picks = (
-        await session.scalars(
-            select(Pick)
+    balance = func.coalesce(
+        select(BankrollEntry.balance_after).order_by(BankrollEntry.id.desc()).limit(1).scalar_subquery(),
+        DEFAULT_STARTING_BANKROLL,
+    )
+    rows = (
+        await session.execute(
+            select(Pick, Game.away_team, Game.home_team, balance.label("balance"))
+            .outerjoin(Game, Game.id == Pick.game_id)
             .where(and_(Pick.pick_date >= start, Pick.pick_date < end))
             .order_by(Pick.ev_pct.desc())
         )
     ).all()
 
     out = []
-    for pick in picks:
-        game = await session.scalar(select(Game).where(Game.id == pick.game_id))
-        matchup = f"{game.away_team} vs {game.home_team}" if game else "unknown"
+    for pick, away_team, home_team, current_balance in rows:
+        matchup = f"{away_team} vs {home_team}" if home_team is not None else "unknown"
         side = f"{pick.side} {pick.line}" if pick.line is not None else pick.side
         out.append(
             {
@@ -53,27 +114,25 @@ async def get_kelly_suggestions(session: AsyncSession) -> list[dict]:
                 "game": matchup,
                 "side": side,
                 "kelly_fraction": pick.suggested_kelly_fraction,
-                "current_bankroll": bankroll["current_balance"],
-                "suggested_bet": bankroll["current_balance"] * (pick.suggested_kelly_fraction or 0.0),
+                "current_bankroll": current_balance,
+                "suggested_bet": current_balance * (pick.suggested_kelly_fraction or 0.0),
             }
         )
     return out
 
 
 async def get_bankroll_history(session: AsyncSession, days: int = 30) -> list[dict]:
-    start = datetime.now(UTC).date() - timedelta(days=days - 1)
+    start = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=days - 1)
     rows = (
         await session.execute(
-            select(func.date(Pick.created_at), func.sum(func.coalesce(Pick.profit_loss, 0.0)))
-            .where(func.date(Pick.created_at) >= start, Pick.outcome.in_(["win", "loss", "push"]))
-            .group_by(func.date(Pick.created_at))
-            .order_by(func.date(Pick.created_at))
+            select(BankrollEntry.created_at, BankrollEntry.balance_after)
+            .where(BankrollEntry.created_at >= start)
+            .order_by(BankrollEntry.created_at, BankrollEntry.id)
         )
     ).all()
 
-    balance = DEFAULT_STARTING_BANKROLL
-    history = []
-    for d, p in rows:
-        balance += float(p or 0.0)
-        history.append({"date": str(d), "balance": balance})
-    return history
+    # Closing balance per day: the last entry written that day.
+    closing: dict[str, float] = {}
+    for created_at, balance_after in rows:
+        closing[str(created_at.date())] = balance_after
+    return [{"date": d, "balance": balance} for d, balance in closing.items()]
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.change_cursor import ChangeCursor
+
+# One counter per feed: picks, parlays, settlements and the ledger share the first; the
+# odds board has its own so odds polls don't invalidate the other views' ETags.
+PICKS_FEED = 1
+ODDS_FEED = 2
+
+
+async def next_change_seq(session: AsyncSession, feed: int = PICKS_FEED) -> int:
+    """Claim the change_seq for everything this transaction writes to ``feed``.
+
+    The counter row stays locked until commit, so writers commit in sequence order and a
+    reader that has seen seq N has also seen every change at or below N. Call it late in
+    the transaction to keep that lock short.
+    """
+    seq = await session.scalar(
+        update(ChangeCursor)
+        .where(ChangeCursor.id == feed)
+        .values(value=ChangeCursor.value + 1)
+        .returning(ChangeCursor.value)
+    )
+    if seq is None:
+        session.add(ChangeCursor(id=feed, value=1))
+        await session.flush()
+        seq = 1
+    return seq
+
+
+async def current_change_seq(session: AsyncSession, feed: int = PICKS_FEED) -> int:
+    """Cursor to hand back to clients; read it before the rows so none can be skipped."""
+    return await session.scalar(select(ChangeCursor.value).where(ChangeCursor.id == feed)) or 0
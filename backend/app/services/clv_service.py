@@ -5,12 +5,15 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.odds_snapshot import OddsSnapshot
 from app.models.pick import Pick
+from app.services.change_feed import next_change_seq
+from app.services.performance_service import rebuild_performance_snapshots
 from app.utils.odds_math import american_to_implied_prob
 
 SHARP_BOOKS = {"pinnacle", "circa", "bookmaker", "betcris"}
 
 
-async def calculate_clv_for_pick(pick: Pick, session: AsyncSession) -> dict:
+async def _apply_clv(pick: Pick, session: AsyncSession) -> bool:
+    """Set the pick's CLV from its closing snapshots; True when a value changed."""
     snapshots = (
         await session.scalars(
             select(OddsSnapshot).where(
@@ -24,7 +27,7 @@ async def calculate_clv_for_pick(pick: Pick, session: AsyncSession) -> dict:
         )
     ).all()
     if not snapshots:
-        return {"updated": False}
+        return False
 
     weighted_sum = 0.0
     weight_total = 0.0
@@ -37,9 +40,33 @@ async def calculate_clv_for_pick(pick: Pick, session: AsyncSession) -> dict:
     book_snap = next((s for s in snapshots if s.bookmaker == pick.best_book), None)
     pick_prob = american_to_implied_prob(pick.odds_american)
 
-    pick.market_clv = (closing_consensus - pick_prob) if closing_consensus is not None else None
-    pick.book_clv = (book_snap.no_vig_prob - pick_prob) if book_snap else None
+    market_clv = (closing_consensus - pick_prob) if closing_consensus is not None else None
+    book_clv = (book_snap.no_vig_prob - pick_prob) if book_snap else None
+    if (pick.market_clv, pick.book_clv) == (market_clv, book_clv):
+        return False
+    pick.market_clv = market_clv
+    pick.book_clv = book_clv
+    return True
+
+
+async def _commit_clv(session: AsyncSession, picks: list[Pick]) -> None:
+    """Stamp changed picks with one change seq, refresh their rolled-up days and commit once."""
+    if not picks:
+        return
+    change_seq = await next_change_seq(session)
+    for pick in picks:
+        pick.change_seq = change_seq
+    # Settled picks can get CLV after their day was rolled up.
+    rolled_days = sorted({pick.pick_day for pick in picks if pick.rolled_up})
+    if rolled_days:
+        await rebuild_performance_snapshots(session, rolled_days)
     await session.commit()
+
+
+async def calculate_clv_for_pick(pick: Pick, session: AsyncSession) -> dict:
+    if not await _apply_clv(pick, session):
+        return {"updated": False}
+    await _commit_clv(session, [pick])
     return {"updated": True, "market_clv": pick.market_clv, "book_clv": pick.book_clv}
 
 
@@ -53,9 +80,6 @@ async def calculate_all_pending_clv(session: AsyncSession) -> int:
             )
         )
     ).all()
-    updated = 0
-    for pick in picks:
-        result = await calculate_clv_for_pick(pick, session)
-        if result.get("updated"):
-            updated += 1
-    return updated
+    updated = [pick for pick in picks if await _apply_clv(pick, session)]
+    await _commit_clv(session, updated)
+    return len(updated)
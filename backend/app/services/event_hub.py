@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+logger = logging.getLogger(__name__)
+
+ODDS_CHANNEL = "odds_changes"
+PICKS_CHANNEL = "pick_changes"
+# Postgres rejects NOTIFY payloads of 8000 bytes or more.
+NOTIFY_PAYLOAD_LIMIT = 7800
+SUBSCRIBER_QUEUE_SIZE = 256
+KEEPALIVE_SECONDS = 15.0
+RECONNECT_SECONDS = 5.0
+
+
+class EventHub:
+    """In-process fan-out of change batches to SSE subscribers.
+
+    Each subscriber gets a bounded queue; a client that falls behind loses its oldest
+    batches rather than holding memory for everyone else.
+    """
+
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE) -> None:
+        self.queue_size = queue_size
+        self._subscribers: dict[str, set[asyncio.Queue]] = defaultdict(set)
+
+    def subscriber_count(self, channel: str) -> int:
+        return len(self._subscribers[channel])
+
+    def publish(self, channel: str, items: list) -> None:
+        if not items:
+            return
+        for queue in list(self._subscribers[channel]):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(items)
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str) -> AsyncIterator[asyncio.Queue]:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[channel].add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers[channel].discard(queue)
+
+
+hub = EventHub()
+
+
+def _notify_payloads(items: list) -> list[str]:
+    payloads: list[str] = []
+    chunk: list[str] = []
+    size = 2
+    for item in items:
+        encoded = json.dumps(item, default=str, separators=(",", ":"))
+        if chunk and size + len(encoded) + 1 > NOTIFY_PAYLOAD_LIMIT:
+            payloads.append(f"[{','.join(chunk)}]")
+            chunk, size = [], 2
+        chunk.append(encoded)
+        size += len(encoded) + 1
+    if chunk:
+        payloads.append(f"[{','.join(chunk)}]")
+    return payloads
+
+
+async def notify_changes(session: AsyncSession, channel: str, items: list) -> None:
+    """Queue a NOTIFY for ``items`` on the session's transaction.
+
+    Postgres only delivers it on commit, so listeners never see changes that roll back.
+    Other dialects have no NOTIFY and this is a no-op.
+    """
+    dialect = session.bind.dialect.name if session.bind is not None else "postgresql"
+    if not items or dialect != "postgresql":
+        return
+    for payload in _notify_payloads(items):
+        await session.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": channel, "payload": payload})
+
+
+Loader = Callable[[list], Awaitable[list]]
+
+
+class ChangeListener:
+    """Holds one LISTEN connection and republishes notifications on the hub.
+
+    ``loaders`` optionally map a channel's raw payload (e.g. pick ids) to the items that are
+    broadcast, so the lookup runs once per notification rather than once per client.
+    """
+
+    def __init__(self, engine: AsyncEngine, event_hub: EventHub, loaders: dict[str, Loader | None]) -> None:
+        self.engine = engine
+        self.hub = event_hub
+        self.loaders = loaders
+        self._task: asyncio.Task | None = None
+        self._pending: set[asyncio.Task] = set()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, *self._pending, return_exceptions=True)
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                async with self.engine.connect() as conn:
+                    raw = (await conn.get_raw_connection()).driver_connection
+                    lost = asyncio.Event()
+                    raw.add_termination_listener(lambda _conn: lost.set())
+                    for channel in self.loaders:
+                        await raw.add_listener(channel, self._on_notify)
+                    await lost.wait()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Change listener connection failed")
+            await asyncio.sleep(RECONNECT_SECONDS)
+
+    def _on_notify(self, _conn, _pid: int, channel: str, payload: str) -> None:
+        task = asyncio.create_task(self.dispatch(channel, payload))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def dispatch(self, channel: str, payload: str) -> None:
+        if not self.hub.subscriber_count(channel):
+            return
+        try:
+            items = json.loads(payload)
+            loader = self.loaders.get(channel)
+            if loader is not None:
+                items = await loader(items)
+        except Exception:
+            logger.exception("Failed to dispatch %s notification", channel)
+            return
+        self.hub.publish(channel, items)
+
+
+async def sse_events(
+    channel: str,
+    event: str,
+    is_disconnected: Callable[[], Awaitable[bool]],
+    keep: Callable[[dict], bool] | None = None,
+    event_hub: EventHub = hub,
+) -> AsyncIterator[str]:
+    """Server-sent events for one subscriber, with comment keepalives while idle."""
+    async with event_hub.subscribe(channel) as queue:
+        yield ": connected\n\n"
+        while not await is_disconnected():
+            try:
+                items = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_SECONDS)
+            except TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if keep is not None:
+                items = [item for item in items if keep(item)]
+            if items:
+                yield f"event: {event}\ndata: {json.dumps(items, default=str)}\n\n"
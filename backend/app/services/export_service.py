@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from collections.abc import AsyncIterator, Sequence
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.database import AsyncSessionLocal
+from app.models.game import Game
+from app.models.parlay import Parlay, ParlayLeg
+from app.models.pick import Pick
+from app.schemas.picks import LEAN_PICK_FIELDS
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+PICK_EXPORT_FIELDS = [*LEAN_PICK_FIELDS, "home_team", "away_team", "commence_time"]
+PARLAY_EXPORT_FIELDS = [
+    "id",
+    "risk_level",
+    "num_legs",
+    "combined_odds_american",
+    "combined_odds_decimal",
+    "combined_ev_pct",
+    "combined_fair_prob",
+    "correlation_score",
+    "suggested_kelly_fraction",
+    "outcome",
+    "profit_loss",
+    "pick_date",
+    "created_at",
+    "leg_pick_ids",
+]
+
+
+def pick_export_statement() -> Select:
+    return (
+        select(*[getattr(Pick, name) for name in LEAN_PICK_FIELDS], Game.home_team, Game.away_team, Game.commence_time)
+        .outerjoin(Game, Game.id == Pick.game_id)
+        .order_by(Pick.created_at, Pick.id)
+    )
+
+
+async def _stream_batches(
+    stmt: Select, session_factory: async_sessionmaker[AsyncSession]
+) -> AsyncIterator[Sequence]:
+    # The export owns its session: a request-scoped one may close before the body is sent.
+    async with session_factory() as session:
+        result = await session.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for batch in result.partitions():
+            yield batch
+
+
+async def stream_picks(
+    stmt: Select, session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal
+) -> AsyncIterator[list[dict]]:
+    async for batch in _stream_batches(stmt, session_factory):
+        yield [dict(row._mapping) for row in batch]
+
+
+async def stream_parlays(
+    stmt: Select, session_factory: async_sessionmaker[AsyncSession] = AsyncSessionLocal
+) -> AsyncIterator[list[dict]]:
+    """Parlays from ``stmt`` (a select(Parlay) ordering) with their legs' pick ids.
+
+    Legs arrive as consecutive joined rows, so a parlay is emitted once the next one starts.
+    """
+    joined = (
+        stmt.add_columns(ParlayLeg.pick_id)
+        .join(ParlayLeg, ParlayLeg.parlay_id == Parlay.id)
+        .order_by(ParlayLeg.leg_order)
+    )
+    current: dict | None = None
+    async for batch in _stream_batches(joined, session_factory):
+        done: list[dict] = []
+        for parlay, pick_id in batch:
+            if current is None or current["id"] != parlay.id:
+                if current is not None:
+                    done.append(current)
+                current = {name: getattr(parlay, name) for name in PARLAY_EXPORT_FIELDS[:-1]}
+                current["leg_pick_ids"] = []
+            current["leg_pick_ids"].append(pick_id)
+        if done:
+            yield done
+    if current is not None:
+        yield [current]
+
+
+async def encode_rows(rows: AsyncIterator[list[dict]], fmt: str, fieldnames: list[str]) -> AsyncIterator[str]:
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction="ignore")
+        writer.writeheader()
+        async for batch in rows:
+            for row in batch:
+                writer.writerow(
+                    {k: ";".join(map(str, v)) if isinstance(v, list) else v for k, v in row.items()}
+                )
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+        return
+
+    async for batch in rows:
+        yield "".join(json.dumps(row, default=str) + "\n" for row in batch)
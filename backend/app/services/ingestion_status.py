@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.ingestion_status import IngestionStatus
+
+_STATUS_ID = 1
+
+
+async def record_ingestion_cycle(
+    session: AsyncSession, status: str, games_fetched: int = 0, snapshots_inserted: int = 0
+) -> None:
+    """Overwrite the single status row with the outcome of one odds polling cycle."""
+    now = datetime.now(UTC)
+    dialect = session.bind.dialect.name if session.bind is not None else "postgresql"
+    insert = sqlite_insert if dialect == "sqlite" else pg_insert
+    values = {
+        "last_cycle_at": now,
+        "last_cycle_status": status,
+        "games_fetched": games_fetched,
+        "snapshots_inserted": snapshots_inserted,
+    }
+    if snapshots_inserted:
+        values["last_snapshot_at"] = now
+    stmt = insert(IngestionStatus).values(id=_STATUS_ID, **values)
+    await session.execute(stmt.on_conflict_do_update(index_elements=["id"], set_=values))
+    await session.commit()
+
+
+async def get_ingestion_status(session: AsyncSession) -> IngestionStatus | None:
+    return await session.get(IngestionStatus, _STATUS_ID)
+
+
+async def approximate_row_count(session: AsyncSession, table: str) -> int | None:
+    """Planner estimate from pg_class, kept fresh by autovacuum; None where unavailable."""
+    dialect = session.bind.dialect.name if session.bind is not None else "postgresql"
+    if dialect != "postgresql":
+        return None
+    estimate = await session.scalar(
+        text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)"), {"table": table}
+    )
+    # reltuples is -1 until the table is first vacuumed or analyzed.
+    return int(estimate) if estimate is not None and estimate >= 0 else None
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Collection, Sequence
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import case, delete, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.current_odds import CurrentOdds
+from app.services.change_feed import ODDS_FEED, next_change_seq
+
+UPSERT_CHUNK_SIZE = 1000
+_KEY_COLUMNS = ("game_id", "bookmaker", "market", "side")
+# Removed quotes stay as tombstones this long so ?since= clients learn about them; a client
+# whose cursor is older than this has to refetch the full board.
+TOMBSTONE_RETENTION = timedelta(days=1)
+
+
+async def upsert_current_odds(session: AsyncSession, rows: Sequence[dict], change_seq: int = 0) -> int:
+    """Insert or overwrite one current_odds row per (game, bookmaker, market, side).
+
+    New rows, revived tombstones and rows whose price or line moved take ``change_seq``;
+    the rest keep their old one.
+    """
+    if not rows:
+        return 0
+    dialect = session.bind.dialect.name if session.bind is not None else "postgresql"
+    insert = sqlite_insert if dialect == "sqlite" else pg_insert
+    # A key may only appear once per statement for ON CONFLICT DO UPDATE.
+    unique = list(
+        {
+            tuple(row[k] for k in _KEY_COLUMNS): {**row, "change_seq": change_seq, "removed_at": None}
+            for row in rows
+        }.values()
+    )
+    for start in range(0, len(unique), UPSERT_CHUNK_SIZE):
+        stmt = insert(CurrentOdds).values(unique[start : start + UPSERT_CHUNK_SIZE])
+        updated = {name: stmt.excluded[name] for name in unique[0] if name not in _KEY_COLUMNS}
+        moved = or_(
+            CurrentOdds.odds != stmt.excluded.odds,
+            CurrentOdds.line.is_distinct_from(stmt.excluded.line),
+            CurrentOdds.removed_at.is_not(None),
+        )
+        updated["change_seq"] = case((moved, stmt.excluded.change_seq), else_=CurrentOdds.change_seq)
+        await session.execute(stmt.on_conflict_do_update(index_elements=list(_KEY_COLUMNS), set_=updated))
+    return len(unique)
+
+
+async def diff_current_odds(
+    session: AsyncSession, rows: Sequence[dict], bookmakers: Collection[str] | None = None
+) -> tuple[list[int], bool]:
+    """Compare a fetch with the board for each (game, market) it carries.
+
+    Returns the ids of live quotes the fetch no longer carries, and whether it lists any
+    quote the board doesn't show. ``bookmakers`` limits the first to the books the fetch
+    asked for, so a filtered poll leaves other books' quotes alone; None means every book
+    was requested.
+    """
+    if not rows:
+        return [], False
+    fetched = {tuple(row[k] for k in _KEY_COLUMNS) for row in rows}
+    game_markets = list({(row["game_id"], row["market"]) for row in rows})
+    stmt = select(CurrentOdds.id, *(getattr(CurrentOdds, k) for k in _KEY_COLUMNS)).where(
+        tuple_(CurrentOdds.game_id, CurrentOdds.market).in_(game_markets), CurrentOdds.removed_at.is_(None)
+    )
+    live = {tuple(key): row_id for row_id, *key in (await session.execute(stmt)).all()}
+    stale = [
+        row_id
+        for key, row_id in live.items()
+        if key not in fetched and (bookmakers is None or key[1] in bookmakers)
+    ]
+    return stale, not fetched <= live.keys()
+
+
+async def remove_quotes(session: AsyncSession, ids: Sequence[int], change_seq: int) -> None:
+    """Turn quotes into tombstones stamped with ``change_seq`` so delta clients see them go."""
+    if ids:
+        await session.execute(
+            update(CurrentOdds)
+            .where(CurrentOdds.id.in_(list(ids)))
+            .values(removed_at=datetime.now(UTC), change_seq=change_seq)
+        )
+
+
+async def prune_current_odds(session: AsyncSession, commenced_before: datetime, change_seq: int = 0) -> None:
+    """Remove quotes for games that started before ``commenced_before`` and drop old tombstones.
+
+    Takes an odds seq of its own when there is something to remove and ``change_seq`` is 0.
+    """
+    expired = list(
+        await session.scalars(
+            select(CurrentOdds.id).where(CurrentOdds.commence_time < commenced_before, CurrentOdds.removed_at.is_(None))
+        )
+    )
+    if expired:
+        await remove_quotes(session, expired, change_seq or await next_change_seq(session, ODDS_FEED))
+    await session.execute(delete(CurrentOdds).where(CurrentOdds.removed_at < datetime.now(UTC) - TOMBSTONE_RETENTION))
+
+
+async def get_odds_board(session: AsyncSession, sport_key: str | None = None, since: int | None = None) -> list[dict]:
+    """The board, or with ``since`` only the sides where some book's quote changed after it.
+
+    A changed side is returned with all of its books so its best price stays correct, and
+    with the books that stopped quoting it under ``removed``.
+    """
+    stmt = select(CurrentOdds).order_by(CurrentOdds.commence_time, CurrentOdds.game_id)
+    if sport_key:
+        stmt = stmt.where(CurrentOdds.sport_key == sport_key)
+    if since is None:
+        stmt = stmt.where(CurrentOdds.removed_at.is_(None))
+    else:
+        sides = (CurrentOdds.game_id, CurrentOdds.market, CurrentOdds.side)
+        changed = select(*sides).where(CurrentOdds.change_seq > since)
+        stmt = stmt.where(tuple_(*sides).in_(changed))
+    return build_board((await session.scalars(stmt)).all())
+
+
+def build_board(rows: Sequence[CurrentOdds]) -> list[dict]:
+    """Group current prices by game, market and side, keeping the best price per side.
+
+    Books can hang different lines on a spread or total, so the best price is taken among
+    the books on the side's most widely offered line.
+    """
+    games: dict[int, dict] = {}
+    for row in rows:
+        game = games.get(row.game_id)
+        if game is None:
+            game = games[row.game_id] = {
+                "game_id": row.game_id,
+                "sport_key": row.sport_key,
+                "home_team": row.home_team,
+                "away_team": row.away_team,
+                "commence_time": row.commence_time.isoformat() if row.commence_time else None,
+                "markets": {},
+            }
+        side = game["markets"].setdefault(row.market, {}).setdefault(
+            row.side, {"best_odds": None, "best_line": None, "best_book": None, "books": [], "removed": []}
+        )
+        if row.removed_at is not None:
+            side["removed"].append(row.bookmaker)
+            continue
+        side["books"].append(
+            {
+                "bookmaker": row.bookmaker,
+                "odds": row.odds,
+                "line": row.line,
+                "no_vig_prob": row.no_vig_prob,
+                "updated_at": row.updated_at.isoformat() if row.updated_at else None,
+            }
+        )
+    for game in games.values():
+        for sides in game["markets"].values():
+            for side in sides.values():
+                if not side["books"]:
+                    continue
+                counts = Counter(book["line"] for book in side["books"])
+                main_line = max(counts, key=counts.__getitem__)
+                best = max((book for book in side["books"] if book["line"] == main_line), key=lambda book: book["odds"])
+                side.update(best_odds=best["odds"], best_line=best["line"], best_book=best["bookmaker"])
+    return list(games.values())
@@ -1,18 +1,25 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import multiprocessing
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from datetime import UTC, datetime
+from datetime import UTC, date, datetime
 from itertools import combinations
 
-from sqlalchemy import and_, delete, select
+from sqlalchemy import and_, delete, insert, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.analytics.compatibility import check_compatibility
-from app.analytics.correlation import adjusted_joint_probability, estimate_correlation
+from app.analytics.parlay_index import ParlayLegIndex
+from app.analytics.parlay_search import search_top_parlays
+from app.config import settings
+from app.models.game import Game
 from app.models.parlay import Parlay, ParlayLeg
 from app.models.pick import Pick
+from app.services.change_feed import next_change_seq
 from app.utils.odds_math import (
-    american_to_decimal,
     calculate_ev,
     calculate_parlay_odds,
     decimal_to_american,
@@ -20,9 +27,38 @@ from app.utils.odds_math import (
 )
 
 
+@dataclass(frozen=True)
+class PickRecord:
+    """The pick fields parlay construction reads, detached from the ORM session."""
+
+    id: int
+    game_id: int
+    sport_key: str
+    market: str
+    side: str
+    odds_american: int
+    fair_prob: float | None
+    ev_pct: float | None
+    confidence_tier: str | None
+
+    @classmethod
+    def from_pick(cls, pick: Pick) -> PickRecord:
+        return cls(
+            id=pick.id,
+            game_id=pick.game_id,
+            sport_key=pick.sport_key,
+            market=pick.market,
+            side=pick.side,
+            odds_american=pick.odds_american,
+            fair_prob=pick.fair_prob,
+            ev_pct=pick.ev_pct,
+            confidence_tier=pick.confidence_tier,
+        )
+
+
 @dataclass
 class ParlayCandidate:
-    legs: list[Pick]
+    legs: list[Pick | PickRecord]
     num_legs: int
     combined_fair_prob: float
     combined_odds_decimal: float
@@ -60,29 +96,28 @@ RISK_CONFIGS = {
     },
 }
 
+SEARCH_SHORTLIST_FACTOR = 10
 
-def _avg_pairwise_corr(legs: list[Pick]) -> float:
-    pairs = [estimate_correlation(a, b) for a, b in combinations(legs, 2)]
-    return sum(pairs) / len(pairs) if pairs else 0.0
-
+_process_pool: ProcessPoolExecutor | None = None
 
-def _joint_prob(legs: list[Pick]) -> float:
-    if not legs:
-        return 0.0
-    prob = legs[0].fair_prob
-    for leg in legs[1:]:
-        corr = estimate_correlation(legs[0], leg)
-        prob = adjusted_joint_probability(prob, leg.fair_prob, corr)
-    return max(0.0, min(1.0, prob))
+# Pool fingerprint per (pick_date, risk_level) from the last refresh in this process.
+_POOL_FINGERPRINTS: dict[tuple[date, str], str] = {}
 
 
-def _candidate_from_legs(legs: list[Pick], risk_level: str) -> ParlayCandidate:
-    combined_decimal = calculate_parlay_odds([american_to_decimal(p.odds_american) for p in legs])
+def _candidate_from_legs(
+    index: ParlayLegIndex,
+    positions: list[int],
+    risk_level: str,
+    fair_prob: float | None = None,
+) -> ParlayCandidate:
+    legs = [index.legs[i] for i in positions]
+    combined_decimal = calculate_parlay_odds([index.decimals[i] for i in positions])
     combined_american = decimal_to_american(combined_decimal)
-    fair_prob = _joint_prob(legs)
+    if fair_prob is None:
+        fair_prob = index.joint_probability(positions)
     combined_ev = calculate_ev(fair_prob, combined_decimal)
-    corr = _avg_pairwise_corr(legs)
-    kelly = kelly_criterion(fair_prob, combined_decimal, fraction=0.15)
+    corr = index.avg_pairwise_correlation(positions)
+    kelly = kelly_criterion(fair_prob, combined_decimal, fraction=0.15) if 0.0 < fair_prob < 1.0 else 0.0
     return ParlayCandidate(
         legs=legs,
         num_legs=len(legs),
@@ -107,117 +142,281 @@ def _is_valid_candidate(candidate: ParlayCandidate, risk_level: str) -> bool:
     return True
 
 
-async def build_parlays_for_risk_level(
-    picks: list[Pick],
+def _pool_for_risk_level(picks: list[Pick], risk_level: str) -> list[Pick]:
+    cfg = RISK_CONFIGS[risk_level]
+    pool = [p for p in picks if p.confidence_tier in cfg["allowed_confidence"]]
+    return sorted(pool, key=lambda x: x.ev_pct, reverse=True)
+
+
+def _pool_fingerprint(pool: list[Pick]) -> str:
+    payload = repr(sorted((p.id, p.odds_american, p.fair_prob, p.ev_pct) for p in pool))
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def _best_candidates(
+    index: ParlayLegIndex,
     risk_level: str,
-    session: AsyncSession,
-    max_parlays: int = 3,
+    max_parlays: int,
+    taken_odds: set[int] | None = None,
 ) -> list[ParlayCandidate]:
-    _ = session
     cfg = RISK_CONFIGS[risk_level]
-    pool = [p for p in picks if p.confidence_tier in cfg["allowed_confidence"]]
-    if len(pool) < cfg["min_legs"]:
-        return []
+    matches = search_top_parlays(
+        index,
+        min_legs=cfg["min_legs"],
+        max_legs=cfg["max_legs"],
+        min_odds_american=cfg["min_combined_odds_american"],
+        max_odds_american=cfg["max_combined_odds_american"],
+        max_correlation=cfg["max_correlation"],
+        top_k=max_parlays * SEARCH_SHORTLIST_FACTOR,
+    )
+    leg_sets = [list(m.legs) for m in matches]
+
+    # The search ranks with the pairwise chained approximation; the shortlist is then
+    # re-priced with the correlated Monte Carlo joint probability of each leg set.
+    joint_probs = index.joint_probabilities(leg_sets)
+    candidates = [
+        _candidate_from_legs(index, positions, risk_level, fair_prob=prob) for positions, prob in zip(leg_sets, joint_probs)
+    ]
+    valid = (c for c in candidates if _is_valid_candidate(c, risk_level))
+
+    # parlays are unique per (risk_level, pick_date, combined_odds_american)
+    taken = set(taken_odds or ())
+    best: list[ParlayCandidate] = []
+    for cand in sorted(valid, key=lambda c: c.combined_ev_pct, reverse=True):
+        if cand.combined_odds_american in taken:
+            continue
+        taken.add(cand.combined_odds_american)
+        best.append(cand)
+        if len(best) == max_parlays:
+            break
+    return best
 
-    pool = sorted(pool, key=lambda x: x.ev_pct, reverse=True)
-    candidates: list[ParlayCandidate] = []
 
-    for size in range(cfg["min_legs"], cfg["max_legs"] + 1):
-        if len(pool) < size:
+def _search_risk_level(
+    records: list[PickRecord],
+    risk_level: str,
+    max_parlays: int,
+    kept_pick_sets: list[list[int]],
+    taken_odds: set[int],
+) -> tuple[list[ParlayCandidate | None], list[ParlayCandidate]]:
+    """Re-price the kept parlays, then search for new ones to fill the remaining slots.
+
+    A kept parlay comes back as ``None``, for the caller to delete, when its new pricing
+    fails the risk level's checks or its new odds collide with a parlay already placed;
+    its slot is refilled by the search.
+    """
+    if len(records) < RISK_CONFIGS[risk_level]["min_legs"]:
+        return [None] * len(kept_pick_sets), []
+    index = ParlayLegIndex(records, risk_level)
+    position_by_id = {record.id: pos for pos, record in enumerate(records)}
+    taken = set(taken_odds)
+    kept: list[ParlayCandidate | None] = []
+    for pick_ids in kept_pick_sets:
+        cand = _candidate_from_legs(index, [position_by_id[i] for i in pick_ids], risk_level)
+        if not _is_valid_candidate(cand, risk_level) or cand.combined_odds_american in taken:
+            kept.append(None)
             continue
+        kept.append(cand)
+        taken.add(cand.combined_odds_american)
+    slots = max_parlays - sum(cand is not None for cand in kept)
+    return kept, _best_candidates(index, risk_level, slots, taken) if slots > 0 else []
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        # The search is split per risk level, so workers beyond that would sit idle.
+        levels = len(RISK_CONFIGS)
+        _process_pool = ProcessPoolExecutor(
+            max_workers=min(settings.parlay_search_workers or levels, levels),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _process_pool
 
-        # Greedy seed
-        selected = [pool[0]]
-        for cand in pool[1:]:
-            if len(selected) >= size:
-                break
-            compat_ok = all(check_compatibility(leg, cand, risk_level).is_compatible for leg in selected)
-            if compat_ok:
-                selected.append(cand)
-        if len(selected) == size:
-            c = _candidate_from_legs(selected, risk_level)
-            if _is_valid_candidate(c, risk_level):
-                candidates.append(c)
-
-        # brute force for small combos
-        if size <= 3:
-            for combo in combinations(pool, size):
-                if all(check_compatibility(a, b, risk_level).is_compatible for a, b in combinations(combo, 2)):
-                    c = _candidate_from_legs(list(combo), risk_level)
-                    if _is_valid_candidate(c, risk_level):
-                        candidates.append(c)
-
-    # de-dup by sorted pick ids
-    unique: dict[tuple[int, ...], ParlayCandidate] = {}
-    for c in candidates:
-        key = tuple(sorted(p.id for p in c.legs))
-        if key not in unique or c.combined_ev_pct > unique[key].combined_ev_pct:
-            unique[key] = c
-
-    ranked = sorted(unique.values(), key=lambda c: c.combined_ev_pct, reverse=True)
-    return ranked[:max_parlays]
 
+def shutdown_process_pool() -> None:
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(cancel_futures=True)
+        _process_pool = None
 
-async def generate_daily_parlays(session: AsyncSession) -> list[Parlay]:
+
+def _parlay_values(cand: ParlayCandidate) -> dict:
+    return {
+        "num_legs": cand.num_legs,
+        "combined_odds_american": cand.combined_odds_american,
+        "combined_odds_decimal": cand.combined_odds_decimal,
+        "combined_ev_pct": cand.combined_ev_pct,
+        "combined_fair_prob": cand.combined_fair_prob,
+        "correlation_score": cand.correlation_score,
+        "suggested_kelly_fraction": cand.suggested_kelly_fraction,
+    }
+
+
+async def refresh_parlays(session: AsyncSession, *, force: bool = False, max_parlays: int = 3) -> dict[str, int]:
+    """Bring today's parlays in line with today's picks.
+
+    The pool is today's unsettled picks whose games have not started. Only risk levels
+    whose pool changed since the last refresh in this process are recomputed (all of them
+    when ``force`` is set). Pending parlays with a started or settled leg are left alone;
+    pending parlays whose legs are all still in the pool are re-priced and kept while they
+    still pass the risk level's checks; the rest are deleted. New parlays are bulk inserted only into the slots the day's remaining
+    rows leave under ``max_parlays`` per risk level.
+    """
     now = datetime.now(UTC)
     day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
     pick_date = day_start.date()
+    summary = {"levels_refreshed": 0, "kept": 0, "inserted": 0, "deleted": 0}
 
     day_end = day_start.replace(hour=23, minute=59, second=59, microsecond=999999)
     today_picks = (
         await session.scalars(
-            select(Pick).where(and_(Pick.pick_date >= day_start, Pick.pick_date <= day_end)).order_by(Pick.ev_pct.desc())
+            select(Pick)
+            .join(Game, Game.id == Pick.game_id)
+            .where(
+                Pick.pick_date >= day_start,
+                Pick.pick_date <= day_end,
+                or_(Pick.outcome.is_(None), Pick.outcome == "pending"),
+                Game.commence_time > now,
+            )
+            .order_by(Pick.ev_pct.desc())
         )
     ).all()
 
-    if len(today_picks) < 2:
-        return []
-
-    await session.execute(delete(Parlay).where(Parlay.pick_date == pick_date))
-
-    generated_rows: list[Parlay] = []
-    for risk_level in ("conservative", "moderate", "aggressive"):
-        candidates = await build_parlays_for_risk_level(today_picks, risk_level, session, max_parlays=3)
-        for cand in candidates:
-            row = Parlay(
-                risk_level=risk_level,
-                num_legs=cand.num_legs,
-                combined_odds_american=cand.combined_odds_american,
-                combined_odds_decimal=cand.combined_odds_decimal,
-                combined_ev_pct=cand.combined_ev_pct,
-                combined_fair_prob=cand.combined_fair_prob,
-                correlation_score=cand.correlation_score,
-                suggested_kelly_fraction=cand.suggested_kelly_fraction,
-                pick_date=pick_date,
-                outcome="pending",
+    existing = (await session.scalars(select(Parlay).where(Parlay.pick_date == pick_date))).all()
+    legs_by_parlay: dict[int, list[int]] = defaultdict(list)
+    locked_ids: set[int] = set()
+    if existing:
+        leg_rows = await session.execute(
+            select(
+                ParlayLeg.parlay_id,
+                ParlayLeg.pick_id,
+                or_(Game.commence_time <= now, and_(Pick.outcome.is_not(None), Pick.outcome != "pending")),
+            )
+            .join(Pick, Pick.id == ParlayLeg.pick_id)
+            .join(Game, Game.id == Pick.game_id)
+            .where(ParlayLeg.parlay_id.in_([p.id for p in existing]))
+            .order_by(ParlayLeg.parlay_id, ParlayLeg.leg_order)
+        )
+        for parlay_id, pick_id, leg_closed in leg_rows:
+            legs_by_parlay[parlay_id].append(pick_id)
+            if leg_closed:
+                locked_ids.add(parlay_id)
+
+    fingerprints: dict[tuple[date, str], str] = {}
+    stale_ids: list[int] = []
+    jobs: list[tuple[str, dict[frozenset[int], Parlay]]] = []
+    searches = []
+    loop = asyncio.get_running_loop()
+    for risk_level in RISK_CONFIGS:
+        pool = _pool_for_risk_level(today_picks, risk_level)
+        key = (pick_date, risk_level)
+        fingerprints[key] = _pool_fingerprint(pool)
+        if not force and _POOL_FINGERPRINTS.get(key) == fingerprints[key]:
+            continue
+        summary["levels_refreshed"] += 1
+
+        level_rows = [p for p in existing if p.risk_level == risk_level]
+        frozen = {p.id: p for p in level_rows if p.outcome != "pending" or p.id in locked_ids}
+        pool_ids = {pick.id for pick in pool}
+        open_by_legs: dict[frozenset[int], Parlay] = {}
+        for row in level_rows:
+            if row.id in frozen:
+                continue
+            pick_ids = legs_by_parlay[row.id]
+            leg_key = frozenset(pick_ids)
+            if pick_ids and leg_key not in open_by_legs and leg_key <= pool_ids:
+                open_by_legs[leg_key] = row
+            else:
+                stale_ids.append(row.id)
+        if len(pool) < RISK_CONFIGS[risk_level]["min_legs"]:
+            # Too few picks left to price or build anything; drop the level's open parlays.
+            stale_ids.extend(row.id for row in open_by_legs.values())
+            continue
+
+        jobs.append((risk_level, open_by_legs))
+        searches.append(
+            loop.run_in_executor(
+                _get_process_pool(),
+                _search_risk_level,
+                [PickRecord.from_pick(pick) for pick in pool],
+                risk_level,
+                max(0, max_parlays - len(frozen)),
+                [legs_by_parlay[row.id] for row in open_by_legs.values()],
+                {p.combined_odds_american for p in frozen.values()},
             )
-            session.add(row)
-            await session.flush()
-            for idx, pick in enumerate(cand.legs, start=1):
-                session.add(ParlayLeg(parlay_id=row.id, pick_id=pick.id, leg_order=idx, result="pending"))
-            generated_rows.append(row)
+        )
 
+    # Each risk level is searched in its own process so the event loop stays free.
+    results = await asyncio.gather(*searches)
+
+    updates: list[dict] = []
+    inserts: list[tuple[str, ParlayCandidate]] = []
+    for (risk_level, open_by_legs), (kept, new) in zip(jobs, results):
+        for row, cand in zip(open_by_legs.values(), kept):
+            if cand is None:
+                stale_ids.append(row.id)
+            else:
+                updates.append({"id": row.id, **_parlay_values(cand)})
+        inserts.extend((risk_level, cand) for cand in new)
+
+    if stale_ids:
+        await session.execute(delete(ParlayLeg).where(ParlayLeg.parlay_id.in_(stale_ids)))
+        await session.execute(delete(Parlay).where(Parlay.id.in_(stale_ids)))
+    if updates:
+        # Kept rows can trade odds with each other, so park them on placeholder odds first;
+        # parlay odds are never negative, so -id cannot clash with a real row.
+        await session.execute(
+            update(Parlay).where(Parlay.id.in_([u["id"] for u in updates])).values(combined_odds_american=-Parlay.id)
+        )
+        await session.execute(update(Parlay), updates)
+    if inserts:
+        parlay_ids = (
+            await session.scalars(
+                insert(Parlay).returning(Parlay.id, sort_by_parameter_order=True),
+                [
+                    {"risk_level": risk_level, "pick_date": pick_date, "outcome": "pending", **_parlay_values(cand)}
+                    for risk_level, cand in inserts
+                ],
+            )
+        ).all()
+        await session.execute(
+            insert(ParlayLeg),
+            [
+                {"parlay_id": parlay_id, "pick_id": pick.id, "leg_order": idx, "result": "pending"}
+                for parlay_id, (_, cand) in zip(parlay_ids, inserts)
+                for idx, pick in enumerate(cand.legs, start=1)
+            ],
+        )
+    if stale_ids or updates or inserts:
+        await next_change_seq(session)
     await session.commit()
-    return generated_rows
 
+    _POOL_FINGERPRINTS.clear()
+    _POOL_FINGERPRINTS.update(fingerprints)
+    summary.update(kept=len(updates), inserted=len(inserts), deleted=len(stale_ids))
+    return summary
 
-async def build_custom_parlay(session: AsyncSession, pick_ids: list[int]) -> dict:
-    if len(pick_ids) < 2:
-        return {"is_valid": False, "reason": "at_least_two_picks_required"}
-    picks = (await session.scalars(select(Pick).where(Pick.id.in_(pick_ids)))).all()
-    if len(picks) != len(set(pick_ids)):
-        return {"is_valid": False, "reason": "pick_not_found"}
+
+async def generate_daily_parlays(session: AsyncSession) -> list[Parlay]:
+    await refresh_parlays(session, force=True)
+    pick_date = datetime.now(UTC).date()
+    return list((await session.scalars(select(Parlay).where(Parlay.pick_date == pick_date))).all())
+
+
+def _price_leg_set(index: ParlayLegIndex, positions: list[int]) -> dict:
+    bad_pair = index.incompatible_pair(positions)
+    if bad_pair is not None:
+        reason = index.compatibility_reason(*bad_pair)
+        return {"is_valid": False, "reason": reason, "compatibility_warnings": [reason]}
 
     warnings: list[str] = []
-    for a, b in combinations(picks, 2):
-        r = check_compatibility(a, b, "aggressive")
-        if not r.is_compatible:
-            return {"is_valid": False, "reason": r.reason, "compatibility_warnings": [r.reason]}
-        corr = estimate_correlation(a, b)
+    for i, j in combinations(positions, 2):
+        corr = index.pair_correlation(i, j)
         if corr > 0.40:
-            warnings.append(f"high_pair_correlation:{a.id}-{b.id}:{corr:.2f}")
+            warnings.append(f"high_pair_correlation:{index.legs[i].id}-{index.legs[j].id}:{corr:.2f}")
 
-    cand = _candidate_from_legs(picks, "aggressive")
+    cand = _candidate_from_legs(index, positions, "aggressive")
     return {
         "is_valid": True,
         "reason": "",
@@ -229,3 +428,37 @@ async def build_custom_parlay(session: AsyncSession, pick_ids: list[int]) -> dic
         "compatibility_warnings": warnings,
         "suggested_kelly_fraction": cand.suggested_kelly_fraction,
     }
+
+
+async def price_parlays(session: AsyncSession, leg_sets: list[list[int]]) -> list[dict]:
+    """Price many leg sets against one index built over the union of their picks.
+
+    The index only shares pairwise lookups; each leg set's joint probability is sampled
+    on its own, so a result does not depend on the rest of the batch.
+    """
+    wanted = {pick_id for leg_set in leg_sets for pick_id in leg_set}
+    picks = (await session.scalars(select(Pick).where(Pick.id.in_(wanted)))).all() if wanted else []
+    index = ParlayLegIndex(picks, "aggressive")
+    position_by_id = {pick.id: pos for pos, pick in enumerate(index.legs)}
+
+    results: list[dict] = []
+    for leg_set in leg_sets:
+        pick_ids = list(dict.fromkeys(leg_set))
+        if len(pick_ids) < 2:
+            results.append({"is_valid": False, "reason": "at_least_two_picks_required"})
+        elif any(pick_id not in position_by_id for pick_id in pick_ids):
+            results.append({"is_valid": False, "reason": "pick_not_found"})
+        else:
+            results.append(_price_leg_set(index, [position_by_id[pick_id] for pick_id in pick_ids]))
+    return results
+
+
+async def build_custom_parlay(session: AsyncSession, pick_ids: list[int]) -> dict:
+    if len(pick_ids) < 2:
+        return {"is_valid": False, "reason": "at_least_two_picks_required"}
+    picks = (await session.scalars(select(Pick).where(Pick.id.in_(pick_ids)))).all()
+    if len(picks) != len(set(pick_ids)):
+        return {"is_valid": False, "reason": "pick_not_found"}
+
+    index = ParlayLegIndex(picks, "aggressive")
+    return _price_leg_set(index, list(range(len(picks))))
@@ -1,43 +1,100 @@
 from __future__ import annotations
 
-from sqlalchemy import select
+from collections import defaultdict
+from collections.abc import Iterable
+
+from sqlalchemy import or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from app.models.parlay import Parlay, ParlayLeg
+from app.models.pick import Pick
+from app.services.change_feed import next_change_seq
+
+
+def resolve_parlay_outcome(leg_outcomes: list[str | None]) -> str | None:
+    if not leg_outcomes or any(o in (None, "pending") for o in leg_outcomes):
+        return None
+    if all(o == "push" for o in leg_outcomes):
+        return "push"
+    if any(o == "loss" for o in leg_outcomes):
+        return "loss"
+    return "win"
 
 
-async def settle_parlays(session: AsyncSession) -> dict:
-    parlays = (
-        await session.scalars(
-            select(Parlay).where(Parlay.outcome == "pending").options(selectinload(Parlay.legs).selectinload(ParlayLeg.pick))
+async def settle_parlays(session: AsyncSession, pick_ids: Iterable[int] | None = None) -> dict:
+    """Settle pending parlays touched by ``pick_ids``.
+
+    When ``pick_ids`` is None, every pending parlay whose legs are all settled is swept.
+    That catches parlays left behind by a run that failed after settling their picks; it
+    scans all pending parlays, so only worker startup runs it.
+    """
+    unsettled_leg = (
+        select(ParlayLeg.id)
+        .join(Pick, Pick.id == ParlayLeg.pick_id)
+        .where(ParlayLeg.parlay_id == Parlay.id, or_(Pick.outcome.is_(None), Pick.outcome == "pending"))
+    )
+    parlay_stmt = select(Parlay.id).where(Parlay.outcome == "pending", ~unsettled_leg.exists())
+    if pick_ids is not None:
+        pick_ids = set(pick_ids)
+        if not pick_ids:
+            return {"settled": 0, "wins": 0, "losses": 0, "pushes": 0}
+        parlay_stmt = (
+            select(ParlayLeg.parlay_id)
+            .join(Parlay, Parlay.id == ParlayLeg.parlay_id)
+            .where(ParlayLeg.pick_id.in_(pick_ids), Parlay.outcome == "pending")
+            .distinct()
+        )
+
+    parlay_ids = (await session.scalars(parlay_stmt)).all()
+    if not parlay_ids:
+        return {"settled": 0, "wins": 0, "losses": 0, "pushes": 0}
+
+    rows = (
+        await session.execute(
+            select(
+                ParlayLeg.parlay_id,
+                ParlayLeg.id,
+                Pick.outcome,
+                Parlay.combined_odds_decimal,
+                Parlay.suggested_kelly_fraction,
+            )
+            .join(Parlay, Parlay.id == ParlayLeg.parlay_id)
+            .join(Pick, Pick.id == ParlayLeg.pick_id)
+            .where(ParlayLeg.parlay_id.in_(parlay_ids))
         )
     ).all()
 
-    settled = wins = losses = pushes = 0
-    for parlay in parlays:
-        leg_outcomes = [leg.pick.outcome for leg in parlay.legs if leg.pick is not None]
-        if not leg_outcomes or any(o in (None, "pending") for o in leg_outcomes):
-            continue
+    legs_by_parlay: dict[int, list[tuple[int, str | None]]] = defaultdict(list)
+    pricing: dict[int, tuple[float, float]] = {}
+    for parlay_id, leg_id, pick_outcome, odds_decimal, kelly in rows:
+        legs_by_parlay[parlay_id].append((leg_id, pick_outcome))
+        pricing[parlay_id] = (odds_decimal, kelly)
 
-        for leg in parlay.legs:
-            if leg.pick is not None and leg.pick.outcome:
-                leg.result = leg.pick.outcome
+    parlay_updates: list[dict] = []
+    leg_updates: list[dict] = []
+    wins = losses = pushes = 0
+    for parlay_id, legs in legs_by_parlay.items():
+        outcome = resolve_parlay_outcome([o for _, o in legs])
+        if outcome is None:
+            continue
 
-        if all(o == "push" for o in leg_outcomes):
-            parlay.outcome = "push"
-            parlay.profit_loss = 0.0
+        odds_decimal, kelly = pricing[parlay_id]
+        if outcome == "push":
+            profit_loss = 0.0
             pushes += 1
-        elif any(o == "loss" for o in leg_outcomes):
-            parlay.outcome = "loss"
-            parlay.profit_loss = -1.0 * parlay.suggested_kelly_fraction
+        elif outcome == "loss":
+            profit_loss = -1.0 * kelly
             losses += 1
         else:
-            parlay.outcome = "win"
-            parlay.profit_loss = (parlay.combined_odds_decimal - 1.0) * parlay.suggested_kelly_fraction
+            profit_loss = (odds_decimal - 1.0) * kelly
             wins += 1
 
-        settled += 1
+        parlay_updates.append({"id": parlay_id, "outcome": outcome, "profit_loss": profit_loss})
+        leg_updates.extend({"id": leg_id, "result": o} for leg_id, o in legs)
 
+    if parlay_updates:
+        await session.execute(update(Parlay), parlay_updates)
+        await session.execute(update(ParlayLeg), leg_updates)
+        await next_change_seq(session)
     await session.commit()
-    return {"settled": settled, "wins": wins, "losses": losses, "pushes": pushes}
+    return {"settled": len(parlay_updates), "wins": wins, "losses": losses, "pushes": pushes}
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
 from dataclasses import asdict, dataclass
-from datetime import date, timedelta
+from datetime import UTC, date, datetime, timedelta
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import case, func, literal, null, or_, select, tuple_, union_all, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.performance_snapshot import PerformanceSnapshot
 from app.models.pick import Pick
 
 
@@ -31,28 +33,151 @@ class PerformanceSummary:
     by_market: dict
 
 
-def _bucket(rows: list[Pick], attr: str) -> dict:
-    out: dict = {}
-    for pick in rows:
-        key = getattr(pick, attr)
-        wins = 1 if pick.outcome == "win" else 0
-        losses = 1 if pick.outcome == "loss" else 0
-        out.setdefault(key, {"picks": 0, "wins": 0, "losses": 0, "profit": 0.0, "clv": []})
-        b = out[key]
-        b["picks"] += 1
-        b["wins"] += wins
-        b["losses"] += losses
-        b["profit"] += pick.profit_loss or 0.0
-        if pick.market_clv is not None:
-            b["clv"].append(pick.market_clv)
-
-    for key, b in out.items():
-        wagered = sum((p.suggested_kelly_fraction or 0.0) for p in rows if getattr(p, attr) == key)
-        b["roi"] = (b["profit"] / wagered * 100.0) if wagered > 0 else 0.0
-        b["avg_clv"] = sum(b["clv"]) / len(b["clv"]) if b["clv"] else 0.0
-        del b["profit"]
-        del b["clv"]
-    return out
+SETTLED_OUTCOMES = ("win", "loss", "push")
+_EMPTY_BUCKET = {"picks": 0, "wins": 0, "losses": 0, "roi": 0.0, "avg_clv": 0.0}
+_BUCKET_COLUMNS = {
+    "confidence_tier": Pick.confidence_tier,
+    "sport_key": Pick.sport_key,
+    "market": Pick.market,
+}
+_SNAPSHOT_BUCKETS = {"confidence_tier": "by_tier", "sport_key": "by_sport", "market": "by_market"}
+
+# Additive totals and the PerformanceSnapshot columns that store them.
+_SNAPSHOT_COLUMNS = {
+    "total": "total_picks",
+    "settled": "settled_picks",
+    "wins": "wins",
+    "losses": "losses",
+    "pushes": "pushes",
+    "profit": "total_profit_units",
+    "wagered": "wagered_units",
+    "ev_sum": "ev_pct_sum",
+    "ev_count": "ev_pct_count",
+    "odds_sum": "odds_american_sum",
+    "market_clv_sum": "market_clv_sum",
+    "market_clv_count": "market_clv_count",
+    "book_clv_sum": "book_clv_sum",
+    "book_clv_count": "book_clv_count",
+}
+_BUCKET_KEYS = ("settled", "wins", "losses", "profit", "wagered", "market_clv_sum", "market_clv_count")
+# JSON object keys are strings, so a NULL bucket (e.g. no confidence tier) is stored under this key.
+_BUCKET_NULL_KEY = "null"
+
+
+def _aggregate_columns() -> list:
+    settled = Pick.outcome.in_(SETTLED_OUTCOMES)
+    market_clv = case((settled, Pick.market_clv))
+    book_clv = case((settled, Pick.book_clv))
+    return [
+        func.count().label("total"),
+        func.sum(case((settled, 1), else_=0)).label("settled"),
+        func.sum(case((Pick.outcome == "win", 1), else_=0)).label("wins"),
+        func.sum(case((Pick.outcome == "loss", 1), else_=0)).label("losses"),
+        func.sum(case((Pick.outcome == "push", 1), else_=0)).label("pushes"),
+        func.sum(case((settled, func.coalesce(Pick.profit_loss, 0.0)), else_=0.0)).label("profit"),
+        func.sum(case((settled, func.coalesce(Pick.suggested_kelly_fraction, 0.0)), else_=0.0)).label("wagered"),
+        func.sum(Pick.ev_pct).label("ev_sum"),
+        func.count(Pick.ev_pct).label("ev_count"),
+        func.sum(Pick.odds_american).label("odds_sum"),
+        func.sum(market_clv).label("market_clv_sum"),
+        func.count(market_clv).label("market_clv_count"),
+        func.sum(book_clv).label("book_clv_sum"),
+        func.count(book_clv).label("book_clv_count"),
+    ]
+
+
+def _summary_statement(dialect: str, filters: list):
+    """One aggregate row for the whole selection plus one per tier, sport and market."""
+    if dialect == "postgresql":
+        return (
+            select(
+                *[col.label(name) for name, col in _BUCKET_COLUMNS.items()],
+                *[func.grouping(col).label(f"g_{name}") for name, col in _BUCKET_COLUMNS.items()],
+                *_aggregate_columns(),
+            )
+            .where(*filters)
+            .group_by(func.grouping_sets(tuple_(), *[tuple_(col) for col in _BUCKET_COLUMNS.values()]))
+        )
+
+    # Same result shape as GROUPING SETS for backends without it (sqlite in tests).
+    parts = []
+    for grouped in (None, *_BUCKET_COLUMNS):
+        keys = [
+            (col if name == grouped else null()).label(name) for name, col in _BUCKET_COLUMNS.items()
+        ]
+        flags = [literal(0 if name == grouped else 1).label(f"g_{name}") for name in _BUCKET_COLUMNS]
+        stmt = select(*keys, *flags, *_aggregate_columns()).where(*filters)
+        if grouped is not None:
+            stmt = stmt.group_by(_BUCKET_COLUMNS[grouped])
+        parts.append(stmt)
+    return union_all(*parts)
+
+
+def _empty_totals() -> dict:
+    return dict.fromkeys(_SNAPSHOT_COLUMNS, 0)
+
+
+def _merge_totals(into: dict, other: dict, keys=_SNAPSHOT_COLUMNS) -> None:
+    for key in keys:
+        into[key] = into.get(key, 0) + (other.get(key) or 0)
+
+
+def _ratio(num: float, den: float, scale: float = 1.0) -> float:
+    return (num / den * scale) if den > 0 else 0.0
+
+
+def _bucket_entry(totals: dict) -> dict:
+    return {
+        "picks": int(totals["settled"]),
+        "wins": int(totals["wins"]),
+        "losses": int(totals["losses"]),
+        "roi": _ratio(totals["profit"], totals["wagered"], 100.0),
+        "avg_clv": _ratio(totals["market_clv_sum"], totals["market_clv_count"]),
+    }
+
+
+def _summary_from_totals(totals: dict, buckets: dict[str, dict]) -> PerformanceSummary:
+    wins, losses = int(totals["wins"]), int(totals["losses"])
+    derived = {
+        name: {key: _bucket_entry(b) for key, b in by_key.items() if b["settled"]} for name, by_key in buckets.items()
+    }
+    tier_map = derived["confidence_tier"]
+    return PerformanceSummary(
+        total_picks=int(totals["total"]),
+        settled_picks=int(totals["settled"]),
+        pending_picks=int(totals["total"] - totals["settled"]),
+        wins=wins,
+        losses=losses,
+        pushes=int(totals["pushes"]),
+        win_rate=_ratio(wins, wins + losses),
+        roi_pct=_ratio(totals["profit"], totals["wagered"], 100.0),
+        total_profit_units=float(totals["profit"]),
+        avg_ev_pct=_ratio(totals["ev_sum"], totals["ev_count"]),
+        avg_market_clv=_ratio(totals["market_clv_sum"], totals["market_clv_count"]),
+        avg_book_clv=_ratio(totals["book_clv_sum"], totals["book_clv_count"]),
+        avg_odds_american=_ratio(totals["odds_sum"], totals["total"]),
+        high_confidence=tier_map.get("high", dict(_EMPTY_BUCKET)),
+        medium_confidence=tier_map.get("medium", dict(_EMPTY_BUCKET)),
+        low_confidence=tier_map.get("low", dict(_EMPTY_BUCKET)),
+        by_sport=derived["sport_key"],
+        by_market=derived["market"],
+    )
+
+
+async def _aggregate_picks(session: AsyncSession, filters: list) -> tuple[dict, dict[str, dict]]:
+    dialect = session.bind.dialect.name if session.bind is not None else "postgresql"
+    rows = (await session.execute(_summary_statement(dialect, filters))).all()
+
+    totals = _empty_totals()
+    buckets: dict[str, dict] = {name: {} for name in _BUCKET_COLUMNS}
+    for row in rows:
+        values = {key: getattr(row, key) or 0 for key in _SNAPSHOT_COLUMNS}
+        grouped = next((name for name in _BUCKET_COLUMNS if not getattr(row, f"g_{name}")), None)
+        if grouped is None:
+            totals = values
+        else:
+            buckets[grouped][getattr(row, grouped)] = values
+    return totals, buckets
 
 
 async def get_performance_summary(
@@ -61,103 +186,150 @@ async def get_performance_summary(
     end_date: date | None = None,
     sport_key: str | None = None,
 ) -> PerformanceSummary:
-    stmt = select(Pick)
+    """Summary over a pick-day range.
+
+    Closed days come from the daily rollups; today's picks and any pick not yet rolled up
+    are aggregated live. Sport-filtered summaries need per-sport tier and market splits the
+    rollups do not keep, so they are aggregated from picks directly.
+    """
+    filters = []
     if start_date:
-        stmt = stmt.where(Pick.pick_date >= start_date)
+        filters.append(Pick.pick_day >= start_date)
     if end_date:
-        stmt = stmt.where(Pick.pick_date <= end_date)
+        filters.append(Pick.pick_day <= end_date)
     if sport_key:
-        stmt = stmt.where(Pick.sport_key == sport_key)
+        filters.append(Pick.sport_key == sport_key)
+        totals, buckets = await _aggregate_picks(session, filters)
+        return _summary_from_totals(totals, buckets)
 
-    rows = (await session.scalars(stmt)).all()
-    settled = [p for p in rows if p.outcome in {"win", "loss", "push"}]
-    wins = sum(1 for p in settled if p.outcome == "win")
-    losses = sum(1 for p in settled if p.outcome == "loss")
-    pushes = sum(1 for p in settled if p.outcome == "push")
+    today = datetime.now(UTC).date()
+    totals, buckets = await _aggregate_picks(session, [*filters, or_(Pick.pick_day >= today, Pick.rolled_up.is_(False))])
 
-    total_profit = sum(p.profit_loss or 0.0 for p in settled)
-    total_wagered = sum(p.suggested_kelly_fraction or 0.0 for p in settled)
-    win_rate = wins / (wins + losses) if (wins + losses) > 0 else 0.0
+    stmt = select(PerformanceSnapshot).where(PerformanceSnapshot.snapshot_date < today)
+    if start_date:
+        stmt = stmt.where(PerformanceSnapshot.snapshot_date >= start_date)
+    if end_date:
+        stmt = stmt.where(PerformanceSnapshot.snapshot_date <= end_date)
+    for snapshot in (await session.scalars(stmt)).all():
+        _merge_totals(totals, {key: getattr(snapshot, col) for key, col in _SNAPSHOT_COLUMNS.items()})
+        for name, attr in _SNAPSHOT_BUCKETS.items():
+            for key, values in (getattr(snapshot, attr) or {}).items():
+                key = None if key == _BUCKET_NULL_KEY else key
+                _merge_totals(buckets[name].setdefault(key, dict.fromkeys(_BUCKET_KEYS, 0)), values, _BUCKET_KEYS)
+    return _summary_from_totals(totals, buckets)
+
+
+async def rebuild_performance_snapshots(session: AsyncSession, days: Iterable[date]) -> None:
+    """Recompute each day's PerformanceSnapshot from that day's rolled-up picks.
+
+    Rebuilding rather than adding deltas keeps a day correct when a rolled-up pick changes
+    later (CLV arrives after settlement). The caller commits.
+    """
+    days = sorted(set(days))
+    if not days:
+        return
+    snapshots = {
+        s.snapshot_date: s
+        for s in (await session.scalars(select(PerformanceSnapshot).where(PerformanceSnapshot.snapshot_date.in_(days)))).all()
+    }
+    for day in days:
+        totals, buckets = await _aggregate_picks(
+            session, [Pick.pick_day == day, Pick.rolled_up.is_(True), Pick.outcome.in_(SETTLED_OUTCOMES)]
+        )
+        snapshot = snapshots.get(day)
+        if snapshot is None:
+            snapshot = PerformanceSnapshot(snapshot_date=day)
+            session.add(snapshot)
+        for key, col in _SNAPSHOT_COLUMNS.items():
+            setattr(snapshot, col, totals[key])
+        for name, attr in _SNAPSHOT_BUCKETS.items():
+            setattr(
+                snapshot,
+                attr,
+                {_BUCKET_NULL_KEY if key is None else key: {k: b[k] for k in _BUCKET_KEYS} for key, b in buckets[name].items()},
+            )
+        summary = _summary_from_totals(totals, buckets)
+        snapshot.win_rate = summary.win_rate
+        snapshot.roi_pct = summary.roi_pct
+        snapshot.avg_ev_pct = summary.avg_ev_pct
+        snapshot.avg_market_clv = summary.avg_market_clv
+        snapshot.avg_book_clv = summary.avg_book_clv
 
-    tier_map = _bucket(settled, "confidence_tier")
-    return PerformanceSummary(
-        total_picks=len(rows),
-        settled_picks=len(settled),
-        pending_picks=len(rows) - len(settled),
-        wins=wins,
-        losses=losses,
-        pushes=pushes,
-        win_rate=win_rate,
-        roi_pct=(total_profit / total_wagered * 100.0) if total_wagered > 0 else 0.0,
-        total_profit_units=total_profit,
-        avg_ev_pct=(sum(p.ev_pct for p in rows) / len(rows)) if rows else 0.0,
-        avg_market_clv=(sum(p.market_clv for p in settled if p.market_clv is not None) / len([p for p in settled if p.market_clv is not None])) if any(p.market_clv is not None for p in settled) else 0.0,
-        avg_book_clv=(sum(p.book_clv for p in settled if p.book_clv is not None) / len([p for p in settled if p.book_clv is not None])) if any(p.book_clv is not None for p in settled) else 0.0,
-        avg_odds_american=(sum(p.odds_american for p in rows) / len(rows)) if rows else 0.0,
-        high_confidence=tier_map.get("high", {"picks": 0, "wins": 0, "losses": 0, "roi": 0.0, "avg_clv": 0.0}),
-        medium_confidence=tier_map.get("medium", {"picks": 0, "wins": 0, "losses": 0, "roi": 0.0, "avg_clv": 0.0}),
-        low_confidence=tier_map.get("low", {"picks": 0, "wins": 0, "losses": 0, "roi": 0.0, "avg_clv": 0.0}),
-        by_sport=_bucket(settled, "sport_key"),
-        by_market=_bucket(settled, "market"),
-    )
+
+async def update_performance_rollups(session: AsyncSession, pick_ids: Iterable[int] | None = None) -> int:
+    """Fold newly settled picks into their day's PerformanceSnapshot.
+
+    With ``pick_ids`` only those picks are considered; without, every settled pick that
+    has not been rolled up yet. Each pick is marked with ``Pick.rolled_up`` and its day's
+    snapshot is rebuilt.
+    """
+    stmt = select(Pick.id, Pick.pick_day).where(Pick.outcome.in_(SETTLED_OUTCOMES), Pick.rolled_up.is_(False))
+    if pick_ids is not None:
+        ids = list(pick_ids)
+        if not ids:
+            return 0
+        stmt = stmt.where(Pick.id.in_(ids))
+    rows = (await session.execute(stmt)).all()
+    if not rows:
+        return 0
+
+    await session.execute(update(Pick).where(Pick.id.in_([pick_id for pick_id, _ in rows])).values(rolled_up=True))
+    await rebuild_performance_snapshots(session, (day for _, day in rows))
+    await session.commit()
+    return len(rows)
+
+
+def _daily_statement(start: date | None = None):
+    """Settled picks grouped by pick_day with running totals over the grouped rows."""
+    daily = select(
+        Pick.pick_day.label("d"),
+        func.count(Pick.id).label("picks"),
+        func.sum(case((Pick.outcome == "win", 1), else_=0)).label("wins"),
+        func.sum(case((Pick.outcome == "loss", 1), else_=0)).label("losses"),
+        func.sum(func.coalesce(Pick.profit_loss, 0.0)).label("profit"),
+        func.sum(func.coalesce(Pick.suggested_kelly_fraction, 0.0)).label("wagered"),
+        func.avg(Pick.market_clv).label("avg_clv"),
+    ).where(Pick.outcome.in_(SETTLED_OUTCOMES))
+    if start is not None:
+        daily = daily.where(Pick.pick_day >= start)
+    daily = daily.group_by(Pick.pick_day).subquery()
+
+    return select(
+        daily,
+        func.sum(daily.c.picks).over(order_by=daily.c.d).label("cumulative_picks"),
+        func.sum(daily.c.profit).over(order_by=daily.c.d).label("cumulative_profit"),
+        func.sum(daily.c.wagered).over(order_by=daily.c.d).label("cumulative_wagered"),
+    ).order_by(daily.c.d)
 
 
 async def get_daily_performance(session: AsyncSession, days: int = 30) -> list[dict]:
     start = date.today() - timedelta(days=days - 1)
-    rows = (
-        await session.execute(
-            select(
-                func.date(Pick.created_at).label("d"),
-                func.count(Pick.id).label("picks"),
-                func.sum(func.case((Pick.outcome == "win", 1), else_=0)).label("wins"),
-                func.sum(func.case((Pick.outcome == "loss", 1), else_=0)).label("losses"),
-                func.sum(func.coalesce(Pick.profit_loss, 0.0)).label("profit"),
-                func.sum(func.coalesce(Pick.suggested_kelly_fraction, 0.0)).label("wagered"),
-                func.avg(Pick.market_clv).label("avg_clv"),
-            )
-            .where(and_(func.date(Pick.created_at) >= start, Pick.outcome.in_(["win", "loss", "push"])))
-            .group_by("d")
-            .order_by("d")
-        )
-    ).all()
-
-    cumulative = 0.0
-    out: list[dict] = []
-    for r in rows:
-        cumulative += float(r.profit or 0.0)
-        out.append(
-            {
-                "date": str(r.d),
-                "picks": int(r.picks or 0),
-                "wins": int(r.wins or 0),
-                "losses": int(r.losses or 0),
-                "roi": (float(r.profit or 0.0) / float(r.wagered or 0.0) * 100.0) if float(r.wagered or 0.0) > 0 else 0.0,
-                "cumulative_profit": cumulative,
-                "avg_clv": float(r.avg_clv or 0.0),
-            }
-        )
-    return out
+    rows = (await session.execute(_daily_statement(start))).all()
+    return [
+        {
+            "date": str(r.d),
+            "picks": int(r.picks or 0),
+            "wins": int(r.wins or 0),
+            "losses": int(r.losses or 0),
+            "roi": _ratio(float(r.profit or 0.0), float(r.wagered or 0.0), 100.0),
+            "cumulative_profit": float(r.cumulative_profit or 0.0),
+            "avg_clv": float(r.avg_clv or 0.0),
+        }
+        for r in rows
+    ]
 
 
 async def get_roi_over_time(session: AsyncSession) -> list[dict]:
-    daily = await get_daily_performance(session, days=3650)
-    cumulative_picks = 0
-    out: list[dict] = []
-    for item in daily:
-        cumulative_picks += item["picks"]
-        total_wagered_stmt = select(func.sum(Pick.suggested_kelly_fraction)).where(
-            func.date(Pick.created_at) <= item["date"], Pick.outcome.in_(["win", "loss", "push"])
-        )
-        total_wagered = float(await session.scalar(total_wagered_stmt) or 0.0)
-        out.append(
-            {
-                "date": item["date"],
-                "cumulative_picks": cumulative_picks,
-                "cumulative_profit": item["cumulative_profit"],
-                "cumulative_roi_pct": (item["cumulative_profit"] / total_wagered * 100.0) if total_wagered > 0 else 0.0,
-            }
-        )
-    return out
+    rows = (await session.execute(_daily_statement())).all()
+    return [
+        {
+            "date": str(r.d),
+            "cumulative_picks": int(r.cumulative_picks or 0),
+            "cumulative_profit": float(r.cumulative_profit or 0.0),
+            "cumulative_roi_pct": _ratio(float(r.cumulative_profit or 0.0), float(r.cumulative_wagered or 0.0), 100.0),
+        }
+        for r in rows
+    ]
 
 
 def summary_to_dict(summary: PerformanceSummary) -> dict:
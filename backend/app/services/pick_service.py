@@ -14,6 +14,8 @@ from app.config import settings
 from app.models.game import Game
 from app.models.odds_snapshot import OddsSnapshot
 from app.models.pick import Pick
+from app.services.change_feed import next_change_seq
+from app.services.event_hub import PICKS_CHANNEL, notify_changes
 from app.services.model_provider import model_provider
 from app.utils.odds_math import american_to_decimal, american_to_implied_prob, calculate_ev
 
@@ -107,6 +109,7 @@ async def generate_picks(
         implied_prob_open = american_to_implied_prob(best_row.odds)
 
         model_prob = await model_provider.get_true_prob(
+            session=session,
             sport_key=best_row.sport_key,
             game=game,
             market=market,
@@ -158,6 +161,8 @@ async def generate_picks(
 
     created = 0
     updated = 0
+    changed_ids: list[int] = []
+    change_seq = await next_change_seq(session) if selected else 0
     for c in selected:
         dialect = session.bind.dialect.name if session.bind is not None else "postgresql"
         insert_stmt = (sqlite_insert(Pick) if dialect == "sqlite" else pg_insert(Pick)).values(
@@ -187,6 +192,7 @@ async def generate_picks(
             data_quality={"lookback_minutes": lookback_minutes},
             suggested_kelly_fraction=0.0,
             status="open",
+            change_seq=change_seq,
         )
         if dialect == "sqlite":
             on_conflict = insert_stmt.on_conflict_do_update(
@@ -202,27 +208,28 @@ async def generate_picks(
                     "composite_score": c.edge * 100,
                     "signals": {"model_driven": True, "updated": True},
                     "data_quality": {"lookback_minutes": lookback_minutes},
+                    "change_seq": change_seq,
                 },
             )
         else:
             on_conflict = insert_stmt.on_conflict_do_update(
                 constraint="uq_pick_game_market_side_day",
                 set_={
-                "model_prob": c.model_prob,
-                "ev_pct": c.ev_pct,
-                "edge": c.edge,
-                "consensus_prob": c.consensus_prob,
-                "book_count": c.book_count,
-                "fair_prob": c.model_prob,
-                "implied_prob": c.implied_prob_open,
-                "composite_score": c.edge * 100,
-                "signals": {"model_driven": True, "updated": True},
-                "data_quality": {"lookback_minutes": lookback_minutes},
-            },
+                    "model_prob": c.model_prob,
+                    "ev_pct": c.ev_pct,
+                    "edge": c.edge,
+                    "consensus_prob": c.consensus_prob,
+                    "book_count": c.book_count,
+                    "fair_prob": c.model_prob,
+                    "implied_prob": c.implied_prob_open,
+                    "composite_score": c.edge * 100,
+                    "signals": {"model_driven": True, "updated": True},
+                    "data_quality": {"lookback_minutes": lookback_minutes},
+                    "change_seq": change_seq,
+                },
             )
-        )
 
-        await session.execute(on_conflict)
+        changed_ids.append(await session.scalar(on_conflict.returning(Pick.id)))
         key = (c.game.id, c.market, c.side)
         if key in existing_keys:
             updated += 1
@@ -230,6 +237,7 @@ async def generate_picks(
             created += 1
             existing_keys.add(key)
 
+    await notify_changes(session, PICKS_CHANNEL, changed_ids)
     await session.commit()
 
     return {
@@ -252,7 +260,7 @@ async def update_closing_lines_for_open_picks(session: AsyncSession, *, pregame_
         )
     ).all()
 
-    updated = 0
+    changed: list[Pick] = []
     for pick in open_picks:
         # pick is Pick due scalars over first col in join
         game = await session.scalar(select(Game).where(Game.id == pick.game_id))
@@ -295,8 +303,11 @@ async def update_closing_lines_for_open_picks(session: AsyncSession, *, pregame_
         pick.closing_snapshot_time = closing.snapshot_time
         pick.clv_prob = clv_prob
         pick.clv_price = open_dec - close_dec
-        updated += 1
+        changed.append(pick)
 
-    if updated:
+    if changed:
+        change_seq = await next_change_seq(session)
+        for pick in changed:
+            pick.change_seq = change_seq
         await session.commit()
-    return updated
+    return len(changed)
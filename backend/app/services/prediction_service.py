@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from collections.abc import Iterable
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import and_, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.data_providers.nba_response_cache import season_for_date
+from app.data_providers.nba_stats import NBAStatsClient
+from app.ml.features import GameFeatures, build_game_features, features_to_array, features_to_dict
+from app.ml.model import predictor
+from app.models.game import Game
+from app.models.model_prediction import ModelPrediction
+from app.models.sport import Sport
+
+logger = logging.getLogger(__name__)
+
+PREDICTION_HORIZON = timedelta(days=2)
+
+
+def feature_hash(features: GameFeatures) -> str:
+    return hashlib.sha256(json.dumps(features_to_array(features), separators=(",", ":")).encode()).hexdigest()
+
+
+def nba_season(commence_time: datetime) -> int:
+    return season_for_date(commence_time.date())
+
+
+async def upcoming_nba_games(session: AsyncSession, start: datetime, end: datetime) -> list[Game]:
+    return list(
+        (
+            await session.scalars(
+                select(Game)
+                .join(Sport, Sport.id == Game.sport_id)
+                .where(and_(Sport.key == "basketball_nba", Game.commence_time >= start, Game.commence_time <= end))
+                .order_by(Game.commence_time)
+            )
+        ).all()
+    )
+
+
+async def refresh_model_predictions(session: AsyncSession, nba_client: NBAStatsClient) -> dict[str, int]:
+    """Store a prediction for each upcoming NBA game whose features or model version changed.
+
+    Features are rebuilt to detect changes, but the model only runs, and a row is only
+    written, when no prediction exists for the (game, model version, feature hash) key.
+    """
+    summary = {"written": 0, "unchanged": 0, "skipped": 0}
+    predictor.reload_if_changed()
+    version = predictor.version
+    if version is None:
+        return summary
+
+    now = datetime.now(UTC)
+    games = await upcoming_nba_games(session, now, now + PREDICTION_HORIZON)
+    if not games:
+        return summary
+
+    stored = set(
+        (
+            await session.execute(
+                select(ModelPrediction.game_id, ModelPrediction.feature_hash).where(
+                    ModelPrediction.game_id.in_([g.id for g in games]), ModelPrediction.model_version == version
+                )
+            )
+        ).all()
+    )
+    ready_seasons = {
+        season
+        for season in {nba_season(g.commence_time) for g in games}
+        if await nba_client.get_team_stats(season, use_cache=True)
+    }
+
+    rows: list[dict] = []
+    for game in games:
+        if nba_season(game.commence_time) not in ready_seasons:
+            summary["skipped"] += 1
+            continue
+        try:
+            features = await build_game_features(game.home_team, game.away_team, game.commence_time.date(), nba_client)
+            digest = feature_hash(features)
+            if (game.id, digest) in stored:
+                summary["unchanged"] += 1
+                continue
+            home_prob = predictor.predict_home_win_prob(features_to_array(features))
+        except Exception as exc:
+            logger.warning("Skipping prediction for %s vs %s: %s", game.home_team, game.away_team, exc)
+            summary["skipped"] += 1
+            continue
+        rows.append(
+            {
+                "game_id": game.id,
+                "model_version": version,
+                "feature_hash": digest,
+                "home_win_prob": home_prob,
+                "features": features_to_dict(features),
+            }
+        )
+
+    if rows:
+        await session.execute(insert(ModelPrediction), rows)
+        await session.commit()
+    summary["written"] = len(rows)
+    return summary
+
+
+async def latest_predictions(
+    session: AsyncSession, game_ids: Iterable[int], model_version: str | None = None
+) -> dict[int, ModelPrediction]:
+    """Newest stored prediction per game for the given model version.
+
+    Without one, the newest version in model_predictions is used: the worker writes the
+    rows, so its model, not this process's, decides what is current.
+    """
+    game_ids = list(game_ids)
+    if not game_ids:
+        return {}
+    version = model_version
+    if version is None:
+        version = (
+            select(ModelPrediction.model_version).order_by(ModelPrediction.id.desc()).limit(1).scalar_subquery()
+        )
+    newest = (
+        select(func.max(ModelPrediction.id))
+        .where(ModelPrediction.game_id.in_(game_ids), ModelPrediction.model_version == version)
+        .group_by(ModelPrediction.game_id)
+    )
+    rows = await session.scalars(select(ModelPrediction).where(ModelPrediction.id.in_(newest)))
+    return {row.game_id: row for row in rows}
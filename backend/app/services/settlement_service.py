@@ -7,6 +7,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.game import Game
 from app.models.pick import Pick
+from app.services.bankroll_service import record_settlements
+from app.services.change_feed import next_change_seq
+from app.services.event_hub import PICKS_CHANNEL, notify_changes
 from app.utils.odds_math import american_to_decimal
 
 
@@ -76,6 +79,7 @@ async def settle_picks(session: AsyncSession) -> dict:
     ).all()
 
     settled = wins = losses = pushes = 0
+    settled_picks: list[Pick] = []
     for pick in picks:
         game = await session.scalar(select(Game).where(Game.id == pick.game_id))
         if game is None or game.home_score is None or game.away_score is None:
@@ -105,7 +109,20 @@ async def settle_picks(session: AsyncSession) -> dict:
             pushes += 1
 
         pick.outcome = outcome.value
+        settled_picks.append(pick)
         settled += 1
 
+    if settled_picks:
+        change_seq = await next_change_seq(session)
+        for pick in settled_picks:
+            pick.change_seq = change_seq
+    await record_settlements(session, settled_picks)
+    await notify_changes(session, PICKS_CHANNEL, [p.id for p in settled_picks])
     await session.commit()
-    return {"settled": settled, "wins": wins, "losses": losses, "pushes": pushes}
+    return {
+        "settled": settled,
+        "wins": wins,
+        "losses": losses,
+        "pushes": pushes,
+        "pick_ids": [p.id for p in settled_picks],
+    }
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import logging
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 
 from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -10,12 +10,18 @@ from app.data_providers.odds_api import OddsAPIClient
 from app.models.game import Game
 from app.models.odds_snapshot import OddsSnapshot
 from app.models.sport import Sport
+from app.services.change_feed import ODDS_FEED, next_change_seq
+from app.services.event_hub import ODDS_CHANNEL, notify_changes
+from app.services.odds_board import diff_current_odds, prune_current_odds, remove_quotes, upsert_current_odds
 from app.services.polling_scheduler import scheduler
 from app.utils.odds_math import american_to_implied_prob, remove_vig
 
 
 logger = logging.getLogger(__name__)
 
+# Games stay on the live board this long after their start time.
+BOARD_RETENTION = timedelta(hours=6)
+
 SUPPORTED_GAME_SPORTS = {
     "basketball_nba",
     "americanfootball_nfl",
@@ -56,20 +62,25 @@ async def fetch_odds_adaptive(client: OddsAPIClient, session: AsyncSession) -> t
     for sport in sports:
         if sport.key not in SUPPORTED_GAME_SPORTS:
             continue
+        bookmakers = scheduler.poll_bookmakers()
         try:
-            result = await client.get_odds(sport=sport.key, bookmakers=scheduler.poll_bookmakers())
+            result = await client.get_odds(sport=sport.key, bookmakers=bookmakers)
         except Exception:
             logger.exception("Failed to fetch odds for sport %s", sport.key)
             continue
         scheduler.update_quota(result.requests_remaining)
         total_games += len(result.data)
-        total_snapshots += await _store_odds_payload(session, sport.id, sport.key, result.data)
+        total_snapshots += await _store_odds_payload(session, sport.id, sport.key, result.data, bookmakers)
     return total_games, total_snapshots
 
 
-async def _store_odds_payload(session: AsyncSession, sport_id: int, sport_key: str, payload: list[dict]) -> int:
+async def _store_odds_payload(
+    session: AsyncSession, sport_id: int, sport_key: str, payload: list[dict], bookmakers: str | None = None
+) -> int:
     now = datetime.now(UTC)
     inserted = 0
+    board_rows: list[dict] = []
+    changed: list[dict] = []
     for game_data in payload:
         commence = datetime.fromisoformat(game_data["commence_time"].replace("Z", "+00:00"))
         game = await session.scalar(select(Game).where(Game.external_id == game_data["id"]))
@@ -95,6 +106,23 @@ async def _store_odds_payload(session: AsyncSession, sport_id: int, sport_key: s
                     side = outcome.get("name", "unknown").lower()
                     odds = int(outcome.get("price", 0))
                     line = outcome.get("point")
+                    board_rows.append(
+                        {
+                            "game_id": game.id,
+                            "sport_key": sport_key,
+                            "home_team": game.home_team,
+                            "away_team": game.away_team,
+                            "commence_time": commence,
+                            "bookmaker": bookmaker["key"],
+                            "market": market["key"],
+                            "side": side,
+                            "line": line,
+                            "odds": odds,
+                            "implied_prob": implied,
+                            "no_vig_prob": no_vig,
+                            "updated_at": now,
+                        }
+                    )
                     existing_stmt: Select[tuple[OddsSnapshot]] = (
                         select(OddsSnapshot)
                         .where(
@@ -127,5 +155,19 @@ async def _store_odds_payload(session: AsyncSession, sport_id: int, sport_key: s
                     )
                     session.add(snapshot)
                     inserted += 1
+                    changed.append(board_rows[-1])
+    # Games past the retention window stay off the board even while the feed still lists them.
+    board_cutoff = now - BOARD_RETENTION
+    board_rows = [row for row in board_rows if row["commence_time"] >= board_cutoff]
+    change_seq = 0
+    if board_rows:
+        stale, listed = await diff_current_odds(session, board_rows, bookmakers.split(",") if bookmakers else None)
+        # A poll where nothing moved, dropped or came back leaves the odds cursor, and the board's clients, alone.
+        if changed or stale or listed:
+            change_seq = await next_change_seq(session, ODDS_FEED)
+        await remove_quotes(session, stale, change_seq)
+        await upsert_current_odds(session, board_rows, change_seq)
+    await prune_current_odds(session, board_cutoff, change_seq)
+    await notify_changes(session, ODDS_CHANNEL, changed)
     await session.commit()
     return inserted
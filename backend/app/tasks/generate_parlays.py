@@ -3,7 +3,7 @@ from __future__ import annotations
 from sqlalchemy import text
 
 from app.database import AsyncSessionLocal
-from app.services.parlay_service import generate_daily_parlays
+from app.services.parlay_service import generate_daily_parlays, refresh_parlays
 
 ADVISORY_LOCK_KEY = 927411
 
@@ -19,3 +19,15 @@ async def run_generate_parlays() -> int:
         finally:
             await session.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": ADVISORY_LOCK_KEY})
             await session.commit()
+
+
+async def run_refresh_parlays() -> dict[str, int]:
+    async with AsyncSessionLocal() as session:
+        lock = await session.scalar(text("SELECT pg_try_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEY})
+        if not lock:
+            return {"levels_refreshed": 0, "kept": 0, "inserted": 0, "deleted": 0}
+        try:
+            return await refresh_parlays(session)
+        finally:
+            await session.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": ADVISORY_LOCK_KEY})
+            await session.commit()
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from sqlalchemy import text
+
+from app.data_providers.nba_stats import NBAStatsClient
+from app.database import AsyncSessionLocal
+from app.services.prediction_service import refresh_model_predictions
+
+ADVISORY_LOCK_KEY = 927415
+
+
+async def run_refresh_model_predictions(nba_client: NBAStatsClient) -> dict[str, int]:
+    async with AsyncSessionLocal() as session:
+        lock = await session.scalar(text("SELECT pg_try_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEY})
+        if not lock:
+            return {"written": 0, "unchanged": 0, "skipped": 0}
+        try:
+            return await refresh_model_predictions(session, nba_client)
+        finally:
+            await session.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": ADVISORY_LOCK_KEY})
+            await session.commit()
@@ -6,6 +6,7 @@ from app.data_providers.odds_api import OddsAPIClient
 from app.database import AsyncSessionLocal
 from app.services.clv_service import calculate_all_pending_clv
 from app.services.parlay_settlement import settle_parlays
+from app.services.performance_service import update_performance_rollups
 from app.services.settlement_service import settle_picks
 from app.tasks.capture_closing_lines import capture_closing_lines
 from app.tasks.fetch_results import fetch_game_results
@@ -24,19 +25,22 @@ async def run_settlement_pipeline() -> dict:
                 "picks_settled": 0,
                 "clv_calculated": 0,
                 "parlays_settled": 0,
+                "picks_rolled_up": 0,
             }
         try:
             games_updated = await fetch_game_results(client, session)
             closing_marked = await capture_closing_lines(session)
             picks_result = await settle_picks(session)
             clv_updated = await calculate_all_pending_clv(session)
-            parlay_result = await settle_parlays(session)
+            parlay_result = await settle_parlays(session, picks_result["pick_ids"])
+            rolled_up = await update_performance_rollups(session, picks_result["pick_ids"])
             return {
                 "games_updated": games_updated,
                 "closing_lines_marked": closing_marked,
                 "picks_settled": picks_result["settled"],
                 "clv_calculated": clv_updated,
                 "parlays_settled": parlay_result["settled"],
+                "picks_rolled_up": rolled_up,
             }
         finally:
             await session.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": ADVISORY_LOCK_KEY})
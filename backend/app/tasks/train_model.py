@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 import os
 import pickle
@@ -11,56 +10,50 @@ from typing import Any
 import numpy as np
 from sqlalchemy import and_, select
 
-from app.data_providers.nba_stats import NBAStatsClient, TEAM_STATS_CACHE_PATH
+from app.data_providers.nba_stats import NBAStatsClient
+from app.data_providers.nba_response_cache import season_for_date
+from app.data_providers.team_stats_store import team_stats_versions, write_team_stats
 from app.database import AsyncSessionLocal
 from app.ml.features import build_game_features, features_to_array
 from app.ml.model import predictor
 from app.models.game import Game
 from app.models.sport import Sport
+from app.tasks.refresh_predictions import run_refresh_model_predictions
 
 CACHE_PATH = os.environ.get("TRAINING_CACHE_PATH", "/app/models/nba_training_cache.pkl")
 logger = logging.getLogger(__name__)
 
-def _write_team_stats_cache(season: int, stats: list[dict[str, Any]]) -> None:
-    if not stats:
-        return
 
-    team_stats_by_name: dict[str, dict[str, Any]] = {}
-    for team_stats in stats:
-        team_name = str(team_stats.get("team_name", "")).strip()
-        if not team_name:
-            continue
-        team_stats_by_name[team_name] = team_stats
-
-    if not team_stats_by_name:
-        return
-
-    os.makedirs(os.path.dirname(TEAM_STATS_CACHE_PATH), exist_ok=True)
-
-    with open(TEAM_STATS_CACHE_PATH, "w", encoding="utf-8") as file:
-        json.dump(team_stats_by_name, file)
-
-    logger.info("Saved team stats cache with %s teams", len(team_stats_by_name))
+def _load_training_cache(seasons: list[int], stats_versions: dict[int, str | None]) -> tuple[np.ndarray, np.ndarray] | None:
+    if not os.path.exists(CACHE_PATH):
+        return None
+    with open(CACHE_PATH, "rb") as file:
+        cached = pickle.load(file)
+    if cached.get("seasons") != seasons or cached.get("team_stats_versions") != stats_versions:
+        logger.info("Training cache at %s was built from other team stats; rebuilding", CACHE_PATH)
+        return None
+    logger.info("Loading cached training data from %s", CACHE_PATH)
+    return np.array(cached["X"]), np.array(cached["y"])
 
 
 async def collect_training_data(
     nba_client: NBAStatsClient,
-    seasons: list[int] = [2024, 2025],
+    seasons: list[int] | None = None,
 ) -> tuple[np.ndarray, np.ndarray]:
+    # The last completed season plus the one in progress, whose stats predictions read.
+    seasons = seasons or [season_for_date() - 1, season_for_date()]
     os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
-    if os.path.exists(CACHE_PATH):
-        logger.info("Loading cached training data from %s", CACHE_PATH)
-        with open(CACHE_PATH, "rb") as file:
-            cached = pickle.load(file)
-        return np.array(cached["X"]), np.array(cached["y"])
+    for season in seasons:
+        write_team_stats(season, await nba_client.get_team_stats(season, use_cache=False))
+    stats_versions = team_stats_versions(seasons)
+
+    cached = _load_training_cache(seasons, stats_versions)
+    if cached is not None:
+        return cached
 
     X: list[list[float]] = []
     y: list[int] = []
 
-    for season in seasons:
-        season_stats = await nba_client.get_team_stats(season, use_cache=False)
-        _write_team_stats_cache(season, season_stats)
-
     async with AsyncSessionLocal() as session:
         nba_sport = await session.scalar(select(Sport).where(Sport.key == "basketball_nba"))
         if nba_sport is not None:
@@ -144,7 +137,16 @@ async def collect_training_data(
 
     logger.info("Collected %s total samples", len(X))
     with open(CACHE_PATH, "wb") as file:
-        pickle.dump({"X": X, "y": y, "cached_at": datetime.now(UTC).isoformat()}, file)
+        pickle.dump(
+            {
+                "X": X,
+                "y": y,
+                "seasons": seasons,
+                "team_stats_versions": stats_versions,
+                "cached_at": datetime.now(UTC).isoformat(),
+            },
+            file,
+        )
 
     return np.array(X), np.array(y)
 
@@ -169,3 +171,7 @@ async def run_model_training(nba_client: NBAStatsClient) -> dict:
 async def run_model_training_background(nba_client: NBAStatsClient) -> None:
     result = await run_model_training(nba_client)
     logger.info("Background training finished with status=%s", result.get("status"))
+    if result.get("status") == "trained":
+        # Store predictions from the new model now instead of waiting for the worker's next refresh.
+        summary = await run_refresh_model_predictions(nba_client)
+        logger.info("Post-training prediction refresh: written=%s skipped=%s", summary["written"], summary["skipped"])
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson-encoded JSON for plain rows built from trusted ORM data.
+
+    Returning it bypasses response-model validation. OPT_UTC_Z keeps UTC timestamps in the
+    same "Z" form pydantic emits, so clients see identical payloads.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+
+def fast_json(content: Any, response: Response) -> FastJSONResponse:
+    # A returned Response replaces the injected one, so carry over the headers set on it
+    # (ETags, pagination cursors).
+    return FastJSONResponse(content, headers=dict(response.headers))
@@ -7,17 +7,25 @@ from sqlalchemy import select, text
 from sqlalchemy.exc import ProgrammingError
 
 from app.config import get_database_identity, settings
-from app.data_providers.nba_stats import NBAStatsClient
+from app.data_providers.nba_response_cache import season_for_date
+from app.data_providers.nba_stats import get_nba_client
 from app.data_providers.odds_api import OddsAPIClient
+from app.data_providers.team_stats_store import migrate_legacy_team_stats
 from app.database import AsyncSessionLocal
 from app.models.game import Game
 from app.models.odds_snapshot import OddsSnapshot
 from app.models.sport import Sport
+from app.services.bankroll_service import backfill_bankroll_ledger
+from app.services.ingestion_status import record_ingestion_cycle
+from app.services.parlay_service import shutdown_process_pool
+from app.services.parlay_settlement import settle_parlays
+from app.services.performance_service import update_performance_rollups
 from app.services.polling_scheduler import scheduler
 from app.tasks.capture_closing_lines import capture_closing_lines
 from app.tasks.fetch_odds import fetch_odds_adaptive, sync_sports
-from app.tasks.generate_parlays import run_generate_parlays
+from app.tasks.generate_parlays import run_generate_parlays, run_refresh_parlays
 from app.tasks.generate_picks import run_generate_picks
+from app.tasks.refresh_predictions import run_refresh_model_predictions
 from app.tasks.settle import run_settlement_pipeline
 from app.tasks.train_model import run_model_training
 from app.tasks.update_pick_clv import run_update_pick_clv
@@ -25,7 +33,7 @@ from app.tasks.update_pick_clv import run_update_pick_clv
 logger = logging.getLogger(__name__)
 
 client = OddsAPIClient()
-nba_client = NBAStatsClient()
+nba_client = get_nba_client()
 _missing_odds_key_logged = False
 
 
@@ -67,8 +75,26 @@ async def check_daily_schedule() -> None:
 
 async def startup_sync() -> None:
     await wait_for_required_tables()
+    migrate_legacy_team_stats(season_for_date())
     async with AsyncSessionLocal() as session:
         await sync_sports(client, session)
+        recorded = await backfill_bankroll_ledger(session)
+        if recorded:
+            logger.info("bankroll ledger backfill complete: entries_recorded=%s", recorded)
+        rolled_up = await update_performance_rollups(session)
+        if rolled_up:
+            logger.info("performance rollup backfill complete: picks_rolled_up=%s", rolled_up)
+        parlays = await settle_parlays(session)
+        if parlays["settled"]:
+            logger.info("pending parlay sweep complete: parlays_settled=%s", parlays["settled"])
+
+
+async def record_cycle(status: str, games_fetched: int = 0, snapshots_inserted: int = 0) -> None:
+    try:
+        async with AsyncSessionLocal() as session:
+            await record_ingestion_cycle(session, status, games_fetched, snapshots_inserted)
+    except Exception:
+        logger.exception("failed to record ingestion status")
 
 
 async def run_fetch_odds() -> None:
@@ -80,6 +106,7 @@ async def run_fetch_odds() -> None:
             logger.error("ODDS_API_KEY is missing; skipping ingestion cycle until it is configured")
             _missing_odds_key_logged = True
         logger.info("odds polling cycle skipped: games_fetched=0 snapshots_inserted=0 sample_game_id=None next_sleep_seconds=%s", sleep_seconds)
+        await record_cycle("skipped")
         return
 
     _missing_odds_key_logged = False
@@ -96,6 +123,7 @@ async def run_fetch_odds() -> None:
             "odds polling cycle failed: games_fetched=0 snapshots_inserted=0 sample_game_id=None next_sleep_seconds=%s",
             sleep_seconds,
         )
+        await record_cycle("failed")
         await asyncio.sleep(sleep_seconds)
         return
 
@@ -106,6 +134,7 @@ async def run_fetch_odds() -> None:
         sample_game_id,
         sleep_seconds,
     )
+    await record_cycle("ok", games_fetched, snapshots_inserted)
 
     if snapshots_inserted > 0:
         await run_generate_picks_task()
@@ -115,7 +144,19 @@ async def run_fetch_odds() -> None:
 
 
 async def run_model_training_task() -> None:
-    await run_model_training(nba_client)
+    result = await run_model_training(nba_client)
+    if result.get("status") == "trained":
+        await run_refresh_model_predictions_task()
+
+
+async def run_refresh_model_predictions_task() -> None:
+    summary = await run_refresh_model_predictions(nba_client)
+    logger.info(
+        "model prediction refresh complete: written=%s unchanged=%s skipped=%s",
+        summary["written"],
+        summary["unchanged"],
+        summary["skipped"],
+    )
 
 
 async def run_generate_picks_task() -> None:
@@ -126,6 +167,15 @@ async def run_generate_picks_task() -> None:
         summary.get("picks_updated", 0),
         summary.get("picks_skipped_no_model", 0),
     )
+    if summary.get("picks_created", 0) or summary.get("picks_updated", 0):
+        refreshed = await run_refresh_parlays()
+        logger.info(
+            "parlay refresh complete: levels_refreshed=%s kept=%s inserted=%s deleted=%s",
+            refreshed["levels_refreshed"],
+            refreshed["kept"],
+            refreshed["inserted"],
+            refreshed["deleted"],
+        )
 
 
 async def run_update_pick_clv_task() -> None:
@@ -165,6 +215,7 @@ async def main() -> None:
 
     await startup_sync()
     await check_daily_schedule()
+    await run_refresh_model_predictions_task()
     try:
         await run_fetch_odds()
     except ProgrammingError:
@@ -177,12 +228,17 @@ async def main() -> None:
     sched.add_job(run_update_pick_clv_task, "interval", minutes=5)
     sched.add_job(run_settlement_pipeline_task, "interval", minutes=30)
     sched.add_job(run_model_training_task, "cron", day_of_week="sun", hour=8, minute=0)
+    sched.add_job(run_refresh_model_predictions_task, "interval", minutes=15)
     sched.add_job(run_generate_picks_task, "interval", minutes=5)
     sched.add_job(run_generate_parlays_task, "cron", hour=13, minute=15)
     sched.start()
 
-    while True:
-        await asyncio.sleep(3600)
+    try:
+        while True:
+            await asyncio.sleep(3600)
+    finally:
+        sched.shutdown(wait=False)
+        shutdown_process_pool()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import Base
+from app.models.bankroll_entry import BankrollEntry
+from app.models.game import Game
+from app.models.pick import Pick
+from app.models.sport import Sport
+from app.services.bankroll_service import (
+    DEFAULT_STARTING_BANKROLL,
+    backfill_bankroll_ledger,
+    get_bankroll_history,
+    get_current_bankroll,
+    get_kelly_suggestions,
+)
+from app.services.settlement_service import settle_picks
+
+
+def test_settlement_appends_ledger_entries() -> None:
+    if importlib.util.find_spec("aiosqlite") is None:
+        pytest.skip("aiosqlite not available in this environment")
+    asyncio.run(_run_ledger())
+
+
+def _pick(game_id: int, side: str, kelly: float, outcome: str | None = None, profit: float | None = None) -> Pick:
+    now = datetime.now(UTC)
+    return Pick(
+        game_id=game_id,
+        sport_key="basketball_nba",
+        pick_date=now,
+        pick_day=now.date(),
+        market="h2h",
+        side=side,
+        odds_american=100,
+        best_book="book_a",
+        ev_pct=0.03,
+        suggested_kelly_fraction=kelly,
+        outcome=outcome,
+        profit_loss=profit,
+    )
+
+
+async def _run_ledger() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with session_factory() as session:
+        sport = Sport(key="basketball_nba", name="NBA", active=True)
+        session.add(sport)
+        await session.flush()
+        finished = Game(
+            external_id="g1",
+            sport_id=sport.id,
+            home_team="Home",
+            away_team="Away",
+            commence_time=datetime.now(UTC),
+            completed=True,
+            home_score=101,
+            away_score=99,
+        )
+        upcoming = Game(external_id="g2", sport_id=sport.id, home_team="H2", away_team="A2", commence_time=datetime.now(UTC))
+        session.add_all([finished, upcoming])
+        await session.flush()
+
+        legacy = _pick(upcoming.id, "A2", 0.05, outcome="loss", profit=-0.05)
+        legacy.settled_at = datetime.now(UTC) - timedelta(days=2)
+        session.add_all([legacy, _pick(finished.id, "Home", 0.02), _pick(finished.id, "Away", 0.03), _pick(upcoming.id, "H2", 0.04)])
+        await session.commit()
+
+        assert await get_current_bankroll(session) == {
+            "starting_balance": DEFAULT_STARTING_BANKROLL,
+            "current_balance": DEFAULT_STARTING_BANKROLL,
+            "total_wagered": 0.0,
+            "total_profit": 0.0,
+            "roi_pct": 0.0,
+            "num_bets": 0,
+        }
+        assert await backfill_bankroll_ledger(session) == 1
+        assert await backfill_bankroll_ledger(session) == 0
+
+        result = await settle_picks(session)
+        assert result["settled"] == 2
+        stamped = await session.scalars(select(Pick.change_seq).where(Pick.id.in_(result["pick_ids"])))
+        assert set(stamped) == {2}  # the backfill took seq 1
+
+        entries = (await session.scalars(select(BankrollEntry).order_by(BankrollEntry.id))).all()
+        assert [e.bets_after for e in entries] == [1, 2, 3]
+        assert entries[-1].balance_after == pytest.approx(DEFAULT_STARTING_BANKROLL - 0.05 + 0.02 - 0.03)
+
+        current = await get_current_bankroll(session)
+        assert current["num_bets"] == 3
+        assert current["total_wagered"] == pytest.approx(0.10)
+        assert current["total_profit"] == pytest.approx(-0.06)
+
+        history = await get_bankroll_history(session, days=1)
+        assert len(history) == 1 and history[0]["balance"] == pytest.approx(current["current_balance"])
+        # The backfilled entry keeps its settlement date instead of the backfill date.
+        history = await get_bankroll_history(session, days=5)
+        assert [h["date"] for h in history] == [str(legacy.settled_at.date()), str(datetime.now(UTC).date())]
+        assert history[0]["balance"] == pytest.approx(DEFAULT_STARTING_BANKROLL - 0.05)
+
+        suggestions = await get_kelly_suggestions(session)
+        assert len(suggestions) == 4
+        assert {s["game"] for s in suggestions} == {"Away vs Home", "A2 vs H2"}
+        assert all(s["current_bankroll"] == pytest.approx(current["current_balance"]) for s in suggestions)
+
+    await engine.dispose()
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import json
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fastapi import Response
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.api.v1.parlays import parlay_history
+from app.api.v1.picks import get_pick_history
+from app.database import Base
+from app.models.game import Game
+from app.models.parlay import Parlay, ParlayLeg
+from app.models.pick import Pick
+from app.models.sport import Sport
+from app.schemas.picks import PickResponse, PickSummaryResponse
+
+
+def test_pick_and_parlay_history_use_a_fixed_number_of_queries() -> None:
+    if importlib.util.find_spec("aiosqlite") is None:
+        pytest.skip("aiosqlite not available in this environment")
+    asyncio.run(_run_bulk_serialization())
+
+
+async def _pick_history(session: AsyncSession, *, lean: bool, limit: int = 50) -> tuple[list[dict], Response]:
+    response = await get_pick_history(
+        Response(),
+        sport=None,
+        market=None,
+        confidence=None,
+        start_date=None,
+        end_date=None,
+        limit=limit,
+        cursor=None,
+        lean=lean,
+        session=session,
+    )
+    return json.loads(response.body), response
+
+
+async def _parlay_history(session: AsyncSession) -> list[dict]:
+    response = await parlay_history(
+        Response(), risk_level=None, start_date=None, end_date=None, limit=50, cursor=None, session=session
+    )
+    return json.loads(response.body)
+
+
+async def _run_bulk_serialization() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    statements: list[str] = []
+
+    def count(conn, cursor, statement, parameters, context, executemany) -> None:
+        statements.append(statement)
+
+    async with session_factory() as session:
+        sport = Sport(key="basketball_nba", name="NBA", active=True)
+        session.add(sport)
+        await session.flush()
+        base = datetime(2026, 3, 1, tzinfo=UTC)
+        games = [
+            Game(external_id=f"g{i}", sport_id=sport.id, home_team=f"H{i}", away_team=f"A{i}", commence_time=base)
+            for i in range(12)
+        ]
+        session.add_all(games)
+        await session.flush()
+        picks = [
+            Pick(
+                game_id=games[i % len(games)].id,
+                sport_key="basketball_nba",
+                pick_date=base,
+                pick_day=base.date(),
+                market="h2h",
+                side=f"H{i % len(games)}",
+                odds_american=100 + i,
+                best_book="book_a",
+                fair_prob=0.55,
+                composite_score=0.4,
+                signals={"model": 0.1},
+                outcome="pending",
+                created_at=base + timedelta(minutes=i),
+            )
+            for i in range(12)
+        ]
+        session.add_all(picks)
+        await session.flush()
+        for i in range(4):
+            parlay = Parlay(
+                risk_level="moderate",
+                num_legs=3,
+                combined_odds_american=500 + i,
+                combined_odds_decimal=6.0,
+                combined_ev_pct=0.1,
+                combined_fair_prob=0.2,
+                correlation_score=0.1,
+                suggested_kelly_fraction=0.01,
+                pick_date=base.date(),
+                outcome="pending",
+                created_at=base + timedelta(minutes=i),
+            )
+            session.add(parlay)
+            await session.flush()
+            session.add_all(
+                [ParlayLeg(parlay_id=parlay.id, pick_id=picks[3 * i + j].id, leg_order=j + 1) for j in range(3)]
+            )
+        await session.commit()
+        session.expunge_all()
+
+        event.listen(engine.sync_engine, "before_cursor_execute", count)
+
+        rows, _ = await _pick_history(session, lean=False)
+        assert len(statements) == 1
+        assert len(rows) == 12
+        assert rows[0]["home_team"] == "H11" and rows[0]["signals"] == {"model": 0.1}
+        assert list(rows[0]) == list(PickResponse.model_fields)
+
+        statements.clear()
+        session.expunge_all()
+        lean_rows, response = await _pick_history(session, lean=True, limit=5)
+        assert len(statements) == 1
+        assert len(lean_rows) == 5 and "X-Next-Cursor" in response.headers
+        assert list(lean_rows[0]) == list(PickSummaryResponse.model_fields)
+        for legacy in ("fair_prob", "prob_source", "implied_prob", "composite_score", "signals", "data_quality"):
+            assert legacy not in lean_rows[0]
+        assert "fair_prob" not in statements[0] and "signals" not in statements[0]
+
+        statements.clear()
+        session.expunge_all()
+        parlays = await _parlay_history(session)
+        # one query for the page, one for every leg with its pick and game
+        assert len(statements) == 2
+        assert [p["combined_odds_american"] for p in parlays] == [503, 502, 501, 500]
+        assert [leg["pick"]["side"] for leg in parlays[0]["legs"]] == ["H9", "H10", "H11"]
+
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+    await engine.dispose()
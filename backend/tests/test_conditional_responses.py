@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.api.v1.conditional import data_version_etag
+from app.database import Base, get_session
+from app.services.change_feed import ODDS_FEED, next_change_seq
+
+
+def test_etag_short_circuits_until_data_changes() -> None:
+    if importlib.util.find_spec("aiosqlite") is None:
+        pytest.skip("aiosqlite not available in this environment")
+    asyncio.run(_run_conditional())
+
+
+async def _run_conditional() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    calls = []
+    app = FastAPI()
+
+    @app.get("/summary", dependencies=[Depends(data_version_etag)])
+    async def summary() -> dict:
+        calls.append(1)
+        return {"ok": True}
+
+    async def override_session():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_session
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        first = await client.get("/summary")
+        etag = first.headers["etag"]
+        assert first.status_code == 200 and first.headers["cache-control"] == "no-cache"
+
+        cached = await client.get("/summary", headers={"If-None-Match": f"W/{etag}"})
+        assert cached.status_code == 304 and cached.headers["etag"] == etag
+        assert len(calls) == 1
+        assert (await client.get("/summary?sport_key=nba", headers={"If-None-Match": etag})).status_code == 200
+
+        # Odds polls have their own cursor and leave the tag alone.
+        async with session_factory() as session:
+            await next_change_seq(session, ODDS_FEED)
+            await session.commit()
+        assert (await client.get("/summary", headers={"If-None-Match": etag})).status_code == 304
+
+        async with session_factory() as session:
+            await next_change_seq(session)
+            await session.commit()
+        changed = await client.get("/summary", headers={"If-None-Match": etag})
+        assert changed.status_code == 200 and changed.headers["etag"] != etag
+        assert len(calls) == 3
+
+    await engine.dispose()
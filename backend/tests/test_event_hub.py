@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+from app.services.event_hub import NOTIFY_PAYLOAD_LIMIT, ChangeListener, EventHub, _notify_payloads, sse_events
+
+
+def test_hub_fans_out_and_drops_oldest_for_slow_subscribers() -> None:
+    async def scenario() -> None:
+        hub = EventHub(queue_size=2)
+        async with hub.subscribe("odds") as fast, hub.subscribe("odds") as slow:
+            hub.publish("odds", [1])
+            assert await fast.get() == [1]
+            hub.publish("odds", [2])
+            hub.publish("odds", [3])
+            hub.publish("odds", [])
+            assert [slow.get_nowait(), slow.get_nowait()] == [[2], [3]]
+            assert hub.subscriber_count("odds") == 2
+        assert hub.subscriber_count("odds") == 0
+
+    asyncio.run(scenario())
+
+
+def test_notify_payloads_stay_under_the_postgres_limit() -> None:
+    items = [{"game_id": i, "bookmaker": "book", "side": "x" * 100} for i in range(300)]
+    payloads = _notify_payloads(items)
+    assert len(payloads) > 1
+    assert all(len(p) <= NOTIFY_PAYLOAD_LIMIT for p in payloads)
+    assert [item for p in payloads for item in json.loads(p)] == items
+
+
+def test_listener_loads_once_and_sse_filters_per_client() -> None:
+    async def scenario() -> list[str]:
+        hub = EventHub()
+        loads: list[list[int]] = []
+
+        async def loader(ids: list[int]) -> list[dict]:
+            loads.append(ids)
+            return [{"id": i, "sport_key": "basketball_nba" if i % 2 else "icehockey_nhl"} for i in ids]
+
+        listener = ChangeListener(None, hub, {"picks": loader})
+        await listener.dispatch("picks", "[1]")  # nobody listening yet
+        disconnected = False
+
+        async def is_disconnected() -> bool:
+            return disconnected
+
+        events = sse_events("picks", "picks", is_disconnected, lambda p: p["sport_key"] == "basketball_nba", hub)
+        received = [await anext(events)]
+        await listener.dispatch("picks", "[2, 3, 4]")
+        received.append(await anext(events))
+        disconnected = True
+        await events.aclose()
+        assert loads == [[2, 3, 4]]
+        return received
+
+    connected, event = asyncio.run(scenario())
+    assert connected == ": connected\n\n"
+    assert event == 'event: picks\ndata: [{"id": 3, "sport_key": "basketball_nba"}]\n\n'
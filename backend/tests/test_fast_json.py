@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import json
+from datetime import UTC, date, datetime
+
+from pydantic import TypeAdapter
+
+from app.models.pick import Pick
+from app.schemas.picks import PickResponse, PickSummaryResponse, pick_row
+from app.utils.responses import FastJSONResponse
+
+
+def _pick(pick_id: int) -> Pick:
+    created = datetime(2026, 10, 19, 12, 30, 15, 250000, tzinfo=UTC)
+    return Pick(
+        id=pick_id,
+        game_id=7,
+        sport_key="basketball_nba",
+        pick_date=created,
+        pick_day=date(2026, 10, 19),
+        market="spreads",
+        side="boston celtics",
+        line=-3.5,
+        odds_american=-110,
+        best_book="book_a",
+        issued_at=created,
+        snapshot_time_open=created,
+        model_prob=0.55,
+        ev_pct=0.031,
+        book_count=4,
+        status="open",
+        confidence_tier="high",
+        suggested_kelly_fraction=0.02,
+        outcome=None,
+        market_clv=None,
+        book_clv=0.004,
+        fair_prob=0.55,
+        prob_source="model_provider",
+        signals={"model_driven": True},
+        data_quality={"lookback_minutes": 60},
+        created_at=created,
+    )
+
+
+def test_fast_rows_encode_like_validated_models() -> None:
+    commence = datetime(2026, 10, 20, 0, 0, tzinfo=UTC)
+    for lean, model in ((False, PickResponse), (True, PickSummaryResponse)):
+        rows = [pick_row(_pick(i), "Boston Celtics", "Miami Heat", commence, lean) for i in range(3)]
+        validated = TypeAdapter(list[model]).dump_json([model(**row) for row in rows])
+        fast = FastJSONResponse(rows).body
+        assert json.loads(fast) == json.loads(validated)
+        assert list(json.loads(fast)[0]) == list(model.model_fields)
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import json
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import Base
+from app.models.game import Game
+from app.models.parlay import Parlay, ParlayLeg
+from app.models.pick import Pick
+from app.models.sport import Sport
+from app.services import export_service
+from app.services.export_service import (
+    PARLAY_EXPORT_FIELDS,
+    encode_rows,
+    pick_export_statement,
+    stream_parlays,
+    stream_picks,
+)
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_page
+
+
+def test_cursor_round_trip() -> None:
+    created_at = datetime(2026, 3, 1, 12, 30, 5, 123456, tzinfo=UTC)
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_keyset_pages_and_streaming_export(monkeypatch: pytest.MonkeyPatch) -> None:
+    if importlib.util.find_spec("aiosqlite") is None:
+        pytest.skip("aiosqlite not available in this environment")
+    monkeypatch.setattr(export_service, "EXPORT_BATCH_SIZE", 2)
+    asyncio.run(_run_history_export())
+
+
+async def _collect(chunks) -> str:
+    return "".join([chunk async for chunk in chunks])
+
+
+async def _run_history_export() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with session_factory() as session:
+        sport = Sport(key="basketball_nba", name="NBA", active=True)
+        session.add(sport)
+        await session.flush()
+        game = Game(external_id="g1", sport_id=sport.id, home_team="H", away_team="A", commence_time=datetime.now(UTC))
+        session.add(game)
+        await session.flush()
+
+        base = datetime(2026, 3, 1, tzinfo=UTC)
+        picks = [
+            Pick(
+                game_id=game.id,
+                sport_key="basketball_nba",
+                pick_date=base,
+                pick_day=base.date(),
+                market="h2h",
+                side=f"side{i}",
+                odds_american=100,
+                best_book="book_a",
+                outcome="pending",
+                # two picks share each timestamp so the id tiebreak is exercised
+                created_at=base + timedelta(minutes=i // 2),
+            )
+            for i in range(5)
+        ]
+        session.add_all(picks)
+        await session.flush()
+        parlays = []
+        for i in range(2):
+            parlay = Parlay(
+                risk_level="moderate",
+                num_legs=2,
+                combined_odds_american=300 + i,
+                combined_odds_decimal=4.0,
+                combined_ev_pct=0.1,
+                combined_fair_prob=0.3,
+                correlation_score=0.1,
+                suggested_kelly_fraction=0.01,
+                pick_date=base.date(),
+                outcome="pending",
+                created_at=base + timedelta(minutes=i),
+            )
+            session.add(parlay)
+            await session.flush()
+            session.add_all(
+                [
+                    ParlayLeg(parlay_id=parlay.id, pick_id=picks[i].id, leg_order=1),
+                    ParlayLeg(parlay_id=parlay.id, pick_id=picks[i + 2].id, leg_order=2),
+                ]
+            )
+            parlays.append(parlay.id)
+        await session.commit()
+
+        seen: list[int] = []
+        cursor = None
+        while True:
+            page = (await session.scalars(keyset_page(select(Pick), Pick.created_at, Pick.id, cursor, 2))).all()
+            seen.extend(p.id for p in page)
+            if len(page) < 2:
+                break
+            cursor = encode_cursor(page[-1].created_at, page[-1].id)
+        assert seen == [5, 4, 3, 2, 1]
+
+    ndjson = await _collect(encode_rows(stream_picks(pick_export_statement(), session_factory), "ndjson", []))
+    rows = [json.loads(line) for line in ndjson.splitlines()]
+    assert [r["id"] for r in rows] == [1, 2, 3, 4, 5]
+    assert rows[0]["home_team"] == "H" and "signals" not in rows[0]
+
+    stmt = select(Parlay).order_by(Parlay.created_at, Parlay.id)
+    csv_text = await _collect(encode_rows(stream_parlays(stmt, session_factory), "csv", PARLAY_EXPORT_FIELDS))
+    lines = csv_text.splitlines()
+    assert lines[0] == ",".join(PARLAY_EXPORT_FIELDS)
+    assert [line.split(",")[-1] for line in lines[1:]] == ["1;3", "2;4"]
+
+    empty = select(Parlay).where(Parlay.id < 0)
+    assert await _collect(encode_rows(stream_parlays(empty, session_factory), "csv", PARLAY_EXPORT_FIELDS)) == (
+        ",".join(PARLAY_EXPORT_FIELDS) + "\r\n"
+    )
+
+    await engine.dispose()
@@ -0,0 +1,58 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.analytics.joint_probability import leg_set_probability, nearest_correlation
+from app.analytics.parlay_index import ParlayLegIndex
+
+
+def _corr(n, value=0.0):
+    matrix = np.full((n, n), value, dtype=np.float32)
+    np.fill_diagonal(matrix, 1.0)
+    return matrix
+
+
+def test_independent_legs_multiply():
+    assert leg_set_probability([0.5], _corr(1)) == pytest.approx(0.5, abs=0.01)
+    assert leg_set_probability([0.5, 0.6, 0.4], _corr(3)) == pytest.approx(0.5 * 0.6 * 0.4, abs=0.01)
+    assert leg_set_probability([], _corr(0)) == 0.0
+
+
+def test_positive_correlation_raises_joint():
+    matrix = _corr(2, 0.5)
+    assert leg_set_probability([0.5, 0.5], matrix) > 0.25 + 0.05
+
+
+def test_leg_set_price_does_not_depend_on_the_rest_of_the_pool():
+    markets = [("h2h", "home"), ("spreads", "away"), ("totals", "over")]
+    legs = [
+        SimpleNamespace(
+            id=idx + 1,
+            game_id=idx // 3,
+            sport_key="basketball_nba",
+            market=markets[idx % 3][0],
+            side=markets[idx % 3][1],
+            odds_american=110,
+            fair_prob=0.45 + idx / 100,
+        )
+        for idx in range(9)
+    ]
+    small = ParlayLegIndex(legs[:4], "aggressive")
+    large = ParlayLegIndex(list(reversed(legs)), "aggressive")
+    by_id = {leg.id: pos for pos, leg in enumerate(large.legs)}
+    for combo in ([0, 3], [0, 1, 3], [1, 2, 3]):
+        expected = small.joint_probability(combo)
+        assert large.joint_probability([by_id[small.legs[i].id] for i in reversed(combo)]) == expected
+    assert small.joint_probabilities([(0, 3), (3, 0)]) == [small.joint_probability([0, 3])] * 2
+
+
+def test_contradictory_priors_are_repaired():
+    matrix = _corr(3)
+    matrix[0, 1] = matrix[1, 0] = -1.0
+    matrix[0, 2] = matrix[2, 0] = -1.0
+    matrix[1, 2] = matrix[2, 1] = -1.0
+    fixed = nearest_correlation(matrix)
+    assert np.linalg.eigvalsh(fixed).min() > 0
+    assert np.allclose(np.diag(fixed), 1.0)
+    assert leg_set_probability([0.5, 0.5], fixed[:2, :2]) < 0.25
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+from dataclasses import fields
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+pytest.importorskip("pandas")
+
+from sqlalchemy import func, select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+
+from app.database import Base  # noqa: E402
+from app.ml.features import GameFeatures  # noqa: E402
+from app.models.game import Game  # noqa: E402
+from app.models.model_prediction import ModelPrediction  # noqa: E402
+from app.models.sport import Sport  # noqa: E402
+from app.services import prediction_service  # noqa: E402
+from app.services.model_provider import model_provider  # noqa: E402
+from app.services.prediction_service import latest_predictions, refresh_model_predictions  # noqa: E402
+
+
+class _Predictor:
+    version = "v1"
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def predict_home_win_prob(self, features: list[float]) -> float:
+        self.calls += 1
+        return 0.5 + features[0] / 100
+
+    def reload_if_changed(self) -> bool:
+        return False
+
+
+class _NBAClient:
+    async def get_team_stats(self, season: int, use_cache: bool = False) -> list[dict]:
+        return [{"team_name": "stub"}]
+
+
+def test_predictions_are_written_once_per_feature_set_and_model_version(monkeypatch) -> None:
+    if importlib.util.find_spec("aiosqlite") is None:
+        pytest.skip("aiosqlite not available in this environment")
+    asyncio.run(_run_predictions(monkeypatch))
+
+
+async def _run_predictions(monkeypatch) -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    predictor = _Predictor()
+    rating = {"value": 5.0}
+
+    async def build_features(home_team, away_team, game_date, nba_client) -> GameFeatures:
+        return GameFeatures(**{f.name: rating["value"] for f in fields(GameFeatures) if f.name != "is_home"})
+
+    monkeypatch.setattr(prediction_service, "predictor", predictor)
+    monkeypatch.setattr(prediction_service, "build_game_features", build_features)
+
+    async with session_factory() as session:
+        sport = Sport(key="basketball_nba", name="NBA", active=True)
+        session.add(sport)
+        await session.flush()
+        game = Game(
+            external_id="g1",
+            sport_id=sport.id,
+            home_team="Boston Celtics",
+            away_team="Miami Heat",
+            commence_time=datetime.now(UTC) + timedelta(hours=3),
+        )
+        session.add(game)
+        await session.commit()
+
+        assert await refresh_model_predictions(session, _NBAClient()) == {"written": 1, "unchanged": 0, "skipped": 0}
+        assert await refresh_model_predictions(session, _NBAClient()) == {"written": 0, "unchanged": 1, "skipped": 0}
+        assert predictor.calls == 1
+
+        rating["value"] = 10.0
+        assert (await refresh_model_predictions(session, _NBAClient()))["written"] == 1
+        latest = (await latest_predictions(session, [game.id]))[game.id]
+        assert latest.home_win_prob == pytest.approx(0.6)
+
+        predictor.version = "v2"
+        assert (await refresh_model_predictions(session, _NBAClient()))["written"] == 1
+        assert await session.scalar(select(func.count()).select_from(ModelPrediction)) == 3
+
+        home = await model_provider.get_true_prob(
+            session=session, sport_key="basketball_nba", game=game, market="h2h", side="Boston Celtics", line=None
+        )
+        away = await model_provider.get_true_prob(
+            session=session, sport_key="basketball_nba", game=game, market="h2h", side="Miami Heat", line=None
+        )
+        assert (home, away) == (pytest.approx(0.6), pytest.approx(0.4))
+
+        # Reads follow the newest stored version, not this process's model.
+        predictor.version = None
+        assert (await latest_predictions(session, [game.id]))[game.id].model_version == "v2"
+        assert (await latest_predictions(session, [game.id], model_version="v1"))[game.id].model_version == "v1"
+
+    await engine.dispose()
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("nba_api")
+
+from nba_api.stats.endpoints._base import Endpoint  # noqa: E402
+
+from app.data_providers import nba_stats  # noqa: E402
+from app.data_providers.nba_response_cache import NBAResponseCache, season_for_date  # noqa: E402
+from app.data_providers.nba_stats import NBAStatsClient, SeasonCache, get_nba_client  # noqa: E402
+
+
+def test_season_cache_evicts_least_recently_used_season() -> None:
+    cache = SeasonCache(max_seasons=2)
+    cache[2023] = "a"
+    cache[2024] = "b"
+    assert cache[2023] == "a"
+    cache[2025] = "c"
+    assert 2024 not in cache
+    assert cache.keys() == [2023, 2025]
+
+
+def test_in_progress_season_expires_from_memory() -> None:
+    current = season_for_date()
+    cache = SeasonCache(max_seasons=3, current_season_ttl_s=0)
+    cache[current - 1] = "done"
+    cache[current] = "live"
+    assert current - 1 in cache
+    assert current not in cache
+    assert cache.keys() == [current - 1]
+
+    client = NBAStatsClient(response_cache=NBAResponseCache(current_season_ttl_s=0))
+    client._season_stats_cache[current] = [{"team_id": 1}]
+    assert current not in client._season_stats_cache
+
+
+def test_missing_in_progress_team_stats_are_fetched_and_stored(monkeypatch) -> None:
+    current = season_for_date()
+    written: dict[int, list] = {}
+    fetched: list[int] = []
+
+    async def fetch_team_stats(self, season: int) -> list[dict]:
+        fetched.append(season)
+        return [{"team_name": "Boston Celtics"}]
+
+    monkeypatch.setattr(NBAStatsClient, "_fetch_team_stats", fetch_team_stats)
+    monkeypatch.setattr(nba_stats, "load_team_stats", lambda season: None)
+    monkeypatch.setattr(nba_stats, "write_team_stats", lambda season, stats: written.setdefault(season, stats))
+
+    client = NBAStatsClient()
+    assert asyncio.run(client.get_team_stats(current - 1)) == []
+    assert asyncio.run(client.get_team_stats(current)) == [{"team_name": "Boston Celtics"}]
+    assert fetched == [current] and list(written) == [current]
+
+
+def test_client_reports_and_refreshes_cached_seasons() -> None:
+    client = NBAStatsClient(max_seasons=2)
+    for season in (2023, 2024, 2025):
+        client._season_games_cache[season] = pd.DataFrame({"TEAM_ID": [1, 2], "PTS": [100, 101]})
+        client._season_stats_cache[season] = [{"team_id": 1}, {"team_id": 2}]
+
+    stats = client.cache_stats()
+    assert stats["season_games"]["seasons"] == [2024, 2025]
+    assert stats["season_games"]["bytes"] > 0
+    assert stats["team_stats"] == {"seasons": [2024, 2025], "teams": 4}
+
+    client.refresh(2024)
+    assert client.cache_stats()["team_stats"]["seasons"] == [2025]
+    client.refresh()
+    assert client.cache_stats()["season_games"] == {"seasons": [], "bytes": 0}
+    assert get_nba_client() is get_nba_client()
+
+
+class _GameFinder:
+    endpoint = "leaguegamefinder"
+    calls = 0
+
+    def __init__(self, **params) -> None:
+        type(self).calls += 1
+        self.data_sets = [
+            Endpoint.DataSet(
+                {"headers": ["TEAM_ID", "GAME_DATE", "PTS"], "data": [[1, "2024-11-01", 110], [2, "2024-11-01", 104]]}
+            )
+        ]
+
+    def get_data_frames(self) -> list:
+        return [data_set.get_data_frame() for data_set in self.data_sets]
+
+
+def test_response_cache_serves_warm_processes_without_upstream_calls(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(nba_stats.leaguegamefinder, "LeagueGameFinder", _GameFinder)
+    monkeypatch.setattr(NBAStatsClient, "REQUEST_DELAY_S", 0)
+
+    def games(client: NBAStatsClient, season: int):
+        return asyncio.run(client.get_season_games_df(season))
+
+    cold = games(NBAStatsClient(response_cache=NBAResponseCache(str(tmp_path))), 2020)
+    warm = games(NBAStatsClient(response_cache=NBAResponseCache(str(tmp_path))), 2020)
+    assert _GameFinder.calls == 1
+    pd.testing.assert_frame_equal(cold, warm)
+
+    # The in-progress season expires after its TTL; completed seasons never do.
+    expired = NBAResponseCache(str(tmp_path), current_season_ttl_s=0)
+    games(NBAStatsClient(response_cache=expired), season_for_date())
+    games(NBAStatsClient(response_cache=expired), season_for_date())
+    games(NBAStatsClient(response_cache=expired), 2020)
+    assert _GameFinder.calls == 3
+    assert expired.stats()["files"] == 2
+
+    # A long-lived client drops its in-memory copy along with the expired response.
+    long_lived = NBAStatsClient(response_cache=expired)
+    games(long_lived, season_for_date())
+    games(long_lived, season_for_date())
+    assert _GameFinder.calls == 5
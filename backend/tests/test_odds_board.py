@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import Base
+from app.models.current_odds import CurrentOdds
+from app.models.odds_snapshot import OddsSnapshot
+from app.models.sport import Sport
+from app.services.change_feed import ODDS_FEED, PICKS_FEED, current_change_seq
+from app.services.odds_board import build_board, get_odds_board, prune_current_odds
+from app.tasks.fetch_odds import _store_odds_payload
+
+
+def _payload(commence: datetime, home_price: int) -> list[dict]:
+    return [
+        {
+            "id": "evt1",
+            "commence_time": commence.isoformat().replace("+00:00", "Z"),
+            "home_team": "Boston Celtics",
+            "away_team": "Miami Heat",
+            "bookmakers": [
+                {
+                    "key": "book_a",
+                    "markets": [
+                        {
+                            "key": "h2h",
+                            "outcomes": [
+                                {"name": "Boston Celtics", "price": home_price},
+                                {"name": "Miami Heat", "price": 120},
+                            ],
+                        }
+                    ],
+                },
+                {
+                    "key": "book_b",
+                    "markets": [
+                        {
+                            "key": "h2h",
+                            "outcomes": [
+                                {"name": "Boston Celtics", "price": -135},
+                                {"name": "Miami Heat", "price": 125},
+                            ],
+                        }
+                    ],
+                },
+            ],
+        }
+    ]
+
+
+def test_ingestion_maintains_current_odds_board() -> None:
+    if importlib.util.find_spec("aiosqlite") is None:
+        pytest.skip("aiosqlite not available in this environment")
+    asyncio.run(_run_board())
+
+
+async def _run_board() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with session_factory() as session:
+        sport = Sport(key="basketball_nba", name="NBA", active=True)
+        session.add(sport)
+        await session.commit()
+
+        commence = datetime.now(UTC).replace(microsecond=0) + timedelta(hours=3)
+        await _store_odds_payload(session, sport.id, "basketball_nba", _payload(commence, -140))
+        # Age the first poll so the second one lands in a later snapshot minute.
+        await session.execute(
+            update(OddsSnapshot).values(
+                snapshot_time=commence - timedelta(hours=4),
+                snapshot_time_rounded=commence - timedelta(hours=4),
+            )
+        )
+        await session.commit()
+        await _store_odds_payload(session, sport.id, "basketball_nba", _payload(commence, -130))
+
+        assert await session.scalar(select(func.count()).select_from(CurrentOdds)) == 4
+        assert await session.scalar(select(func.count()).select_from(OddsSnapshot)) == 5
+
+        board = await get_odds_board(session, sport_key="basketball_nba")
+        assert len(board) == 1
+        h2h = board[0]["markets"]["h2h"]
+        assert (h2h["boston celtics"]["best_odds"], h2h["boston celtics"]["best_book"]) == (-130, "book_a")
+        assert (h2h["miami heat"]["best_odds"], h2h["miami heat"]["best_book"]) == (125, "book_b")
+        assert len(h2h["miami heat"]["books"]) == 2
+        assert await get_odds_board(session, sport_key="icehockey_nhl") == []
+
+        # Only book_a's home price moved in the second poll; the side comes back with both books.
+        assert await current_change_seq(session, ODDS_FEED) == 2
+        assert await current_change_seq(session, PICKS_FEED) == 0
+        delta = await get_odds_board(session, since=1)
+        assert list(delta[0]["markets"]["h2h"]) == ["boston celtics"]
+        assert len(delta[0]["markets"]["h2h"]["boston celtics"]["books"]) == 2
+        assert await get_odds_board(session, since=2) == []
+
+        # book_b stops quoting h2h: a poll filtered to book_a leaves its rows, a full poll drops them.
+        only_a = _payload(commence, -130)
+        only_a[0]["bookmakers"] = only_a[0]["bookmakers"][:1]
+        await _store_odds_payload(session, sport.id, "basketball_nba", only_a, "book_a")
+        assert await session.scalar(select(func.count()).select_from(CurrentOdds)) == 4
+        # Nothing moved or dropped, so no seq was taken.
+        assert await current_change_seq(session, ODDS_FEED) == 2
+        await _store_odds_payload(session, sport.id, "basketball_nba", only_a)
+        assert await current_change_seq(session, ODDS_FEED) == 3
+        live = select(CurrentOdds.bookmaker).where(CurrentOdds.removed_at.is_(None))
+        assert set(await session.scalars(live)) == {"book_a"}
+        board = await get_odds_board(session)
+        assert board[0]["markets"]["h2h"]["miami heat"]["best_book"] == "book_a"
+        assert board[0]["markets"]["h2h"]["miami heat"]["removed"] == []
+        assert [book["bookmaker"] for book in board[0]["markets"]["h2h"]["miami heat"]["books"]] == ["book_a"]
+
+        # The removal reaches delta clients as a tombstone stamped with the poll's seq.
+        delta = await get_odds_board(session, since=2)
+        for side in ("boston celtics", "miami heat"):
+            assert delta[0]["markets"]["h2h"][side]["removed"] == ["book_b"]
+            assert [book["bookmaker"] for book in delta[0]["markets"]["h2h"][side]["books"]] == ["book_a"]
+
+        # book_b comes back at its old prices: no new snapshot, but the board and its delta still change.
+        snapshots = await session.scalar(select(func.count()).select_from(OddsSnapshot))
+        await _store_odds_payload(session, sport.id, "basketball_nba", _payload(commence, -130))
+        assert await session.scalar(select(func.count()).select_from(OddsSnapshot)) == snapshots
+        assert await current_change_seq(session, ODDS_FEED) == 4
+        relisted = select(CurrentOdds.change_seq).where(CurrentOdds.bookmaker == "book_b")
+        assert set(await session.scalars(relisted)) == {4}
+        delta = await get_odds_board(session, since=3)
+        assert sorted(delta[0]["markets"]["h2h"]) == ["boston celtics", "miami heat"]
+        assert delta[0]["markets"]["h2h"]["miami heat"]["removed"] == []
+        assert delta[0]["markets"]["h2h"]["miami heat"]["best_book"] == "book_b"
+        assert await get_odds_board(session, since=4) == []
+
+        # Pruning a started game tombstones its quotes under a new seq, and old tombstones go.
+        await prune_current_odds(session, commence + timedelta(minutes=1))
+        assert await current_change_seq(session, ODDS_FEED) == 5
+        assert await get_odds_board(session) == []
+        delta = await get_odds_board(session, since=4)
+        assert delta[0]["markets"]["h2h"]["boston celtics"]["books"] == []
+        assert delta[0]["markets"]["h2h"]["boston celtics"]["best_odds"] is None
+        assert sorted(delta[0]["markets"]["h2h"]["boston celtics"]["removed"]) == ["book_a", "book_b"]
+        await session.execute(update(CurrentOdds).values(removed_at=datetime.now(UTC) - timedelta(days=2)))
+        await prune_current_odds(session, commence + timedelta(minutes=1))
+        assert await current_change_seq(session, ODDS_FEED) == 5
+        assert await session.scalar(select(func.count()).select_from(CurrentOdds)) == 0
+
+    await engine.dispose()
+
+
+def test_best_spread_price_stays_on_the_main_line() -> None:
+    commence = datetime(2026, 3, 1, tzinfo=UTC)
+
+    def quote(book: str, line: float, odds: int) -> CurrentOdds:
+        return CurrentOdds(
+            game_id=1,
+            sport_key="basketball_nba",
+            home_team="Boston Celtics",
+            away_team="Miami Heat",
+            commence_time=commence,
+            bookmaker=book,
+            market="spreads",
+            side="boston celtics",
+            line=line,
+            odds=odds,
+            implied_prob=0.5,
+            no_vig_prob=0.5,
+        )
+
+    # book_c's +120 is on a different line, so it must not win over the -105 at -5.5.
+    rows = [quote("book_a", -5.5, -110), quote("book_b", -5.5, -105), quote("book_c", -3.5, 120)]
+    side = build_board(rows)[0]["markets"]["spreads"]["boston celtics"]
+    assert (side["best_odds"], side["best_line"], side["best_book"]) == (-105, -5.5, "book_b")
+    assert len(side["books"]) == 3
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import Base
+from app.models.game import Game
+from app.models.pick import Pick
+from app.models.sport import Sport
+from app.services.parlay_service import build_custom_parlay, price_parlays
+
+
+def test_price_parlays_batches_leg_sets() -> None:
+    if importlib.util.find_spec("aiosqlite") is None:
+        pytest.skip("aiosqlite not available in this environment")
+    asyncio.run(_run_price_parlays())
+
+
+def _pick(game_id: int, market: str, side: str, odds: int, fair_prob: float) -> Pick:
+    now = datetime.now(UTC)
+    return Pick(
+        game_id=game_id,
+        sport_key="basketball_nba",
+        pick_date=now,
+        pick_day=now.date(),
+        market=market,
+        side=side,
+        odds_american=odds,
+        best_book="book_a",
+        fair_prob=fair_prob,
+        suggested_kelly_fraction=0.02,
+        outcome="pending",
+    )
+
+
+async def _run_price_parlays() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with session_factory() as session:
+        sport = Sport(key="basketball_nba", name="NBA", active=True)
+        session.add(sport)
+        await session.flush()
+        games = [
+            Game(external_id=f"g{i}", sport_id=sport.id, home_team="A", away_team="B", commence_time=datetime.now(UTC))
+            for i in range(3)
+        ]
+        session.add_all(games)
+        await session.flush()
+
+        picks = [
+            _pick(games[0].id, "h2h", "A", 120, 0.5),
+            _pick(games[1].id, "h2h", "A", -110, 0.56),
+            _pick(games[2].id, "totals", "over", 105, 0.52),
+            _pick(games[0].id, "h2h", "B", -140, 0.45),
+        ]
+        session.add_all(picks)
+        await session.commit()
+        a, b, c, opposite = (p.id for p in picks)
+
+        results = await price_parlays(session, [[a, b], [a, b, c], [a, opposite], [a], [a, 9999], [b, b, c], [b, c]])
+        assert [r["is_valid"] for r in results] == [True, True, False, False, False, True, True]
+        assert results[2]["compatibility_warnings"] == [results[2]["reason"]]
+        assert results[3]["reason"] == "at_least_two_picks_required"
+        assert results[4]["reason"] == "pick_not_found"
+        assert results[5] == results[6]
+
+        single = await build_custom_parlay(session, [a, b, c])
+        assert results[1]["combined_odds_american"] == single["combined_odds_american"]
+        assert results[1]["correlation_score"] == pytest.approx(single["correlation_score"])
+        # Pricing depends only on the leg set, not on what else is in the batch.
+        assert results[1] == single
+        alone = await price_parlays(session, [[c, a, b]])
+        assert alone[0]["combined_fair_prob"] == single["combined_fair_prob"]
+
+        assert await price_parlays(session, []) == []
+
+    await engine.dispose()
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import Base
+from app.models.game import Game
+from app.models.parlay import Parlay, ParlayLeg
+from app.models.pick import Pick
+from app.models.sport import Sport
+from app.services import parlay_service
+from app.services.parlay_service import refresh_parlays
+
+
+def test_refresh_parlays_recomputes_only_changed_pools() -> None:
+    if importlib.util.find_spec("aiosqlite") is None:
+        pytest.skip("aiosqlite not available in this environment")
+    parlay_service._POOL_FINGERPRINTS.clear()
+    asyncio.run(_run_refresh_parlays())
+
+
+def _pick(game_id: int, odds: int, fair_prob: float, tier: str) -> Pick:
+    now = datetime.now(UTC)
+    return Pick(
+        game_id=game_id,
+        sport_key="basketball_nba",
+        pick_date=now,
+        pick_day=now.date(),
+        market="h2h",
+        side="A",
+        odds_american=odds,
+        best_book="book_a",
+        fair_prob=fair_prob,
+        ev_pct=fair_prob * (1 + odds / 100) - 1,
+        confidence_tier=tier,
+        suggested_kelly_fraction=0.02,
+        outcome="pending",
+    )
+
+
+async def _parlay_legs(session: AsyncSession) -> dict[int, tuple[str, frozenset[int]]]:
+    rows = await session.execute(
+        select(Parlay.id, Parlay.risk_level, ParlayLeg.pick_id).join(ParlayLeg, ParlayLeg.parlay_id == Parlay.id)
+    )
+    legs: dict[int, tuple[str, set[int]]] = {}
+    for parlay_id, risk_level, pick_id in rows:
+        legs.setdefault(parlay_id, (risk_level, set()))[1].add(pick_id)
+    return {k: (level, frozenset(ids)) for k, (level, ids) in legs.items()}
+
+
+async def _run_refresh_parlays() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with session_factory() as session:
+        sport = Sport(key="basketball_nba", name="NBA", active=True)
+        session.add(sport)
+        await session.flush()
+        games = [
+            Game(
+                external_id=f"g{i}",
+                sport_id=sport.id,
+                home_team="A",
+                away_team="B",
+                commence_time=datetime.now(UTC) + timedelta(hours=2),
+            )
+            for i in range(8)
+        ]
+        session.add_all(games)
+        await session.flush()
+        session.add_all(
+            [
+                _pick(games[0].id, 110, 0.55, "high"),
+                _pick(games[1].id, 105, 0.54, "high"),
+                _pick(games[2].id, 120, 0.52, "high"),
+                _pick(games[3].id, 100, 0.56, "medium"),
+                _pick(games[4].id, 115, 0.53, "medium"),
+            ]
+        )
+        await session.commit()
+
+        first = await refresh_parlays(session)
+        assert first["levels_refreshed"] == 3
+        assert first["inserted"] > 0 and first["deleted"] == 0
+        before = await _parlay_legs(session)
+        assert len(before) == first["inserted"]
+
+        assert (await refresh_parlays(session))["levels_refreshed"] == 0
+
+        # A new medium-tier pick changes the moderate and aggressive pools only.
+        session.add(_pick(games[5].id, 125, 0.5, "medium"))
+        await session.commit()
+        second = await refresh_parlays(session)
+        assert second["levels_refreshed"] == 2
+        after = await _parlay_legs(session)
+        # Parlays whose legs are all still valid keep their rows.
+        assert second["deleted"] == 0
+        assert before.items() <= after.items()
+        assert len(after) == len(before) + second["inserted"]
+        assert len(set(after.values())) == len(after)
+
+        # Two kept parlays whose stored odds are each other's new prices are swapped
+        # without tripping the (risk_level, pick_date, odds) unique constraint.
+        by_level: dict[str, list[Parlay]] = {}
+        for row in (await session.scalars(select(Parlay).order_by(Parlay.id))).all():
+            by_level.setdefault(row.risk_level, []).append(row)
+        first_row, second_row = next(rows for rows in by_level.values() if len(rows) >= 2)[:2]
+        odds_a, odds_b = first_row.combined_odds_american, second_row.combined_odds_american
+        for row_id, odds in ((first_row.id, -1), (second_row.id, odds_a), (first_row.id, odds_b)):
+            await session.execute(update(Parlay).where(Parlay.id == row_id).values(combined_odds_american=odds))
+        await session.commit()
+        swapped = await refresh_parlays(session, force=True)
+        assert swapped["deleted"] == 0 and swapped["inserted"] == 0
+        stored = dict((await session.execute(select(Parlay.id, Parlay.combined_odds_american))).all())
+        assert (stored[first_row.id], stored[second_row.id]) == (odds_a, odds_b)
+
+        # Once a leg's game starts, its parlays are frozen and it leaves the pool.
+        started_pick = next(iter(next(iter(after.values()))[1]))
+        started_game = await session.scalar(select(Pick.game_id).where(Pick.id == started_pick))
+        game = await session.get(Game, started_game)
+        game.commence_time = datetime.now(UTC) - timedelta(minutes=5)
+        await session.commit()
+        third = await refresh_parlays(session, force=True)
+        latest = await _parlay_legs(session)
+        assert third["deleted"] == 0
+        assert after.items() <= latest.items()
+        assert all(started_pick not in ids for k, (_, ids) in latest.items() if k not in after)
+        for level in ("conservative", "moderate", "aggressive"):
+            assert sum(1 for lvl, _ in latest.values() if lvl == level) <= 3
+
+        leg_count = await session.scalar(select(func.count()).select_from(ParlayLeg))
+        assert leg_count == sum(len(ids) for _, ids in latest.values())
+        assert all(len(fp) == 32 for fp in parlay_service._POOL_FINGERPRINTS.values())
+
+        # With too few open picks left, the day's unlocked parlays are withdrawn.
+        await session.execute(
+            update(Pick).where(Pick.id != started_pick).values(pick_date=datetime.now(UTC) - timedelta(days=1))
+        )
+        await session.commit()
+        emptied = await refresh_parlays(session)
+        remaining = await _parlay_legs(session)
+        assert emptied["deleted"] > 0 and emptied["inserted"] == 0
+        assert remaining and all(started_pick in ids for _, ids in remaining.values())
+
+    await engine.dispose()
+
+
+def test_search_runs_in_the_process_pool_and_shuts_down() -> None:
+    records = [
+        parlay_service.PickRecord(
+            id=i + 1,
+            game_id=i,
+            sport_key="basketball_nba",
+            market="h2h",
+            side="A",
+            odds_american=-150 + 10 * i,
+            fair_prob=0.66 - i / 100,
+            ev_pct=0.05,
+            confidence_tier="high",
+        )
+        for i in range(5)
+    ]
+    args = (records, "conservative", 3, [[1, 2]], set())
+    try:
+        pool = parlay_service._get_process_pool()
+        assert pool._max_workers <= len(parlay_service.RISK_CONFIGS)
+        kept, new = pool.submit(parlay_service._search_risk_level, *args).result(timeout=60)
+    finally:
+        parlay_service.shutdown_process_pool()
+    assert parlay_service._process_pool is None
+
+    local_kept, local_new = parlay_service._search_risk_level(*args)
+    assert [c.combined_fair_prob for c in kept] == [c.combined_fair_prob for c in local_kept]
+    assert [[p.id for p in c.legs] for c in new] == [[p.id for p in c.legs] for c in local_new]
+    assert len(new) == 2
+
+    # A kept parlay whose odds are already taken is dropped and its slot refilled.
+    taken = {local_kept[0].combined_odds_american}
+    collided, refill = parlay_service._search_risk_level(records, "conservative", 3, [[1, 2]], taken)
+    assert collided == [None]
+    assert all(c.combined_odds_american not in taken for c in refill)
+
+    # So is one that has gone negative-EV.
+    weak = [parlay_service.PickRecord(**{**vars(r), "fair_prob": 0.3}) if r.id == 1 else r for r in records]
+    dropped, _ = parlay_service._search_risk_level(weak, "conservative", 3, [[1, 2]], set())
+    assert dropped == [None]
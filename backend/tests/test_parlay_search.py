@@ -0,0 +1,120 @@
+import random
+from itertools import combinations
+from types import SimpleNamespace
+
+from app.analytics.compatibility import check_compatibility
+from app.analytics.correlation import bounded_joint_probability, estimate_correlation
+from app.analytics.parlay_index import ParlayLegIndex
+from app.analytics.parlay_search import TopKParlays, search_top_parlays
+from app.utils.odds_math import american_to_decimal, american_to_implied_prob, decimal_to_american
+
+
+def _pool(n, seed=3):
+    rnd = random.Random(seed)
+    legs = []
+    for idx in range(n):
+        market, side = [("h2h", "home"), ("spreads", "away"), ("totals", "over")][idx % 3]
+        odds = rnd.choice([-130, -115, -110, 100, 110, 125, 150])
+        legs.append(
+            SimpleNamespace(
+                id=idx + 1,
+                game_id=idx // 3,
+                sport_key="basketball_nba",
+                market=market,
+                side=side,
+                odds_american=odds,
+                fair_prob=american_to_implied_prob(odds) + rnd.uniform(0.01, 0.05),
+            )
+        )
+    return legs
+
+
+def _brute_force(index, min_legs, max_legs, min_odds, max_odds, max_corr, top_k):
+    found = []
+    n = len(index)
+    for size in range(min_legs, max_legs + 1):
+        for combo in combinations(range(n), size):
+            if not all(index.is_compatible(a, b) for a, b in combinations(combo, 2)):
+                continue
+            dec = 1.0
+            for i in combo:
+                dec *= index.decimals[i]
+            if not min_odds <= decimal_to_american(dec) <= max_odds:
+                continue
+            pairs = [index.pair_correlation(a, b) for a, b in combinations(combo, 2)]
+            if sum(pairs) / len(pairs) > max_corr:
+                continue
+            joint = index.probs[combo[0]]
+            for i in combo[1:]:
+                joint = bounded_joint_probability(joint, index.probs[i], index.pair_correlation(combo[0], i))
+            ev = joint * dec - 1.0
+            if ev > 0:
+                found.append(ev)
+    return sorted(found, reverse=True)[:top_k]
+
+
+def test_search_matches_brute_force_top_k():
+    index = ParlayLegIndex(_pool(18), "aggressive")
+    kwargs = dict(min_legs=3, max_legs=5, min_odds_american=300, max_odds_american=2500, max_correlation=0.7)
+    matches = search_top_parlays(index, top_k=5, **kwargs)
+    expected = _brute_force(
+        index,
+        kwargs["min_legs"],
+        kwargs["max_legs"],
+        kwargs["min_odds_american"],
+        kwargs["max_odds_american"],
+        kwargs["max_correlation"],
+        5,
+    )
+    assert [round(m.ev, 9) for m in matches] == [round(ev, 9) for ev in expected]
+
+
+def test_search_respects_compatibility_and_odds_window():
+    index = ParlayLegIndex(_pool(12), "conservative")
+    matches = search_top_parlays(
+        index, min_legs=2, max_legs=3, min_odds_american=150, max_odds_american=300, max_correlation=0.15, top_k=10
+    )
+    assert matches
+    for m in matches:
+        assert all(index.is_compatible(a, b) for a, b in combinations(m.legs, 2))
+        dec = 1.0
+        for i in m.legs:
+            dec *= american_to_decimal(index.legs[i].odds_american)
+        assert 150 <= decimal_to_american(dec) <= 300
+
+
+def test_search_returns_nothing_when_pool_too_small():
+    index = ParlayLegIndex(_pool(1), "moderate")
+    assert search_top_parlays(
+        index, min_legs=2, max_legs=3, min_odds_american=100, max_odds_american=800, max_correlation=0.4, top_k=3
+    ) == []
+
+
+def test_leg_index_bitsets_match_pairwise_checks():
+    legs = _pool(9)
+    index = ParlayLegIndex(legs, "moderate")
+    for i, j in combinations(range(len(legs)), 2):
+        assert index.is_compatible(i, j) == check_compatibility(legs[i], legs[j], "moderate").is_compatible
+        assert index.pair_correlation(i, j) == estimate_correlation(legs[i], legs[j])
+    assert index.correlation.dtype.name == "float32"
+    assert index.incompatible_pair([0, 3, 6]) is None
+
+    strict = ParlayLegIndex(legs, "conservative")
+    assert strict.incompatible_pair([0, 3, 2]) == (0, 2)
+    # Reports the first bad pair in pairwise order, as the per-pair checks did.
+    assert strict.incompatible_pair([0, 3, 5, 2]) == (0, 2)
+    assert strict.compatibility_reason(0, 2).startswith("correlation_above_ceiling")
+
+
+def test_top_k_is_bounded_and_dedupes_by_mask():
+    top = TopKParlays(2)
+    assert top.offer(0.10, 0b011, (0, 1))
+    assert not top.offer(0.20, 0b011, (1, 0))
+    assert not top.offer(-0.05, 0b101, (0, 2))
+    assert top.offer(0.30, 0b110, (1, 2))
+    assert top.threshold == 0.10
+    assert top.offer(0.25, 0b1001, (0, 3))
+    assert len(top) == 2
+    # The evicted parlay's mask is released and can re-enter with a better EV.
+    assert top.offer(0.40, 0b011, (0, 1))
+    assert [(m.ev, m.mask) for m in top.ranked()] == [(0.40, 0b011), (0.30, 0b110)]
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import Base
+from app.models.game import Game
+from app.models.parlay import Parlay, ParlayLeg
+from app.models.pick import Pick
+from app.models.sport import Sport
+from app.services.parlay_settlement import resolve_parlay_outcome, settle_parlays
+
+
+def test_resolve_parlay_outcome():
+    assert resolve_parlay_outcome(["win", "pending"]) is None
+    assert resolve_parlay_outcome([]) is None
+    assert resolve_parlay_outcome(["push", "push"]) == "push"
+    assert resolve_parlay_outcome(["win", "loss"]) == "loss"
+    assert resolve_parlay_outcome(["win", "push"]) == "win"
+
+
+def test_settle_parlays_only_touches_parlays_with_settled_picks() -> None:
+    if importlib.util.find_spec("aiosqlite") is None:
+        pytest.skip("aiosqlite not available in this environment")
+    asyncio.run(_run_settle_parlays_incremental())
+
+
+def _pick(game_id: int, side: str, outcome: str) -> Pick:
+    now = datetime.now(UTC)
+    return Pick(
+        game_id=game_id,
+        sport_key="basketball_nba",
+        pick_date=now,
+        pick_day=now.date(),
+        market="h2h",
+        side=side,
+        odds_american=100,
+        best_book="book_a",
+        suggested_kelly_fraction=0.02,
+        outcome=outcome,
+    )
+
+
+def _parlay(odds_american: int) -> Parlay:
+    return Parlay(
+        risk_level="conservative",
+        num_legs=2,
+        combined_odds_american=odds_american,
+        combined_odds_decimal=4.0,
+        combined_ev_pct=0.1,
+        combined_fair_prob=0.3,
+        correlation_score=0.02,
+        suggested_kelly_fraction=0.01,
+        pick_date=datetime.now(UTC).date(),
+        outcome="pending",
+    )
+
+
+async def _run_settle_parlays_incremental() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with session_factory() as session:
+        sport = Sport(key="basketball_nba", name="NBA", active=True)
+        session.add(sport)
+        await session.flush()
+        games = [
+            Game(external_id=f"g{i}", sport_id=sport.id, home_team="A", away_team="B", commence_time=datetime.now(UTC))
+            for i in range(3)
+        ]
+        session.add_all(games)
+        await session.flush()
+
+        won_a = _pick(games[0].id, "A", "win")
+        won_b = _pick(games[1].id, "A", "win")
+        open_c = _pick(games[2].id, "A", "pending")
+        session.add_all([won_a, won_b, open_c])
+        await session.flush()
+
+        settled_parlay = _parlay(300)
+        waiting_parlay = _parlay(301)
+        untouched_parlay = _parlay(302)
+        session.add_all([settled_parlay, waiting_parlay, untouched_parlay])
+        await session.flush()
+        session.add_all(
+            [
+                ParlayLeg(parlay_id=settled_parlay.id, pick_id=won_a.id, leg_order=1),
+                ParlayLeg(parlay_id=settled_parlay.id, pick_id=won_b.id, leg_order=2),
+                ParlayLeg(parlay_id=waiting_parlay.id, pick_id=won_b.id, leg_order=1),
+                ParlayLeg(parlay_id=waiting_parlay.id, pick_id=open_c.id, leg_order=2),
+                ParlayLeg(parlay_id=untouched_parlay.id, pick_id=won_a.id, leg_order=1),
+            ]
+        )
+        await session.commit()
+        settled_id, waiting_id, untouched_id = settled_parlay.id, waiting_parlay.id, untouched_parlay.id
+
+        result = await settle_parlays(session, [won_b.id])
+        assert result == {"settled": 1, "wins": 1, "losses": 0, "pushes": 0}
+
+        outcomes = dict((await session.execute(select(Parlay.id, Parlay.outcome))).all())
+        assert outcomes[settled_id] == "win"
+        assert outcomes[waiting_id] == "pending"
+        assert outcomes[untouched_id] == "pending"
+
+        profit = await session.scalar(select(Parlay.profit_loss).where(Parlay.id == settled_id))
+        assert profit == pytest.approx(0.03)
+        leg_results = (await session.scalars(select(ParlayLeg.result).where(ParlayLeg.parlay_id == settled_id))).all()
+        assert leg_results == ["win", "win"]
+
+        assert (await settle_parlays(session, []))["settled"] == 0
+        assert (await settle_parlays(session))["settled"] == 1
+        # The sweep settles stranded parlays but leaves ones with open legs alone.
+        assert await session.scalar(select(Parlay.outcome).where(Parlay.id == waiting_id)) == "pending"
+
+    await engine.dispose()
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import Base
+from app.models.game import Game
+from app.models.odds_snapshot import OddsSnapshot
+from app.models.performance_snapshot import PerformanceSnapshot
+from app.models.pick import Pick
+from app.models.sport import Sport
+from app.services.clv_service import calculate_clv_for_pick
+from app.services.performance_service import (
+    _summary_statement,
+    get_daily_performance,
+    get_performance_summary,
+    get_roi_over_time,
+    update_performance_rollups,
+)
+
+
+def test_postgres_summary_uses_grouping_sets() -> None:
+    sql = str(_summary_statement("postgresql", []).compile(dialect=postgresql.dialect()))
+    assert "GROUPING SETS" in sql
+    assert "grouping(picks.confidence_tier)" in sql
+
+
+def test_performance_summary_aggregates_in_sql() -> None:
+    if importlib.util.find_spec("aiosqlite") is None:
+        pytest.skip("aiosqlite not available in this environment")
+    asyncio.run(_run_performance_summary())
+
+
+def _pick(game_id: int, market: str, tier: str, outcome: str | None, profit: float | None, clv: float | None) -> Pick:
+    now = datetime.now(UTC)
+    return Pick(
+        game_id=game_id,
+        sport_key="basketball_nba",
+        pick_date=now,
+        pick_day=now.date(),
+        market=market,
+        side=f"{market}-{tier}-{outcome}",
+        odds_american=110,
+        best_book="book_a",
+        ev_pct=0.04,
+        confidence_tier=tier,
+        suggested_kelly_fraction=0.02,
+        outcome=outcome,
+        profit_loss=profit,
+        market_clv=clv,
+    )
+
+
+async def _run_performance_summary() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with session_factory() as session:
+        sport = Sport(key="basketball_nba", name="NBA", active=True)
+        session.add(sport)
+        await session.flush()
+        game = Game(external_id="g1", sport_id=sport.id, home_team="A", away_team="B", commence_time=datetime.now(UTC))
+        session.add(game)
+        await session.flush()
+        session.add_all(
+            [
+                _pick(game.id, "h2h", "high", "win", 0.022, 0.01),
+                _pick(game.id, "h2h", "high", "loss", -0.02, None),
+                _pick(game.id, "totals", "medium", "push", 0.0, 0.03),
+                _pick(game.id, "totals", "medium", "pending", None, None),
+                _pick(game.id, "spreads", "low", "pending", None, None),
+            ]
+        )
+        await session.commit()
+
+        summary = await get_performance_summary(session)
+        assert (summary.total_picks, summary.settled_picks, summary.pending_picks) == (5, 3, 2)
+        assert (summary.wins, summary.losses, summary.pushes) == (1, 1, 1)
+        assert summary.win_rate == pytest.approx(0.5)
+        assert summary.total_profit_units == pytest.approx(0.002)
+        assert summary.roi_pct == pytest.approx(0.002 / 0.06 * 100)
+        assert summary.avg_market_clv == pytest.approx(0.02)
+        assert summary.avg_odds_american == pytest.approx(110)
+        assert summary.high_confidence == {"picks": 2, "wins": 1, "losses": 1, "roi": pytest.approx(5.0), "avg_clv": 0.01}
+        assert summary.low_confidence == {"picks": 0, "wins": 0, "losses": 0, "roi": 0.0, "avg_clv": 0.0}
+        assert set(summary.by_market) == {"h2h", "totals"}
+        assert summary.by_market["totals"]["picks"] == 1
+        assert summary.by_sport["basketball_nba"]["picks"] == 3
+
+        empty = await get_performance_summary(session, sport_key="icehockey_nhl")
+        assert empty.total_picks == 0 and empty.by_sport == {}
+
+    await engine.dispose()
+
+
+def test_rollups_match_live_aggregation() -> None:
+    if importlib.util.find_spec("aiosqlite") is None:
+        pytest.skip("aiosqlite not available in this environment")
+    asyncio.run(_run_rollups())
+
+
+async def _run_rollups() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with session_factory() as session:
+        sport = Sport(key="basketball_nba", name="NBA", active=True)
+        session.add(sport)
+        await session.flush()
+        game = Game(external_id="g1", sport_id=sport.id, home_team="A", away_team="B", commence_time=datetime.now(UTC))
+        session.add(game)
+        await session.flush()
+
+        old = [
+            _pick(game.id, "h2h", "high", "win", 0.022, 0.01),
+            _pick(game.id, "h2h", "high", "loss", -0.02, None),
+            _pick(game.id, "totals", "medium", "push", 0.0, 0.03),
+            _pick(game.id, "spreads", "low", "pending", None, None),
+        ]
+        for offset, pick in enumerate(old):
+            pick.pick_day = datetime.now(UTC).date() - timedelta(days=1 + offset % 2)
+        today = _pick(game.id, "totals", "medium", "win", 0.018, 0.02)
+        session.add_all([*old, today])
+        await session.commit()
+
+        live = await get_performance_summary(session, sport_key="basketball_nba")
+
+        assert await update_performance_rollups(session, [old[0].id]) == 1
+        assert await update_performance_rollups(session, [old[0].id]) == 0
+        assert await update_performance_rollups(session) == 3
+        snapshots = (await session.scalars(select(PerformanceSnapshot))).all()
+        assert len(snapshots) == 3
+        assert sum(s.settled_picks for s in snapshots) == 4
+
+        # Only days before today are read from rollups; old[3] is still pending and live.
+        assert await get_performance_summary(session) == live
+        ranged = await get_performance_summary(session, start_date=datetime.now(UTC).date() - timedelta(days=1))
+        assert ranged.total_picks == 3
+
+        # CLV that lands after a pick was rolled up reaches its day's snapshot.
+        late = old[1]
+        session.add(
+            OddsSnapshot(
+                game_id=game.id,
+                sport_key="basketball_nba",
+                bookmaker="book_a",
+                market=late.market,
+                side=late.side,
+                odds=100,
+                implied_prob=0.5,
+                no_vig_prob=0.5,
+                commence_time=game.commence_time,
+                snapshot_time_rounded=game.commence_time,
+                is_closing=True,
+            )
+        )
+        await session.commit()
+        assert (await calculate_clv_for_pick(late, session))["updated"]
+        live = await get_performance_summary(session, sport_key="basketball_nba")
+        assert (await get_performance_summary(session)).avg_market_clv == pytest.approx(live.avg_market_clv)
+        assert live.avg_market_clv != 0.02
+
+        # A pick without a tier is kept under the "null" bucket and merged back as None.
+        untiered = _pick(game.id, "h2h", "high", "win", 0.01, None)
+        untiered.confidence_tier = None
+        untiered.pick_day = late.pick_day
+        session.add(untiered)
+        await session.commit()
+        await update_performance_rollups(session)
+        snapshot = await session.scalar(select(PerformanceSnapshot).where(PerformanceSnapshot.snapshot_date == late.pick_day))
+        assert "null" in snapshot.by_tier
+        rolled = await get_performance_summary(session)
+        live = await get_performance_summary(session, sport_key="basketball_nba")
+        assert (rolled.settled_picks, rolled.wins, rolled.high_confidence) == (live.settled_picks, live.wins, live.high_confidence)
+        assert rolled.avg_market_clv == pytest.approx(live.avg_market_clv)
+
+    await engine.dispose()
+
+
+def test_roi_curve_uses_running_totals() -> None:
+    if importlib.util.find_spec("aiosqlite") is None:
+        pytest.skip("aiosqlite not available in this environment")
+    asyncio.run(_run_roi_curve())
+
+
+async def _run_roi_curve() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with session_factory() as session:
+        sport = Sport(key="basketball_nba", name="NBA", active=True)
+        session.add(sport)
+        await session.flush()
+        game = Game(external_id="g1", sport_id=sport.id, home_team="A", away_team="B", commence_time=datetime.now(UTC))
+        session.add(game)
+        await session.flush()
+
+        today = datetime.now(UTC).date()
+        picks = [
+            _pick(game.id, "h2h", "high", "win", 0.022, None),
+            _pick(game.id, "h2h", "medium", "loss", -0.02, None),
+            _pick(game.id, "totals", "high", "loss", -0.02, None),
+            _pick(game.id, "totals", "medium", "pending", None, None),
+        ]
+        for pick, days_ago in zip(picks, [2, 2, 0, 0]):
+            pick.pick_day = today - timedelta(days=days_ago)
+        session.add_all(picks)
+        await session.commit()
+
+        curve = await get_roi_over_time(session)
+        assert [c["date"] for c in curve] == [str(today - timedelta(days=2)), str(today)]
+        assert [c["cumulative_picks"] for c in curve] == [2, 3]
+        assert curve[0]["cumulative_roi_pct"] == pytest.approx(0.002 / 0.04 * 100)
+        assert curve[1]["cumulative_profit"] == pytest.approx(-0.018)
+        assert curve[1]["cumulative_roi_pct"] == pytest.approx(-0.018 / 0.06 * 100)
+
+        daily = await get_daily_performance(session, days=2)
+        assert len(daily) == 1 and daily[0]["losses"] == 1
+        assert daily[0]["cumulative_profit"] == pytest.approx(-0.02)
+
+    await engine.dispose()
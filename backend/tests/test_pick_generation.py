@@ -14,6 +14,7 @@ from app.models.odds_snapshot import OddsSnapshot
 from app.models.pick import Pick
 from app.models.sport import Sport
 from app.services import pick_service
+from app.services.change_feed import current_change_seq
 from app.services.pick_service import generate_picks, update_closing_lines_for_open_picks
 
 
@@ -128,7 +129,7 @@ async def _run_generate_picks_and_clv_update_integration() -> None:
                 no_vig_prob=0.5,
                 commence_time=now,
                 snapshot_time=now,
-                snapshot_time_rounded=rounded,
+                snapshot_time_rounded=rounded + timedelta(minutes=1),
                 is_closing=True,
             )
         )
@@ -143,4 +144,9 @@ async def _run_generate_picks_and_clv_update_integration() -> None:
         assert pick3.clv_prob is not None
         assert pick3.clv_price is not None
 
+        # A second pass has nothing new to stamp and leaves the change cursor alone.
+        seq = await current_change_seq(session)
+        assert await update_closing_lines_for_open_picks(session, pregame_grace_minutes=10) == 0
+        assert await current_change_seq(session) == seq
+
     await engine.dispose()
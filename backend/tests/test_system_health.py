@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.api.v1.system import deep_health, health
+from app.database import Base
+from app.services.ingestion_status import record_ingestion_cycle
+
+
+def test_health_reads_the_ingestion_status_record() -> None:
+    if importlib.util.find_spec("aiosqlite") is None:
+        pytest.skip("aiosqlite not available in this environment")
+    asyncio.run(_run_health())
+
+
+async def _run_health() -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with session_factory() as session:
+        empty = await health(session)
+        assert empty["status"] == "ok" and empty["last_cycle_at"] is None
+
+        await record_ingestion_cycle(session, "ok", games_fetched=12, snapshots_inserted=84)
+        first = await health(session)
+        await record_ingestion_cycle(session, "failed")
+
+    async with session_factory() as session:
+        latest = await health(session)
+        assert latest["last_cycle_status"] == "failed"
+        assert latest["last_cycle_snapshots_inserted"] == 0
+        # A cycle without inserts keeps the last snapshot time.
+        assert latest["last_snapshot_time"] == first["last_snapshot_time"] is not None
+        # The planner estimate only exists on Postgres.
+        assert latest["snapshot_count"] is None
+        assert await deep_health(session) == {"status": "ok", "snapshot_count": 0, "last_snapshot_time": None}
+
+    await engine.dispose()
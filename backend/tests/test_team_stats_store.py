@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+import os
+
+from app.data_providers.team_stats_store import (
+    load_team_stats,
+    migrate_legacy_team_stats,
+    season_path,
+    team_stats_versions,
+    write_team_stats,
+)
+
+
+def _stats(net: float) -> list[dict]:
+    return [
+        {"team_id": 1, "team_name": "Boston Celtics", "net_rating": net},
+        {"team_id": 2, "team_name": "Miami Heat", "net_rating": -net},
+    ]
+
+
+def test_seasons_are_stored_separately_with_content_versions(tmp_path) -> None:
+    root = str(tmp_path)
+    v2024 = write_team_stats(2024, _stats(4.0), root)
+    v2025 = write_team_stats(2025, _stats(9.0), root)
+
+    assert load_team_stats(2024, root).stats[0]["net_rating"] == 4.0
+    assert load_team_stats(2025, root).stats[0]["net_rating"] == 9.0
+    assert load_team_stats(2026, root) is None
+    assert v2024 != v2025
+    assert sorted(os.listdir(root)) == ["season_2024.json", "season_2025.json"]
+
+    # Rewriting identical stats keeps the version; changed stats bump it.
+    assert write_team_stats(2024, _stats(4.0), root) == v2024
+    assert write_team_stats(2024, _stats(5.0), root) != v2024
+    assert team_stats_versions([2025, 2026], root) == {2025: v2025, 2026: None}
+    assert write_team_stats(2027, [], root) is None
+
+    # A file whose stamp names another season is never served for this one.
+    with open(season_path(2025, root), encoding="utf-8") as file:
+        payload = json.load(file)
+    payload["season"] = 2026
+    with open(season_path(2025, root), "w", encoding="utf-8") as file:
+        json.dump(payload, file)
+    assert load_team_stats(2025, root) is None
+
+
+def test_legacy_stats_file_fills_the_missing_season_once(tmp_path) -> None:
+    root = str(tmp_path / "team_stats")
+    legacy = str(tmp_path / "team_stats_cache.json")
+    with open(legacy, "w", encoding="utf-8") as file:
+        json.dump({team["team_name"]: team for team in _stats(6.0)}, file)
+
+    version = migrate_legacy_team_stats(2026, root, legacy)
+    assert version is not None
+    assert load_team_stats(2026, root).stats[0]["net_rating"] == 6.0
+    assert not os.path.exists(legacy) and os.path.exists(f"{legacy}.migrated")
+    assert migrate_legacy_team_stats(2026, root, legacy) is None
+
+    # An existing season file wins; the legacy file is still retired.
+    with open(legacy, "w", encoding="utf-8") as file:
+        json.dump({team["team_name"]: team for team in _stats(1.0)}, file)
+    assert migrate_legacy_team_stats(2026, root, legacy) is None
+    assert load_team_stats(2026, root).version == version
+    assert not os.path.exists(legacy)
@@ -0,0 +1,116 @@
+"""Requests/sec for a 200-pick page: validated response models vs the orjson fast path.
+
+Runs in-process against SQLite, so it measures serialization and query cost without
+network noise. Run from the repo root:
+
+    python scripts/bench_serialization.py [--picks 200] [--requests 300]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+import httpx  # noqa: E402
+from fastapi import Depends, FastAPI, Response  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+
+from app.api.v1.picks import _pick_rows, _serialize_picks  # noqa: E402
+from app.database import Base  # noqa: E402
+from app.models.game import Game  # noqa: E402
+from app.models.pick import Pick  # noqa: E402
+from app.models.sport import Sport  # noqa: E402
+from app.schemas.picks import PickResponse  # noqa: E402
+from app.utils.responses import FastJSONResponse, fast_json  # noqa: E402
+
+
+async def _seed(session_factory: async_sessionmaker[AsyncSession], n: int) -> None:
+    now = datetime.now(UTC)
+    async with session_factory() as session:
+        sport = Sport(key="basketball_nba", name="NBA", active=True)
+        session.add(sport)
+        await session.flush()
+        game = Game(external_id="bench", sport_id=sport.id, home_team="Home", away_team="Away", commence_time=now)
+        session.add(game)
+        await session.flush()
+        for i in range(n):
+            session.add(
+                Pick(
+                    game_id=game.id,
+                    sport_key="basketball_nba",
+                    pick_date=now,
+                    pick_day=now.date() - timedelta(days=i),
+                    market="h2h",
+                    side=f"side {i}",
+                    odds_american=-110 + i,
+                    best_book="book",
+                    issued_at=now,
+                    model_prob=0.55,
+                    ev_pct=0.03,
+                    edge=0.02,
+                    fair_prob=0.55,
+                    implied_prob=0.52,
+                    composite_score=2.0,
+                    signals={"model_driven": True},
+                    data_quality={"lookback_minutes": 60},
+                    suggested_kelly_fraction=0.02,
+                    created_at=now - timedelta(seconds=i),
+                )
+            )
+        await session.commit()
+
+
+async def _requests_per_second(client: httpx.AsyncClient, url: str, n: int) -> float:
+    await client.get(url)
+    start = time.perf_counter()
+    for _ in range(n):
+        response = await client.get(url)
+        response.raise_for_status()
+    return n / (time.perf_counter() - start)
+
+
+async def main(picks: int, requests: int) -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await _seed(session_factory, picks)
+
+    async def get_session():
+        async with session_factory() as session:
+            yield session
+
+    stmt = select(Pick).order_by(Pick.created_at.desc(), Pick.id.desc()).limit(picks)
+    app = FastAPI()
+
+    @app.get("/validated", response_model=list[PickResponse])
+    async def validated(session: AsyncSession = Depends(get_session)) -> list[PickResponse]:
+        return await _serialize_picks(session, stmt)
+
+    @app.get("/fast", response_model=list[PickResponse], response_class=FastJSONResponse)
+    async def fast(response: Response, session: AsyncSession = Depends(get_session)) -> FastJSONResponse:
+        return fast_json(await _pick_rows(session, stmt), response)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        before = await _requests_per_second(client, "/validated", requests)
+        after = await _requests_per_second(client, "/fast", requests)
+    await engine.dispose()
+
+    print(f"{picks}-pick page, {requests} requests")
+    print(f"  validated models + json: {before:8.1f} req/s")
+    print(f"  orjson fast path:        {after:8.1f} req/s  ({after / before:.2f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--picks", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+    asyncio.run(main(args.picks, args.requests))